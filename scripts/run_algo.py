@@ -14,13 +14,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import logbook
 import sys
 
-from zipline.utils import parse_args, run_pipeline
+from zipline.utils import parse_args, run_pipeline, run_sweep
 
 if __name__ == "__main__":
     logbook.StderrHandler().push_application()
     parsed = parse_args(sys.argv[1:])
-    run_pipeline(**parsed)
+    sweep = parsed.pop('sweep')
+    processes = parsed.pop('processes')
+    if sweep is None:
+        run_pipeline(**parsed)
+    else:
+        with open(sweep) as fd:
+            params = json.load(fd)
+        run_sweep(params, processes=processes, **parsed)
     sys.exit(0)
@@ -24,6 +24,7 @@ from unittest import TestCase
 
 from nose_parameterized import parameterized
 
+import numpy as np
 import pandas as pd
 
 from zipline.finance.slippage import VolumeShareSlippage
@@ -563,6 +564,86 @@ class SlippageTestCase(TestCase):
         for key, value in expected_txn.items():
             self.assertEquals(value, txn[key])
 
+    def test_fill_orders_matches_simulate(self):
+        events = self.gen_trades()
+        slippage_model = VolumeShareSlippage()
+        dt = datetime.datetime(2006, 1, 5, 14, 30, tzinfo=pytz.utc)
+
+        def make_orders():
+            return [
+                Order(dt=dt, sid=133, amount=300),
+                Order(dt=dt, sid=133, amount=-100, limit=3.4),
+                Order(dt=dt, sid=133, amount=200, stop=3.6),
+                Order(dt=dt, sid=133, amount=400, stop=3.6, limit=3.8),
+                Order(dt=dt, sid=133, amount=-250, limit=3.6),
+                Order(dt=dt, sid=133, amount=1000),
+            ]
+
+        for event in events:
+            expected_orders = make_orders()
+            expected = {
+                order.id: txn
+                for order, txn in slippage_model.simulate(
+                    event, expected_orders,
+                )
+            }
+
+            orders = make_orders()
+            fills = slippage_model.fill_orders(
+                bars=np.zeros(len(orders), dtype=int),
+                open_amounts=np.array([o.open_amount for o in orders]),
+                directions=np.array([o.direction for o in orders]),
+                limits=np.array(
+                    [np.nan if o.limit is None else o.limit for o in orders],
+                ),
+                stops=np.array(
+                    [np.nan if o.stop is None else o.stop for o in orders],
+                ),
+                volumes=np.array([event.volume]),
+                prices=np.array([event.price]),
+            )
+
+            for i, (order, expected_order) in enumerate(
+                    zip(orders, expected_orders)):
+                txn = expected.get(expected_order.id)
+                if txn is None:
+                    self.assertEqual(fills.amounts[i], 0)
+                    self.assertTrue(np.isnan(fills.prices[i]))
+                else:
+                    self.assertEqual(fills.amounts[i], txn.amount)
+                    self.assertAlmostEqual(fills.prices[i], txn.price)
+
+                self.assertEqual(
+                    fills.stop_reached[i], expected_order.stop_reached,
+                )
+                self.assertEqual(
+                    fills.limit_reached[i], expected_order.limit_reached,
+                )
+                self.assertEqual(
+                    np.isnan(fills.stops[i]), expected_order.stop is None,
+                )
+
+    def test_fill_orders_multiple_bars(self):
+        slippage_model = VolumeShareSlippage()
+
+        fills = slippage_model.fill_orders(
+            bars=np.array([1, 0, 1, 0]),
+            open_amounts=np.array([100, 100, 100, -100]),
+            directions=np.array([1.0, 1.0, 1.0, -1.0]),
+            limits=np.full(4, np.nan),
+            stops=np.full(4, np.nan),
+            volumes=np.array([200.0, 2000.0]),
+            prices=np.array([3.0, 4.0]),
+        )
+
+        # The first bar only has room for 50 shares, which are all taken by
+        # the first order placed against it.
+        np.testing.assert_array_equal(fills.amounts, [100, 50, 100, 0])
+        np.testing.assert_array_almost_equal(
+            fills.prices,
+            [4.001, 3.01875, 4.004, np.nan],
+        )
+
     def gen_trades(self):
         # create a sequence of trades
         events = [
@@ -8,8 +8,11 @@ from unittest import TestCase
 from nose_parameterized import parameterized
 from numpy import (
     arange,
+    asarray,
     array,
     full,
+    isnan,
+    may_share_memory,
 )
 from numpy.testing import assert_array_equal
 from six.moves import zip_longest
@@ -20,7 +23,13 @@ from zipline.lib.adjustment import (
     Float64Multiply,
     Float64Overwrite,
 )
-from zipline.lib.adjusted_array import AdjustedArray, NOMASK
+from zipline.lib.adjusted_array import (
+    AdjustedArray,
+    NOMASK,
+    prepend_rows,
+    take_columns,
+    trailing_rows,
+)
 from zipline.utils.numpy_utils import (
     datetime64ns_dtype,
     float64_dtype,
@@ -332,6 +341,70 @@ class AdjustedArrayTestCase(TestCase):
             with self.assertRaises(ValueError):
                 frame[0, 0] = 5.0
 
+    def test_traverse_copies_adjusted_rows(self):
+        data = arange(30, dtype=float).reshape(10, 3)
+        adj_array = AdjustedArray(
+            data,
+            NOMASK,
+            {4: [Float64Multiply(0, 3, 1, 1, 2.0)]},
+        )
+        adjusted = data.copy()
+        adjusted[:4, 1] *= 2.0
+
+        nwindows = 0
+        for start, window in enumerate(adj_array.traverse(3)):
+            nwindows += 1
+            assert_array_equal(
+                window,
+                (adjusted if start + 3 > 4 else data)[start:start + 3],
+            )
+            # Only the windows containing adjusted rows are copies.
+            self.assertEqual(
+                may_share_memory(window, adj_array.data),
+                start not in (2, 3),
+            )
+        self.assertEqual(nwindows, 8)
+        # Traversing doesn't modify the array.
+        assert_array_equal(adj_array.data, data)
+
+        unadjusted = AdjustedArray(data, NOMASK, {})
+        for window in unadjusted.traverse(3):
+            self.assertTrue(may_share_memory(window, unadjusted.data))
+
+    def test_traverse_copies_adjusted_columns(self):
+        data = arange(60, dtype=float).reshape(20, 3)
+        adj_array = AdjustedArray(
+            data,
+            NOMASK,
+            {15: [Float64Multiply(0, 14, 1, 1, 2.0)]},
+        )
+        adjusted = data.copy()
+        adjusted[:15, 1] *= 2.0
+
+        window_iter = adj_array.traverse(3)
+        # The adjustment is known from the window starting at row 13.
+        for start in range(13):
+            window = next(window_iter)
+            assert_array_equal(window, data[start:start + 3])
+            self.assertTrue(may_share_memory(window, adj_array.data))
+
+        rows, nwindows = window_iter.next_block()
+        self.assertEqual(nwindows, 2)
+        assert_array_equal(rows, adjusted[13:17])
+        self.assertFalse(may_share_memory(rows, adj_array.data))
+
+        # The windows containing adjusted rows are built from the shared
+        # rows and a copy of the adjusted column only.
+        copied = asarray(window_iter.adjusted)
+        self.assertEqual(copied.shape, (15, 1))
+        assert_array_equal(copied, adjusted[:15, 1:2])
+
+        for start, window in enumerate(window_iter, 15):
+            assert_array_equal(window, data[start:start + 3])
+            self.assertTrue(may_share_memory(window, adj_array.data))
+        self.assertEqual(start, 17)
+        assert_array_equal(adj_array.data, data)
+
     def test_bad_input(self):
         msg = "Mask shape \(2, 3\) != data shape \(5, 5\)"
         data = arange(25).reshape(5, 5)
@@ -366,3 +439,46 @@ last_col=0, value=4.000000)]}
         )
         got = adj_array.inspect()
         self.assertEqual(expected, got)
+
+    def test_carry_rows(self):
+        data = arange(60, dtype=float).reshape(12, 5)
+        # Asset 3 doesn't exist until row 8.
+        exists = full(data.shape, True, dtype=bool)
+        exists[:8, 3] = False
+
+        def load(start, stop, columns):
+            # Corporate-action style adjustments: each applies to all rows
+            # before the row at which it takes effect.
+            events = [(2, 0, 0.5), (7, 1, 2.0), (9, 3, 4.0), (10, 0, 3.0)]
+            adjustments = {}
+            for row, column, value in events:
+                if not start <= row < stop or column not in columns:
+                    continue
+                loc = row - start
+                col = columns.index(column)
+                adjustments.setdefault(loc, []).append(
+                    Float64Multiply(0, loc, col, col, value),
+                )
+            return AdjustedArray(
+                data[start:stop, columns],
+                exists[start:stop, columns],
+                adjustments,
+            )
+
+        window_length = 4
+        expected = load(4, 12, [0, 1, 3])
+
+        # Keep the last rows of a previous chunk, drop column 2, and add
+        # column 3, which is missing in the kept rows.
+        head = take_columns(
+            trailing_rows(load(0, 8, [0, 1, 2]), window_length),
+            array([0, 1, -1]),
+        )
+        assert_array_equal(head.data[:, :2], data[4:8, :2])
+        self.assertTrue(isnan(head.data[:, 2]).all())
+
+        carried = prepend_rows(head, load(8, 12, [0, 1, 3]))
+        assert_array_equal(carried.data, expected.data)
+        for got, want in zip_longest(carried.traverse(window_length),
+                                     expected.traverse(window_length)):
+            assert_array_equal(got, want)
@@ -3,15 +3,23 @@ Tests for SimplePipelineEngine
 """
 from __future__ import division
 from collections import OrderedDict
+import multiprocessing
+import os
+from threading import current_thread
 from unittest import TestCase
+import warnings
 from itertools import product
 
+from mock import patch
+import numexpr
 from nose_parameterized import parameterized
 from numpy import (
     arange,
     array,
     full,
+    isnan,
     nan,
+    nanmean,
     tile,
     zeros,
     float32,
@@ -37,7 +45,10 @@ from six import iteritems, itervalues
 from testfixtures import TempDirectory
 from toolz import merge
 
-from zipline.data.us_equity_pricing import BcolzDailyBarReader
+from zipline.data.us_equity_pricing import (
+    BcolzDailyBarReader,
+    SQLiteAdjustmentWriter,
+)
 from zipline.finance.trading import TradingEnvironment
 from zipline.lib.adjustment import MULTIPLY
 from zipline.pipeline.loaders.synthetic import (
@@ -46,6 +57,7 @@ from zipline.pipeline.loaders.synthetic import (
     SyntheticDailyBarWriter,
 )
 from zipline.pipeline import Pipeline
+from zipline.pipeline.cache import PipelineResultCache, term_fingerprint
 from zipline.pipeline.data import USEquityPricing, DataSet, Column
 from zipline.pipeline.loaders.frame import DataFrameLoader
 from zipline.pipeline.loaders.equity_pricing_loader import (
@@ -60,14 +72,24 @@ from zipline.pipeline.factors import (
     ExponentialWeightedMovingAverage,
     ExponentialWeightedMovingStdDev,
     MaxDrawdown,
+    Returns,
+    RSI,
     SimpleMovingAverage,
+    WeightedAverageValue,
 )
+from zipline.pipeline.factors import technical
+from zipline.pipeline.factors.factor import NumExprFactor
+from zipline.pipeline.filters import NumExprFilter
+from zipline.pipeline.term import AssetExists
+from zipline.utils.control_flow import ignore_nanwarnings
 from zipline.utils.memoize import lazyval
+from zipline.utils.numpy_utils import float64_dtype
 from zipline.utils.test_utils import (
     make_rotating_equity_info,
     make_simple_equity_info,
     product_upper_triangle,
     check_arrays,
+    str_to_seconds,
 )
 
 
@@ -131,9 +153,11 @@ class RecordingConstantLoader(ConstantLoader):
         super(RecordingConstantLoader, self).__init__(*args, **kwargs)
 
         self.load_calls = []
+        self.load_dates = []
 
     def load_adjusted_array(self, columns, dates, assets, mask):
         self.load_calls.append(ColumnArgs(*columns))
+        self.load_dates.append(dates)
 
         return super(RecordingConstantLoader, self).load_adjusted_array(
             columns, dates, assets, mask,
@@ -226,6 +250,31 @@ class ConstantInputTestCase(TestCase):
 
             assert_frame_equal(result, expected_result)
 
+    def test_masked_custom_factor(self):
+        loader = self.loader
+        engine = SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+        dates = self.dates[10:15]
+        computed_assets = []
+
+        class RecordingAssetID(AssetID):
+            def compute(self, today, assets, out, close):
+                computed_assets.append(list(assets))
+                out[:] = assets
+
+        factor = RecordingAssetID(mask=AssetID() > 1)
+        result = engine.run_pipeline(
+            Pipeline(columns={'f': factor}), dates[0], dates[-1],
+        )
+
+        # Only the assets in the mask are passed to `compute`.
+        self.assertEqual(computed_assets, [[2, 3]] * len(dates))
+        check_arrays(
+            result['f'].unstack().values,
+            tile([nan, 2.0, 3.0], (len(dates), 1)),
+        )
+
     def test_single_factor(self):
         loader = self.loader
         finder = self.asset_finder
@@ -307,6 +356,48 @@ class ConstantInputTestCase(TestCase):
             full(shape, -2 * high_factor.window_length),
         )
 
+    def test_fused_expressions(self):
+        loader = self.loader
+        engine = SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+        dates = self.dates[10:15]
+        high, low = USEquityPricing.high.latest, USEquityPricing.low.latest
+        close = USEquityPricing.close.latest
+
+        spread = NumExprFactor('x_0 - x_1', (high, low), dtype=float64_dtype)
+        scaled = NumExprFactor(
+            'x_0 / x_1', (spread, close), dtype=float64_dtype,
+        )
+        wide = NumExprFilter.create('x_0 > 0.3', (scaled,))
+        pipeline = Pipeline(
+            columns={'scaled': scaled, 'wide': wide & (close > 2)},
+        )
+
+        # `spread` is only used by `scaled`, and `wide` is only used by the
+        # combined filter, so neither is computed on its own.
+        graph = pipeline.to_graph('screen', AssetExists())
+        self.assertNotIn(spread, graph)
+        self.assertNotIn(wide, graph)
+        self.assertEqual(
+            graph.computed_term(scaled).inputs, (high, low, close),
+        )
+
+        results = engine.run_pipeline(pipeline, dates[0], dates[-1])
+        constants = self.constants
+        expected_scaled = (
+            (constants[USEquityPricing.high] - constants[USEquityPricing.low])
+            / constants[USEquityPricing.close]
+        )
+        assert_frame_equal(
+            results['scaled'].unstack(),
+            DataFrame(expected_scaled, index=dates, columns=self.assets),
+        )
+        assert_frame_equal(
+            results['wide'].unstack(),
+            DataFrame(True, index=dates, columns=self.assets),
+        )
+
     def test_numeric_factor(self):
         constants = self.constants
         loader = self.loader
@@ -496,6 +587,693 @@ class ConstantInputTestCase(TestCase):
                          {ColumnArgs.sorted_by_ds(Loader2DataSet.col1,
                                                   Loader2DataSet.col2)})
 
+    def test_consecutive_chunks(self):
+        loader = RecordingConstantLoader(
+            constants=self.constants,
+            dates=self.dates,
+            assets=self.assets,
+        )
+        engine = SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+        p = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=10,
+            ),
+        })
+
+        engine.run_pipeline(p, self.dates[10], self.dates[19])
+        result = engine.run_pipeline(p, self.dates[20], self.dates[29])
+
+        # The lookback of the second chunk is kept from the first, so only
+        # the new dates are loaded, from the last kept date for the
+        # adjustments taking effect after it.
+        self.assertEqual(len(loader.load_dates), 2)
+        self.assertTrue(loader.load_dates[1].equals(self.dates[19:30]))
+
+        fresh_engine = SimplePipelineEngine(
+            lambda column: self.loader, self.dates, self.asset_finder,
+        )
+        assert_frame_equal(
+            result,
+            fresh_engine.run_pipeline(p, self.dates[20], self.dates[29]),
+        )
+
+    def test_workspace_release(self):
+        loader = self.loader
+        engine = SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+        p = Pipeline(columns={
+            'open': SimpleMovingAverage(
+                inputs=[USEquityPricing.open], window_length=10,
+            ),
+            'close': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=10,
+            ),
+        })
+        engine.run_pipeline(p, self.dates[10], self.dates[19])
+
+        # Both inputs are loaded together, but the input of the first
+        # average is released before the second average is computed.
+        nassets = len(self.assets)
+        mask_bytes = 19 * nassets
+        input_bytes = 19 * nassets * 8
+        output_bytes = 10 * nassets * 8
+        self.assertEqual(
+            engine.peak_workspace_bytes,
+            mask_bytes + 2 * input_bytes + output_bytes,
+        )
+
+    def test_output_formats(self):
+        engine = SimplePipelineEngine(
+            lambda column: self.loader, self.dates, self.asset_finder,
+        )
+        p = Pipeline(
+            columns={
+                'sum': RollingSumDifference(),
+                'id': AssetID(),
+            },
+            screen=AssetID() > 1,
+        )
+        start, end = self.dates[10], self.dates[20]
+        narrow = engine.run_pipeline(p, start, end)
+
+        arrays = engine.run_pipeline(p, start, end, output='arrays')
+        self.assertTrue(arrays.dates.equals(self.dates[10:21]))
+        self.assertEqual(sorted(arrays.columns), ['id', 'sum'])
+        for date in arrays.dates:
+            assert_frame_equal(arrays.cross_section(date), narrow.loc[date])
+
+        wide = engine.run_pipeline(p, start, end, output='wide')
+        self.assertEqual(
+            list(wide.columns),
+            [(name, sid) for name in ('id', 'sum') for sid in (2, 3)],
+        )
+        for (date, asset), row in narrow.iterrows():
+            for name in ('id', 'sum'):
+                self.assertEqual(wide.loc[date, (name, asset.sid)], row[name])
+
+        with self.assertRaises(ValueError):
+            engine.run_pipeline(p, start, end, output='long')
+
+    def test_parallel_terms(self):
+        p = Pipeline(
+            columns={
+                'short': SimpleMovingAverage(
+                    inputs=[USEquityPricing.close], window_length=3,
+                ),
+                'long': SimpleMovingAverage(
+                    inputs=[USEquityPricing.close], window_length=10,
+                ),
+                'sum': RollingSumDifference(),
+                'id': AssetID(),
+                'double': RollingSumDifference() * 2,
+                'spread': AssetID() - RollingSumDifference(),
+                'rsi': RSI(),
+            },
+            screen=AssetID() > 1,
+        )
+        serial_engine = SimplePipelineEngine(
+            lambda column: self.loader, self.dates, self.asset_finder,
+        )
+        expected = serial_engine.run_pipeline(
+            p, self.dates[10], self.dates[20],
+        )
+        for workers in (2, 4):
+            engine = SimplePipelineEngine(
+                lambda column: self.loader,
+                self.dates,
+                self.asset_finder,
+                workers=workers,
+            )
+            assert_frame_equal(
+                engine.run_pipeline(p, self.dates[10], self.dates[20]),
+                expected,
+            )
+
+    def test_parallel_warning_contexts(self):
+        threads = []
+
+        class IgnoresNanWarnings(CustomFactor):
+            inputs = [USEquityPricing.close]
+            ctx = ignore_nanwarnings()
+
+            def compute(self, today, assets, out, close):
+                threads.append(current_thread())
+                out[:] = nanmean(close, axis=0)
+
+        p = Pipeline(columns={
+            str(window_length): IgnoresNanWarnings(window_length=window_length)
+            for window_length in range(2, 8)
+        })
+        engine = SimplePipelineEngine(
+            lambda column: self.loader,
+            self.dates,
+            self.asset_finder,
+            workers=4,
+        )
+        filters = list(warnings.filters)
+        engine.run_pipeline(p, self.dates[10], self.dates[20])
+
+        # catch_warnings isn't thread-safe, so these terms must all be
+        # computed on this thread.
+        self.assertTrue(threads)
+        self.assertEqual(set(threads), {current_thread()})
+        self.assertEqual(warnings.filters, filters)
+
+    def test_parallel_numexpr_terms(self):
+        threads = []
+
+        def recording(evaluate):
+            def wrapper(*args, **kwargs):
+                threads.append(current_thread())
+                return evaluate(*args, **kwargs)
+            return wrapper
+
+        p = Pipeline(
+            columns={
+                'double': RollingSumDifference() * 2,
+                'spread': AssetID() - RollingSumDifference(),
+                'rsi': RSI(),
+                'sum': RollingSumDifference(),
+            },
+            screen=AssetID() > 1,
+        )
+        engine = SimplePipelineEngine(
+            lambda column: self.loader,
+            self.dates,
+            self.asset_finder,
+            workers=4,
+        )
+        with patch.object(numexpr, 'evaluate',
+                          recording(numexpr.evaluate)), \
+                patch.object(technical, 'evaluate',
+                             recording(technical.evaluate)):
+            engine.run_pipeline(p, self.dates[20], self.dates[30])
+
+        # numexpr isn't thread-safe, so it's only used from this thread.
+        self.assertTrue(threads)
+        self.assertEqual(set(threads), {current_thread()})
+
+    def test_run_pipeline_parallel(self):
+        loader = RecordingConstantLoader(
+            constants=self.constants,
+            dates=self.dates,
+            assets=self.assets,
+        )
+        engine = SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+        p = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=10,
+            ),
+            'sum': RollingSumDifference(),
+        })
+        expected = engine.run_pipeline(p, self.dates[10], self.dates[40])
+
+        for chunksize, workers in (5, 1), (7, 2), (40, 3):
+            assert_frame_equal(
+                engine.run_pipeline_parallel(
+                    p, self.dates[10], self.dates[40], chunksize, workers,
+                ),
+                expected,
+            )
+
+        # Chunks computed in this process reuse the lookback of the previous
+        # chunk.
+        del loader.load_dates[:]
+        p = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=10,
+            ),
+        })
+        engine.run_pipeline_parallel(
+            p, self.dates[10], self.dates[40], 10, workers=1,
+        )
+        self.assertEqual(
+            [len(dates) for dates in loader.load_dates],
+            [19, 10, 10, 1],
+        )
+
+    def test_run_pipeline_parallel_without_fork(self):
+        engine = SimplePipelineEngine(
+            lambda column: self.loader, self.dates, self.asset_finder,
+        )
+        p = Pipeline(columns={'id': AssetID()})
+        with patch.object(multiprocessing,
+                          'get_context',
+                          side_effect=ValueError,
+                          create=True):
+            with self.assertRaises(ValueError):
+                engine.run_pipeline_parallel(
+                    p, self.dates[10], self.dates[40], 10, workers=2,
+                )
+
+            # A single worker doesn't need to fork.
+            assert_frame_equal(
+                engine.run_pipeline_parallel(
+                    p, self.dates[10], self.dates[40], 10, workers=1,
+                ),
+                engine.run_pipeline(p, self.dates[10], self.dates[40]),
+            )
+
+    def test_parallel_error(self):
+        class Broken(CustomFactor):
+            inputs = [USEquityPricing.close]
+            window_length = 2
+
+            def compute(self, today, assets, out, close):
+                raise ZeroDivisionError()
+
+        engine = SimplePipelineEngine(
+            lambda column: self.loader,
+            self.dates,
+            self.asset_finder,
+            workers=2,
+        )
+        p = Pipeline(columns={'broken': Broken(), 'id': AssetID()})
+        with self.assertRaises(ZeroDivisionError):
+            engine.run_pipeline(p, self.dates[10], self.dates[20])
+
+        with self.assertRaises(ValueError):
+            SimplePipelineEngine(
+                lambda column: self.loader,
+                self.dates,
+                self.asset_finder,
+                workers=0,
+            )
+
+
+class RootMaskTestCase(TestCase):
+
+    def setUp(self):
+        self.dates = dates = date_range(
+            '2014-01', '2014-03', freq='D', tz='UTC',
+        )
+        # Pipelines are run over dates[20:41] and dates[25:36].
+        lifetimes = {
+            1: (dates[0], dates[-1]),
+            # Alive for the whole of the outer run, starting on its first
+            # date and ending on its last.
+            2: (dates[20], dates[40]),
+            # Likewise for the inner run.
+            3: (dates[25], dates[35]),
+            # Ends within the lookback rows of the outer run.
+            4: (dates[5], dates[18]),
+            # Starts on the last date of the outer run, so it isn't alive on
+            # any of its dates.
+            5: (dates[40], dates[-1]),
+            6: (dates[45], dates[-1]),
+        }
+        self.assets = sorted(lifetimes)
+        self.loader = ConstantLoader(
+            constants={USEquityPricing.close: 3},
+            dates=dates,
+            assets=self.assets,
+        )
+        asset_info = DataFrame(
+            {
+                'symbol': list('ABCDEF'),
+                'start_date': [lifetimes[sid][0] for sid in self.assets],
+                'end_date': [lifetimes[sid][1] for sid in self.assets],
+                'exchange': 'TEST',
+            },
+            index=self.assets,
+        )
+        environment = TradingEnvironment()
+        environment.write_data(equities_df=asset_info)
+        self.asset_finder = environment.asset_finder
+
+    def make_engine(self):
+        loader = self.loader
+        return SimplePipelineEngine(
+            lambda column: loader, self.dates, self.asset_finder,
+        )
+
+    def test_reused_root_mask(self):
+        p = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=5,
+            ),
+            'id': AssetID(),
+        })
+        dates = self.dates
+        runs = [
+            (dates[20], dates[40]),
+            (dates[25], dates[35]),
+            (dates[20], dates[40]),
+        ]
+        # Each run of a new engine computes its root mask from scratch.
+        expected = [
+            self.make_engine().run_pipeline(p, start, end)
+            for start, end in runs
+        ]
+
+        engine = self.make_engine()
+        finder = self.asset_finder
+        with patch.object(finder, 'lifetimes', wraps=finder.lifetimes) as m:
+            results = [
+                engine.run_pipeline(p, start, end) for start, end in runs
+            ]
+        # The later runs are within the dates of the first one.
+        self.assertEqual(m.call_count, 1)
+
+        for result, expected_result in zip(results, expected):
+            assert_frame_equal(result, expected_result)
+
+        outer, inner, _ = results
+        outer_sids = outer['id'].unstack()
+        inner_sids = inner['id'].unstack()
+        self.assertEqual([a.sid for a in outer_sids.columns], [1, 2, 3])
+        self.assertEqual([a.sid for a in inner_sids.columns], [1, 2, 3])
+
+        # Assets aren't alive on their start date, but are on their end date.
+        self.assertTrue(isnan(outer_sids.loc[dates[20], 2]))
+        self.assertEqual(outer_sids.loc[dates[21], 2], 2)
+        self.assertEqual(outer_sids.loc[dates[40], 2], 2)
+        self.assertTrue(isnan(inner_sids.loc[dates[25], 3]))
+        self.assertEqual(inner_sids.loc[dates[26], 3], 3)
+        self.assertEqual(inner_sids.loc[dates[35], 3], 3)
+
+    def test_consecutive_root_masks(self):
+        p = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=5,
+            ),
+            'id': AssetID(),
+        })
+        dates = self.dates
+        # Consecutive chunks, which only overlap in their lookback rows.
+        runs = [(dates[20], dates[30]), (dates[31], dates[48])]
+        expected = [
+            self.make_engine().run_pipeline(p, start, end)
+            for start, end in runs
+        ]
+
+        engine = self.make_engine()
+        finder = self.asset_finder
+        with patch.object(finder, 'lifetimes', wraps=finder.lifetimes) as m:
+            results = [
+                engine.run_pipeline(p, start, end) for start, end in runs
+            ]
+        self.assertEqual(m.call_count, 2)
+        # The second chunk only computes the dates after the first one.
+        self.assertTrue(m.call_args_list[1][0][0].equals(dates[31:49]))
+
+        for result, expected_result in zip(results, expected):
+            assert_frame_equal(result, expected_result)
+
+        first, second = results
+        first_sids = first['id'].unstack()
+        second_sids = second['id'].unstack()
+        self.assertEqual([a.sid for a in first_sids.columns], [1, 2, 3])
+        # Assets 5 and 6 are only alive after the dates of the first chunk.
+        self.assertEqual(
+            [a.sid for a in second_sids.columns], [1, 2, 3, 5, 6],
+        )
+        self.assertTrue(isnan(second_sids.loc[dates[40], 5]))
+        self.assertEqual(second_sids.loc[dates[41], 5], 5)
+        self.assertEqual(second_sids.loc[dates[46], 6], 6)
+
+
+class PipelineResultCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.constants = {
+            USEquityPricing.low: 1,
+            USEquityPricing.open: 2,
+            USEquityPricing.close: 3,
+            USEquityPricing.high: 4,
+        }
+        self.assets = [1, 2, 3]
+        self.dates = date_range('2014-01', '2014-03', freq='D', tz='UTC')
+        self.loader = RecordingConstantLoader(
+            constants=self.constants,
+            dates=self.dates,
+            assets=self.assets,
+        )
+        self.loader.cache_identity = 'constants'
+
+        self.asset_info = make_simple_equity_info(
+            self.assets,
+            start_date=self.dates[0],
+            end_date=self.dates[-1],
+        )
+        environment = TradingEnvironment()
+        environment.write_data(equities_df=self.asset_info)
+        self.asset_finder = environment.asset_finder
+
+        self.tempdir = TempDirectory()
+        self.cache = PipelineResultCache(self.tempdir.path)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def make_engine(self):
+        loader = self.loader
+        return SimplePipelineEngine(
+            lambda column: loader,
+            self.dates,
+            self.asset_finder,
+            result_cache=self.cache,
+        )
+
+    def make_pipeline(self):
+        sma = SimpleMovingAverage(
+            inputs=[USEquityPricing.close], window_length=5,
+        )
+        asset_id = AssetID()
+        return Pipeline(
+            columns={'sma': sma, 'asset_id': asset_id},
+            screen=asset_id <= 2,
+        )
+
+    def test_fingerprint(self):
+        sma5 = SimpleMovingAverage(
+            inputs=[USEquityPricing.close], window_length=5,
+        )
+        sma10 = SimpleMovingAverage(
+            inputs=[USEquityPricing.close], window_length=10,
+        )
+        self.assertEqual(term_fingerprint(sma5), term_fingerprint(sma5))
+        self.assertNotEqual(term_fingerprint(sma5), term_fingerprint(sma10))
+        self.assertNotEqual(
+            term_fingerprint(sma5.rank()), term_fingerprint(sma10.rank()),
+        )
+        self.assertNotEqual(
+            term_fingerprint(RollingSumDifference()),
+            term_fingerprint(RollingSumSum(
+                inputs=[USEquityPricing.open, USEquityPricing.close],
+                window_length=3,
+            )),
+        )
+
+    def test_cached_results(self):
+        engine = self.make_engine()
+        start, end = self.dates[5], self.dates[-1]
+
+        expected = engine.run_pipeline(self.make_pipeline(), start, end)
+        self.assertEqual(len(self.loader.load_calls), 1)
+
+        # A new, equivalent pipeline is read from the cache.
+        result = engine.run_pipeline(self.make_pipeline(), start, end)
+        self.assertEqual(len(self.loader.load_calls), 1)
+        assert_frame_equal(result, expected)
+
+        # So is a pipeline over a narrower range of dates.
+        narrow_start, narrow_end = self.dates[10], self.dates[20]
+        result = engine.run_pipeline(
+            self.make_pipeline(), narrow_start, narrow_end,
+        )
+        self.assertEqual(len(self.loader.load_calls), 1)
+        assert_frame_equal(
+            result,
+            expected.loc[narrow_start:narrow_end],
+        )
+
+        # A wider range is computed.
+        engine.run_pipeline(self.make_pipeline(), self.dates[4], end)
+        self.assertEqual(len(self.loader.load_calls), 2)
+
+    def test_uncached_loader(self):
+        del self.loader.cache_identity
+        engine = self.make_engine()
+        start, end = self.dates[5], self.dates[-1]
+
+        engine.run_pipeline(self.make_pipeline(), start, end)
+        engine.run_pipeline(self.make_pipeline(), start, end)
+        self.assertEqual(len(self.loader.load_calls), 2)
+        self.assertEqual(os.listdir(self.tempdir.path), [])
+
+    def test_rewritten_files(self):
+        data_dir = TempDirectory()
+        self.addCleanup(data_dir.cleanup)
+        pricing_path = data_dir.getpath('pricing.bcolz')
+        adjustments_path = data_dir.getpath('adjustments.db')
+
+        no_adjustments = DataFrame({
+            'sid': array([], dtype='uint32'),
+            'effective_date': array([], dtype='uint32'),
+            'ratio': array([], dtype=float),
+        })
+        no_dividends = DataFrame({
+            'sid': array([], dtype='uint32'),
+            'amount': array([], dtype=float),
+            'record_date': array([], dtype='datetime64[ns]'),
+            'ex_date': array([], dtype='datetime64[ns]'),
+            'declared_date': array([], dtype='datetime64[ns]'),
+            'pay_date': array([], dtype='datetime64[ns]'),
+        })
+        SQLiteAdjustmentWriter(adjustments_path, None, None).write(
+            splits=no_adjustments,
+            mergers=no_adjustments,
+            dividends=no_dividends,
+        )
+
+        def write_pricing(asset_info):
+            SyntheticDailyBarWriter(
+                asset_info=asset_info[['start_date', 'end_date']],
+                calendar=self.dates,
+            ).write(pricing_path, self.dates, self.assets)
+
+        def run(loader):
+            engine = SimplePipelineEngine(
+                lambda column: loader,
+                self.dates,
+                self.asset_finder,
+                result_cache=self.cache,
+            )
+            return engine.run_pipeline(
+                self.make_pipeline(), self.dates[5], self.dates[-1],
+            )
+
+        write_pricing(self.asset_info)
+        loader = USEquityPricingLoader.from_files(
+            pricing_path, adjustments_path,
+        )
+        expected = run(loader)
+        self.assertEqual(len(os.listdir(self.tempdir.path)), 1)
+
+        # Opening the same files again reads the results from the cache.
+        same_loader = USEquityPricingLoader.from_files(
+            pricing_path, adjustments_path,
+        )
+        self.assertEqual(same_loader.cache_identity, loader.cache_identity)
+        assert_frame_equal(run(same_loader), expected)
+        self.assertEqual(len(os.listdir(self.tempdir.path)), 1)
+
+        # Rewriting the pricing data in place misses the cache.
+        asset_info = self.asset_info.copy()
+        asset_info.loc[1, 'end_date'] = self.dates[20]
+        write_pricing(asset_info)
+        new_loader = USEquityPricingLoader.from_files(
+            pricing_path, adjustments_path,
+        )
+        self.assertNotEqual(new_loader.cache_identity, loader.cache_identity)
+        result = run(new_loader)
+        self.assertEqual(len(os.listdir(self.tempdir.path)), 2)
+        self.assertFalse(result.equals(expected))
+
+
+class CarriedAdjustmentsTestCase(TestCase):
+
+    def setUp(self):
+        self.env = TradingEnvironment()
+        self.dates = self.env.days_in_range(
+            Timestamp('2015-01-02', tz='UTC'),
+            Timestamp('2015-03-31', tz='UTC'),
+        )
+        self.assets = [1, 2]
+        asset_info = make_simple_equity_info(
+            self.assets,
+            start_date=self.dates[0],
+            end_date=self.dates[-1],
+        )
+        self.env.write_data(equities_df=asset_info)
+
+        self.tempdir = TempDirectory()
+        pricing_path = self.tempdir.getpath('pricing.bcolz')
+        adjustments_path = self.tempdir.getpath('adjustments.db')
+        SyntheticDailyBarWriter(
+            asset_info=asset_info[['start_date', 'end_date']],
+            calendar=self.dates,
+        ).write(pricing_path, self.dates, self.assets)
+
+        # Asset 1 splits on Saturday, 2015-02-07.
+        splits = DataFrame({
+            'sid': array([1], dtype='uint32'),
+            'effective_date': array(
+                [str_to_seconds('2015-02-07')], dtype='uint32',
+            ),
+            'ratio': array([0.5]),
+        })
+        no_adjustments = DataFrame({
+            'sid': array([], dtype='uint32'),
+            'effective_date': array([], dtype='uint32'),
+            'ratio': array([], dtype=float),
+        })
+        no_dividends = DataFrame({
+            'sid': array([], dtype='uint32'),
+            'amount': array([], dtype=float),
+            'record_date': array([], dtype='datetime64[ns]'),
+            'ex_date': array([], dtype='datetime64[ns]'),
+            'declared_date': array([], dtype='datetime64[ns]'),
+            'pay_date': array([], dtype='datetime64[ns]'),
+        })
+        SQLiteAdjustmentWriter(adjustments_path, None, None).write(
+            splits=splits,
+            mergers=no_adjustments,
+            dividends=no_dividends,
+        )
+        self.loader = USEquityPricingLoader.from_files(
+            pricing_path, adjustments_path,
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def make_engine(self):
+        loader = self.loader
+        return SimplePipelineEngine(
+            lambda column: loader, self.dates, self.env.asset_finder,
+        )
+
+    def test_weekend_ex_date(self):
+        p = Pipeline(columns={
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close], window_length=10,
+            ),
+        })
+        dates = self.dates
+        friday = dates.get_loc(Timestamp('2015-02-06', tz='UTC'))
+        monday = friday + 1
+
+        # The first chunk ends on the Friday before the split, so the rows
+        # kept for the second chunk, starting on Monday, predate it.
+        engine = self.make_engine()
+        engine.run_pipeline(p, dates[15], dates[friday])
+        result = engine.run_pipeline(p, dates[monday], dates[monday + 9])
+
+        expected = self.make_engine().run_pipeline(
+            p, dates[monday], dates[monday + 9],
+        )
+        assert_frame_equal(result, expected)
+
+        # The split is applied to the kept rows of asset 1.
+        unadjusted = SimplePipelineEngine(
+            lambda column: USEquityPricingLoader(
+                self.loader.raw_price_loader, NullAdjustmentReader(),
+            ),
+            dates,
+            self.env.asset_finder,
+        ).run_pipeline(p, dates[monday], dates[monday + 9])
+        sma = result['sma'].unstack()
+        unadjusted_sma = unadjusted['sma'].unstack()
+        self.assertTrue((sma[1] != unadjusted_sma[1]).all())
+        assert_frame_equal(sma[[2]], unadjusted_sma[[2]])
+
 
 class FrameInputTestCase(TestCase):
 
@@ -612,6 +1390,72 @@ class FrameInputTestCase(TestCase):
                 high_results = results.unstack()['high']
                 assert_frame_equal(high_results, high_base.iloc[iloc_bounds])
 
+    def test_rolling_kernels_with_adjustments(self):
+        dates, assets = self.dates, self.assets
+        low, high = USEquityPricing.low, USEquityPricing.high
+        adjustments = DataFrame.from_records(
+            [
+                dict(
+                    kind=MULTIPLY,
+                    sid=assets[i % 3],
+                    value=value,
+                    start_date=None,
+                    end_date=dates[apply_idx - 1],
+                    apply_date=dates[apply_idx],
+                )
+                for i, (apply_idx, value) in enumerate(
+                    [(3, 2.0), (4, 0.5), (10, 3.0), (16, 0.25)]
+                )
+            ]
+        )
+        data = arange(len(dates) * len(assets), dtype=float) + 1.0
+        data = self.make_frame(data.reshape(len(dates), len(assets)) ** 1.5)
+        data.iloc[5, 2] = nan
+        engine = SimplePipelineEngine(
+            {
+                low: DataFrameLoader(low, data * 0.5, adjustments=None),
+                high: DataFrameLoader(high, data, adjustments),
+            }.__getitem__,
+            self.dates,
+            self.asset_finder,
+        )
+
+        def per_day(cls):
+            # Overriding compute opts a subclass out of the rolling kernel.
+            def compute(self, *args, **kwargs):
+                return cls.compute(self, *args, **kwargs)
+            return type(cls.__name__, (cls,), {'compute': compute})
+
+        def make_pipeline(wrap):
+            return Pipeline(columns={
+                'sma': wrap(SimpleMovingAverage)(
+                    inputs=[high], window_length=4,
+                ),
+                'returns': wrap(Returns)(inputs=[high], window_length=3),
+                'rsi': wrap(RSI)(inputs=[high], window_length=5),
+                'weighted': wrap(WeightedAverageValue)(
+                    inputs=[high, low], window_length=4,
+                ),
+                'ewma': wrap(EWMA).from_span(
+                    inputs=[high], window_length=6, span=3,
+                ),
+                'ewmstd': wrap(EWMSTD).from_span(
+                    inputs=[high], window_length=6, span=3,
+                ),
+                'drawdown': wrap(MaxDrawdown)(
+                    inputs=[high], window_length=5,
+                ),
+            })
+
+        self.assertIsNone(
+            make_pipeline(per_day).columns['sma']._rolling_kernel
+        )
+        assert_frame_equal(
+            engine.run_pipeline(make_pipeline(lambda cls: cls),
+                                dates[5], dates[-1]),
+            engine.run_pipeline(make_pipeline(per_day), dates[5], dates[-1]),
+        )
+
 
 class SyntheticBcolzTestCase(TestCase):
 
@@ -781,6 +1625,48 @@ class SyntheticBcolzTestCase(TestCase):
 
         assert_frame_equal(expected, result)
 
+    def test_unmasked_custom_factor_columns(self):
+        engine = SimplePipelineEngine(
+            lambda column: self.pipeline_loader,
+            self.env.trading_days,
+            self.finder,
+        )
+        widths = []
+
+        class Sid(CustomFactor):
+            inputs = [USEquityPricing.close]
+            window_length = 2
+
+            def compute(self, today, assets, out, close):
+                widths.append((len(assets), close.shape[1]))
+                out[:] = assets
+
+        assets = self.all_assets
+        dates = date_range(
+            self.first_asset_start + self.trading_day,
+            self.last_asset_end,
+            freq=self.trading_day,
+        )
+        dates_to_test = dates[2:]
+        results = engine.run_pipeline(
+            Pipeline(columns={'sid': Sid()}),
+            dates_to_test[0],
+            dates_to_test[-1],
+        )
+
+        # Without a mask, `compute` is passed the same columns every day,
+        # including those of assets which don't exist on that day.
+        self.assertEqual(len(widths), len(dates_to_test))
+        self.assertEqual(set(widths), {(len(assets), len(assets))})
+
+        expected = DataFrame(
+            data=tile(assets.values.astype(float), (len(dates_to_test), 1)),
+            index=dates_to_test,
+            columns=self.finder.retrieve_all(assets),
+        )
+        self.write_nans(expected)
+        assert_frame_equal(results['sid'].unstack(), expected)
+
 
 class ParameterizedFactorTestCase(TestCase):
     @classmethod
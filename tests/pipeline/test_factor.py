@@ -280,7 +280,7 @@ class FactorTestCase(BasePipelineTestCase):
 
     def gen_ranking_cases():
         seeds = range(int(1e4), int(1e5), int(1e4))
-        methods = ('ordinal', 'average')
+        methods = ('ordinal', 'average', 'min', 'max', 'dense')
         use_mask_values = (True, False)
         set_missing_values = (True, False)
         ascending_values = (True, False)
@@ -18,11 +18,13 @@ from numpy import (
     ones,
     ones_like,
     putmask,
+    roll,
 )
 from numpy.random import randn, seed as random_seed
 
 from zipline.errors import BadPercentileBounds
 from zipline.pipeline import Filter, Factor, TermGraph
+from zipline.pipeline.filters.filter import SortedRows
 from zipline.utils.test_utils import check_arrays
 from zipline.utils.numpy_utils import float64_dtype
 
@@ -156,6 +158,46 @@ class FilterTestCase(BasePipelineTestCase):
             expected = expected_result(method, count, masked)
             check_arrays(result, expected)
 
+    def test_top_and_bottom_with_ties(self):
+        data = array([[1, 2, 2, 2, 3],
+                      [nan, 5, 5, nan, 5],
+                      [4, 4, 4, 4, 4],
+                      [0, nan, nan, nan, nan],
+                      [2, 1, 2, 1, 2]], dtype=float64)
+        mask = Mask()
+        mask_data = ones_like(data, dtype=bool)
+        mask_data[4, 0] = False
+
+        terms = {}
+        for count, masked in product((1, 2, 3, 7), (True, False)):
+            kwargs = {'N': count}
+            if masked:
+                kwargs['mask'] = mask
+            for method, ascending in (('top', False), ('bottom', True)):
+                name = '_'.join([method, str(count), str(masked)])
+                terms[name] = getattr(self.f, method)(**kwargs)
+                terms['rank_' + name] = self.f.rank(
+                    ascending=ascending, **kwargs
+                ) <= count
+
+        results = self.run_graph(
+            TermGraph(terms),
+            initial_workspace={self.f: data, mask: mask_data},
+        )
+        for name in terms:
+            if not name.startswith('rank_'):
+                # Ties should be broken by column, as with ordinal ranks.
+                check_arrays(results[name], results['rank_' + name])
+
+        check_arrays(
+            results['top_2_False'],
+            array([[0, 1, 0, 0, 1],
+                   [0, 1, 1, 0, 0],
+                   [1, 1, 0, 0, 0],
+                   [1, 0, 0, 0, 0],
+                   [1, 0, 1, 0, 0]], dtype=bool),
+        )
+
     def test_bottom(self):
         counts = 2, 3, 10
         data = self.randn_data(seed=5)  # Arbitrary seed choice.
@@ -179,6 +221,25 @@ class FilterTestCase(BasePipelineTestCase):
             expected = rowwise_rank(data) < c
             check_arrays(result, expected)
 
+    def test_percentile_filters_share_sort(self):
+        mask = Mask()
+        graph = TermGraph(
+            {
+                'low': self.f.percentile_between(0.0, 20.0),
+                'high': self.f.percentile_between(80.0, 100.0),
+                'masked': self.f.percentile_between(0.0, 20.0, mask=mask),
+                'other': self.g.percentile_between(0.0, 20.0),
+            }
+        )
+        sorted_rows = [term for term in graph if isinstance(term, SortedRows)]
+        self.assertEqual(
+            sorted(
+                (term.inputs[0] is self.f, term.mask is mask)
+                for term in sorted_rows
+            ),
+            [(False, False), (True, False), (True, True)],
+        )
+
     def test_percentile_between(self):
 
         quintiles = range(5)
@@ -288,6 +349,26 @@ class FilterTestCase(BasePipelineTestCase):
             )
             check_arrays(result, expected)
 
+    def test_percentile_with_infinities(self):
+        # Each row holds -inf, 0, 1, 2 and inf, in a different order.
+        data = array(
+            [roll([-inf, 0.0, 1.0, 2.0, inf], i) for i in range(5)],
+        )
+        graph = TermGraph(
+            {
+                # Both bounds are interpolated with an infinite value.
+                'wide': self.f.percentile_between(10.0, 90.0),
+                'narrow': self.f.percentile_between(30.0, 50.0),
+            }
+        )
+        results = self.run_graph(
+            graph,
+            initial_workspace={self.f: data},
+            mask=self.build_mask(ones((5, 5))),
+        )
+        check_arrays(results['wide'], ones((5, 5), dtype=bool))
+        check_arrays(results['narrow'], data == 1.0)
+
     def test_percentile_after_mask(self):
         f_input = eye(5)
         g_input = arange(25, dtype=float).reshape(5, 5)
@@ -52,6 +52,10 @@ class NoLookbackFactor(Factor):
     window_length = 0
 
 
+class ColumnwiseFactor(SomeFactor):
+    columnwise = True
+
+
 def gen_equivalent_factors():
     """
     Return an iterator of SomeFactor instances that should all be the same
@@ -162,6 +166,58 @@ class DependencyResolutionTestCase(TestCase):
         with self.assertRaises(InputTermNotAtomic):
             SomeFactor(inputs=[SomeFactor(), SomeDataSet.foo])
 
+    def test_merge_equivalent_terms(self):
+        f, g = SomeFactor(), SomeOtherFactor()
+        # The operands of these expressions are bound in different orders,
+        # so they are distinct terms.
+        sum1, sum2 = (f * 2) + (g * 3), (g * 3) + (f * 2)
+        self.assertIsNot(sum1, sum2)
+        rank1, rank2 = sum1.rank(), sum2.rank()
+        self.assertIsNot(rank1, rank2)
+
+        graph = TermGraph({
+            'sum1': sum1,
+            'sum2': sum2,
+            'rank1': rank1,
+            'rank2': rank2,
+            'gt': f > g,
+            'lt': g < f,
+        })
+        outputs = graph.outputs
+        self.assertIs(outputs['sum1'], outputs['sum2'])
+        self.assertIs(outputs['rank1'], outputs['rank2'])
+        self.assertIs(outputs['gt'], outputs['lt'])
+
+        # f, g, their inputs, AssetExists, one sum, one rank and one filter.
+        self.assertEqual(len(graph), 9)
+        rank = outputs['rank1']
+        self.assertEqual(
+            graph.computed_term(rank).inputs, (outputs['sum1'],),
+        )
+
+    def test_screen_masks_columnwise_outputs(self):
+        columnwise = ColumnwiseFactor()
+        other = SomeOtherFactor()
+        screen = NoLookbackFactor([SomeDataSet.buzz]) > 0
+
+        graph = TermGraph(
+            {'columnwise': columnwise, 'other': other, 'screen': screen},
+            screen_name='screen',
+        )
+        self.assertIs(graph.computed_term(columnwise).mask, screen)
+        self.assertIs(graph.computed_term(other), other)
+        # The screen only needs the rows of the outputs it masks.
+        self.assertEqual(graph.extra_rows[screen], 0)
+        self.assertEqual(graph.extra_rows[SomeDataSet.foo], 4)
+
+        # Terms which other terms depend on are computed over their masks.
+        graph = TermGraph(
+            {'columnwise': columnwise, 'rank': columnwise.rank(),
+             'screen': screen},
+            screen_name='screen',
+        )
+        self.assertIs(graph.computed_term(columnwise), columnwise)
+
 
 class ObjectIdentityTestCase(TestCase):
 
@@ -134,3 +134,77 @@ class TestRisk(unittest.TestCase):
                 self.cumulative_metrics_06.max_drawdowns[dt_loc],
                 value,
                 err_msg="Mismatch at %s" % (dt,))
+
+    def test_repeated_updates_for_dt(self):
+        # Minute emission updates the latest dt many times; only the last
+        # update for each dt should contribute to later values.
+        metrics = risk.RiskMetricsCumulative(self.sim_params, env=self.env)
+        for dt, returns in answer_key.RETURNS_DATA.iterrows():
+            metrics.update(dt,
+                           returns['Algorithm Returns'] + 0.01,
+                           returns['Benchmark Returns'] - 0.01,
+                           0.0)
+            metrics.update(dt,
+                           returns['Algorithm Returns'],
+                           returns['Benchmark Returns'],
+                           0.0)
+
+        expected = self.cumulative_metrics_06
+        for field in ('algorithm_volatility',
+                      'benchmark_volatility',
+                      'beta',
+                      'alpha',
+                      'sharpe',
+                      'downside_risk',
+                      'sortino',
+                      'algorithm_cumulative_returns'):
+            np.testing.assert_almost_equal(
+                getattr(metrics, field),
+                getattr(expected, field),
+                err_msg="Mismatch in %s" % field,
+            )
+
+    def test_deferred_metrics_match_cumulative(self):
+        metrics = risk.RiskMetricsCumulative(self.sim_params, env=self.env)
+        for dt, returns in answer_key.RETURNS_DATA.iterrows():
+            metrics.record(dt,
+                           returns['Algorithm Returns'],
+                           returns['Benchmark Returns'],
+                           0.0)
+        metrics.finalize()
+
+        expected = self.cumulative_metrics_06
+        for field in ('algorithm_volatility',
+                      'benchmark_volatility',
+                      'beta',
+                      'alpha',
+                      'sharpe',
+                      'downside_risk',
+                      'sortino',
+                      'information',
+                      'excess_returns',
+                      'algorithm_cumulative_returns',
+                      'benchmark_cumulative_returns',
+                      'max_drawdowns',
+                      'max_leverages'):
+            np.testing.assert_almost_equal(
+                getattr(metrics, field),
+                getattr(expected, field),
+                err_msg="Mismatch in %s" % field,
+            )
+
+        actual_dict = metrics.to_dict()
+        expected_dict = expected.to_dict()
+        self.assertEqual(set(actual_dict), set(expected_dict))
+        for key, value in expected_dict.items():
+            if isinstance(value, float):
+                np.testing.assert_almost_equal(actual_dict[key], value)
+            else:
+                self.assertEqual(actual_dict[key], value)
+
+        dt = answer_key.RETURNS_DATA.index[100]
+        self.assertEqual(metrics.to_dict(dt)['trading_days'], 101)
+        np.testing.assert_almost_equal(
+            metrics.to_dict(dt)['sharpe'],
+            expected.sharpe[expected.cont_index.get_loc(dt)],
+        )
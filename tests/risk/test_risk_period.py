@@ -20,7 +20,7 @@ import numpy as np
 import pytz
 
 from itertools import chain
-from six import itervalues
+from six import iteritems, itervalues
 
 import zipline.finance.risk as risk
 from zipline.utils import factory
@@ -640,3 +640,68 @@ class TestRisk(unittest.TestCase):
         )
         for risk_period in chain.from_iterable(itervalues(report.to_dict())):
             self.assertIsNone(risk_period['beta'])
+
+    def test_periods_match_risk_metrics_period(self):
+        returns = self.algo_returns_06.copy()
+        # A day losing everything restarts the compounded returns used for
+        # the max drawdown.
+        returns.iloc[40] = -1.0
+        report = risk.RiskReport(
+            returns,
+            self.sim_params,
+            benchmark_returns=self.benchmark_returns_06,
+            env=self.env,
+            algorithm_leverages=[0.5, 1.5],
+        )
+        for periods in (report.month_periods,
+                        report.three_month_periods,
+                        report.six_month_periods,
+                        report.year_periods):
+            for period in periods:
+                expected = risk.RiskMetricsPeriod(
+                    period.start_date,
+                    period.end_date,
+                    returns,
+                    env=self.env,
+                    benchmark_returns=self.benchmark_returns_06,
+                    algorithm_leverages=[0.5, 1.5],
+                ).to_dict()
+                actual = period.to_dict()
+                self.assertEqual(set(actual), set(expected))
+                for key, value in iteritems(expected):
+                    if value is None or key == 'period_label':
+                        self.assertEqual(actual[key], value, key)
+                    else:
+                        self.assertAlmostEqual(actual[key], value, 10, key)
+
+    def test_periods_recalculate(self):
+        report = risk.RiskReport(
+            self.algo_returns_06,
+            self.sim_params,
+            benchmark_returns=self.benchmark_returns_06,
+            env=self.env,
+        )
+        for periods in (report.month_periods,
+                        report.three_month_periods,
+                        report.six_month_periods,
+                        report.year_periods):
+            for period in periods:
+                expected = risk.RiskMetricsPeriod(
+                    period.start_date,
+                    period.end_date,
+                    self.algo_returns_06,
+                    env=self.env,
+                    benchmark_returns=self.benchmark_returns_06,
+                )
+                # The periods have every attribute set by __init__.
+                self.assertEqual(set(vars(period)), set(vars(expected)))
+
+                for name in ('calculate_sortino',
+                             'calculate_sharpe',
+                             'calculate_information'):
+                    np.testing.assert_almost_equal(
+                        getattr(period, name)(),
+                        getattr(expected, name)(),
+                        decimal=10,
+                        err_msg=name,
+                    )
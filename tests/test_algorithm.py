@@ -823,6 +823,47 @@ class TestTransformAlgorithm(TestCase):
 
         algo.run(self.df)
 
+    def test_deferred_risk_matches_cumulative(self):
+        results = {}
+        for risk_mode in ('cumulative', 'deferred'):
+            algo = TestOrderAlgorithm(
+                sim_params=self.sim_params,
+                env=self.env,
+                risk_mode=risk_mode,
+            )
+            results[risk_mode] = algo.run(self.df)
+
+        expected = results['cumulative']
+        actual = results['deferred']
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        for column in ('algo_volatility',
+                       'benchmark_volatility',
+                       'algorithm_period_return',
+                       'benchmark_period_return',
+                       'treasury_period_return',
+                       'alpha',
+                       'beta',
+                       'sharpe',
+                       'sortino',
+                       'information',
+                       'excess_return',
+                       'max_drawdown',
+                       'max_leverage',
+                       'trading_days'):
+            np.testing.assert_almost_equal(
+                actual[column].values.astype(float),
+                expected[column].values.astype(float),
+                err_msg="Mismatch in %s" % column,
+            )
+        np.testing.assert_array_equal(
+            actual['trading_days'].values,
+            np.arange(1, len(actual) + 1),
+        )
+        np.testing.assert_array_equal(
+            actual['period_label'].values,
+            expected['period_label'].values,
+        )
+
     def test_order_method_style_forwarding(self):
 
         method_names_to_test = ['order',
@@ -882,6 +882,16 @@ class AssetFinderTestCase(TestCase):
             result = finder.lifetimes(dates, include_start_date=False)
             assert_frame_equal(result, expected_no_start)
 
+            # Assets which didn't exist on any of the dates are left out.
+            for include_start_date, expected in ((True, expected_with_start),
+                                                 (False, expected_no_start)):
+                result = finder.lifetimes(
+                    dates,
+                    include_start_date=include_start_date,
+                    only_alive=True,
+                )
+                assert_frame_equal(result, expected.loc[:, expected.any()])
+
     def test_sids(self):
         # Ensure that the sids property of the AssetFinder is functioning
         self.env.write_data(equities_identifiers=[1, 2, 3])
@@ -14,8 +14,13 @@
 # limitations under the License.
 
 import os
+from textwrap import dedent
 from unittest import TestCase
+
+import pandas as pd
+from pandas.util.testing import assert_frame_equal
 from six import iteritems
+from testfixtures import TempDirectory
 
 from zipline.utils import parse_args
 from zipline.utils import cli
@@ -68,3 +73,84 @@ start=1990-1-1
                              cli.DEFAULTS['data_frequency'])
         finally:
             os.remove('test.conf')
+
+    def test_sweep_args(self):
+        args = parse_args(['--sweep', 'grid.json', '--processes', '4'])
+        self.assertEqual(args['sweep'], 'grid.json')
+        self.assertEqual(args['processes'], 4)
+
+        args = parse_args([])
+        self.assertIsNone(args['sweep'])
+        self.assertIsNone(args['processes'])
+
+
+class TestExpandParamGrid(TestCase):
+    def test_grid(self):
+        self.assertEqual(
+            cli.expand_param_grid({'window': [10, 20], 'slippage': [0.1]}),
+            [{'slippage': 0.1, 'window': 10},
+             {'slippage': 0.1, 'window': 20}],
+        )
+
+    def test_list(self):
+        params = [{'window': 10}, {'window': 20, 'slippage': 0.1}]
+        self.assertEqual(cli.expand_param_grid(params), params)
+
+
+class TestRunSweep(TestCase):
+    def setUp(self):
+        self.tempdir = TempDirectory()
+        dates = pd.date_range('2014-01-02', '2014-01-10', freq='B',
+                              name='Date')
+        prices = pd.DataFrame({'AAPL': range(10, 10 + len(dates))},
+                              index=dates)
+        self.source = self.tempdir.getpath('prices.csv')
+        prices.to_csv(self.source)
+        self.dates = dates
+        self.grid = {'amount': [1, 2], 'scale': [10, 100]}
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def run_sweep(self, processes):
+        algo_text = dedent("""
+        from zipline.api import record
+
+        def initialize(context):
+            pass
+
+        def handle_data(context, data):
+            record(scaled=amount * scale)
+        """)
+        return cli.run_sweep(
+            self.grid,
+            processes=processes,
+            fields=['scaled'],
+            algo_text=algo_text,
+            source=self.source,
+            source_time_column='Date',
+            symbols='AAPL',
+            metadata_index='symbol',
+            metadata_path=None,
+            capital_base='1e6',
+            start='2014-01-02',
+            end='2014-01-10',
+        )
+
+    def test_run_sweep(self):
+        perf = self.run_sweep(processes=1)
+
+        self.assertEqual(list(perf.index.names), ['run', 'dt'])
+        self.assertEqual(sorted(perf.columns), ['amount', 'scale', 'scaled'])
+        # The runs are numbered in the order of the expanded grid.
+        for run, params in enumerate(cli.expand_param_grid(self.grid)):
+            result = perf.loc[run]
+            self.assertEqual(len(result), len(self.dates))
+            self.assertTrue((result['amount'] == params['amount']).all())
+            self.assertTrue((result['scale'] == params['scale']).all())
+            self.assertTrue(
+                (result['scaled'] == params['amount'] * params['scale']).all()
+            )
+
+        # Sharing the runs between processes gives the same results.
+        assert_frame_equal(self.run_sweep(processes=2), perf)
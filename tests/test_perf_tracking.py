@@ -35,6 +35,7 @@ from six.moves import range, zip
 
 import zipline.utils.factory as factory
 import zipline.finance.performance as perf
+from zipline.finance.performance.results import DailyStatsBuilder
 from zipline.finance.transaction import Transaction, create_transaction
 import zipline.utils.math_utils as zp_math
 
@@ -2193,7 +2194,7 @@ class TestPositionTracker(unittest.TestCase):
         cls.env = TradingEnvironment()
         futures_metadata = {3: {'contract_multiplier': 1000},
                             4: {'contract_multiplier': 1000}}
-        cls.env.write_data(equities_identifiers=[1, 2],
+        cls.env.write_data(equities_identifiers=[1, 2] + list(range(100, 200)),
                            futures_data=futures_metadata)
 
     @classmethod
@@ -2247,6 +2248,59 @@ class TestPositionTracker(unittest.TestCase):
         self.assertEqual(0, pt.update_last_sale(event1))
         self.assertEqual(100000, pt.update_last_sale(event3))
 
+    def test_update_last_sales(self):
+        pt = perf.PositionTracker(self.env.asset_finder)
+        dt = pd.Timestamp("1984/03/06 3:00PM")
+        pos1 = perf.Position(1, amount=np.float64(100.0),
+                             last_sale_date=dt, last_sale_price=10)
+        pos3 = perf.Position(3, amount=np.float64(100.0),
+                             last_sale_date=dt, last_sale_price=10)
+        pt.update_positions({1: pos1, 3: pos3})
+
+        new_dt = dt + oneday
+        # sid 2 has no position and sid 1's NaN price is ignored.
+        cash_adjustment = pt.update_last_sales(
+            [1, 2, 3, 1],
+            [11.0, 12.0, 11.0, np.nan],
+            new_dt,
+        )
+
+        self.assertEqual(100000, cash_adjustment)
+        self.assertNotIn(2, pt.positions)
+        for sid in 1, 3:
+            self.assertEqual(pt.positions[sid].last_sale_price, 11.0)
+            self.assertEqual(pt.positions[sid].last_sale_date, new_dt)
+
+    def test_period_packets(self):
+        pt = perf.PositionTracker(self.env.asset_finder)
+        pp = perf.PerformancePeriod(1000, self.env.asset_finder)
+        pp.position_tracker = pt
+
+        dt = pd.Timestamp("1984/03/06 3:00PM")
+        packets = []
+        for i, sid in enumerate([1, 2, 1]):
+            txn = Transaction(sid, 10, dt, 10.0 + i, 'order-%d' % i)
+            pt.execute_transaction(txn)
+            pp.handle_execution(txn)
+            pp.calculate_performance()
+            packets.append((pp.to_dict(), pp.to_packet(),
+                            pp.to_dict(dt), pp.to_packet(dt)))
+
+        # Releasing the records builds the packets which are still in use.
+        pp.release_packets()
+        self.assertEqual(len(pp.recorder), 0)
+
+        for expected, packet, expected_dt, packet_dt in packets:
+            self.assertEqual(dict(packet), expected)
+            self.assertEqual(dict(packet_dt), expected_dt)
+
+        packet = pp.to_packet()
+        packet['recorded_vars'] = {'x': 1}
+        self.assertEqual(packet['recorded_vars'], {'x': 1})
+        expected = pp.to_dict()
+        expected['recorded_vars'] = {'x': 1}
+        self.assertEqual(dict(packet), expected)
+
     def test_position_values_and_exposures(self):
         pt = perf.PositionTracker(self.env.asset_finder)
         dt = pd.Timestamp("1984/03/06 3:00PM")
@@ -2293,8 +2347,45 @@ class TestPositionTracker(unittest.TestCase):
         test = loads_with_persistent_ids(p_string, env=self.env)
         nt.assert_count_equal(test.positions.keys(), pt.positions.keys())
         for sid in pt.positions:
-            nt.assert_dict_equal(test.positions[sid].__dict__,
-                                 pt.positions[sid].__dict__)
+            nt.assert_dict_equal(test.positions[sid].to_dict(),
+                                 pt.positions[sid].to_dict())
+            nt.assert_equal(test.positions[sid].last_sale_date,
+                            pt.positions[sid].last_sale_date)
+
+    def test_positions_are_array_views(self):
+        pt = perf.PositionTracker(self.env.asset_finder)
+        dt = pd.Timestamp("1984/03/06 3:00PM")
+        # Enough positions to force the backing arrays to grow.
+        positions = {
+            sid: perf.Position(sid, amount=sid, last_sale_date=dt,
+                               last_sale_price=10)
+            for sid in [1, 2] + list(range(100, 200))
+        }
+        pt.update_positions(positions)
+
+        pos = pt.positions[2]
+        pos.amount = -20
+        slot = pt.positions.slot(2)
+        self.assertEqual(pt.positions.amounts[slot], -20)
+
+        pt.positions.last_sale_prices[slot] = 5.0
+        self.assertEqual(pos.last_sale_price, 5.0)
+
+        pos_stats = pt.stats()
+        long_value = 10 * (1 + sum(range(100, 200)))
+        self.assertEqual(long_value, pos_stats.long_value)
+        self.assertEqual(-100, pos_stats.short_value)
+        self.assertEqual(101, pos_stats.longs_count)
+        self.assertEqual(1, pos_stats.shorts_count)
+
+        portfolio_positions = pt.get_positions()
+        self.assertEqual(len(portfolio_positions), 102)
+        self.assertEqual(portfolio_positions[2].amount, -20)
+
+        pos.amount = 0
+        portfolio_positions = pt.get_positions()
+        self.assertNotIn(2, portfolio_positions)
+        self.assertNotIn(2, [p['sid'] for p in pt.get_positions_list()])
 
 
 class TestPerformancePeriod(unittest.TestCase):
@@ -2319,3 +2410,41 @@ class TestPerformancePeriod(unittest.TestCase):
 
         for k in equal_keys:
             nt.assert_equal(test.__dict__[k], correct[k])
+
+
+class TestDailyStatsBuilder(unittest.TestCase):
+
+    def test_matches_frame_from_dicts(self):
+        days = pd.date_range('2015-01-05', periods=3, tz='UTC')
+        stats = [
+            {'returns': 0.01, 'positions': [{'sid': 1, 'amount': 10}]},
+            {'returns': -0.02, 'leverage': 1.5},
+            {'positions': [], 'leverage': 1.0, 'returns': 0.0},
+        ]
+
+        builder = DailyStatsBuilder()
+        for dt, day_stats in zip(days, stats):
+            builder.append(dt, day_stats)
+
+        self.assertEqual(len(builder), 3)
+        pd.util.testing.assert_frame_equal(
+            builder.to_frame(),
+            pd.DataFrame(stats, index=days),
+        )
+
+    def test_update_existing_row(self):
+        days = pd.date_range('2015-01-05', periods=2, tz='UTC')
+        builder = DailyStatsBuilder()
+        builder.append(days[0], {'returns': 0.01})
+        builder.append(days[1], {'returns': -0.02})
+
+        builder.update(0, {'returns': 0.03, 'sharpe': 1.0})
+        builder.update(1, {'sharpe': 2.0})
+
+        pd.util.testing.assert_frame_equal(
+            builder.to_frame(),
+            pd.DataFrame(
+                {'returns': [0.03, -0.02], 'sharpe': [1.0, 2.0]},
+                index=days,
+            ),
+        )
@@ -67,6 +67,7 @@ from zipline.finance.execution import (
     StopOrder,
 )
 from zipline.finance.performance import PerformanceTracker
+from zipline.finance.performance.results import DailyStatsBuilder
 from zipline.finance.slippage import (
     VolumeShareSlippage,
     SlippageModel,
@@ -76,6 +77,7 @@ from zipline.assets import Asset, Future
 from zipline.assets.futures import FutureChain
 from zipline.gens.composites import date_sorted_sources
 from zipline.gens.tradesimulation import AlgorithmSimulator
+from zipline.pipeline.cache import PipelineResultCache
 from zipline.pipeline.engine import (
     NoOpPipelineEngine,
     SimplePipelineEngine,
@@ -155,6 +157,11 @@ class TradingAlgorithm(object):
                How much capital to start with.
             instant_fill : bool <default: False>
                Whether to fill orders immediately or on next bar.
+            risk_mode : {'cumulative', 'deferred'} <default: 'cumulative'>
+               Whether to update cumulative risk metrics on every bar, or to
+               calculate them once at the end of the simulation.  With
+               'deferred', perf packets have no cumulative_risk_metrics, but
+               the risk columns of the results of run() are still filled in.
             asset_finder : An AssetFinder object
                 A new AssetFinder object to be used in this TradingEnvironment
             equities_metadata : can be either:
@@ -176,6 +183,9 @@ class TradingAlgorithm(object):
             identifiers : List
                 Any asset identifiers that are not provided in the
                 equities_metadata, but will be traded by this TradingAlgorithm
+            pipeline_result_cache : str or PipelineResultCache
+                Directory in which to cache the results of pipelines across
+                runs of the algorithm.
         """
         self.sources = []
 
@@ -200,6 +210,8 @@ class TradingAlgorithm(object):
 
         self.instant_fill = kwargs.pop('instant_fill', False)
 
+        self.risk_mode = kwargs.pop('risk_mode', 'cumulative')
+
         # If an env has been provided, pop it
         self.trading_environment = kwargs.pop('env', None)
 
@@ -228,13 +240,17 @@ class TradingAlgorithm(object):
 
         # Build a perf_tracker
         self.perf_tracker = PerformanceTracker(sim_params=self.sim_params,
-                                               env=self.trading_environment)
+                                               env=self.trading_environment,
+                                               risk_mode=self.risk_mode)
 
         # Pull in the environment's new AssetFinder for quick reference
         self.asset_finder = self.trading_environment.asset_finder
 
         # Initialize Pipeline API data.
-        self.init_engine(kwargs.pop('get_pipeline_loader', None))
+        self.init_engine(
+            kwargs.pop('get_pipeline_loader', None),
+            kwargs.pop('pipeline_result_cache', None),
+        )
         self._pipelines = {}
         # Create an always-expired cache so that we compute the first time data
         # is requested.
@@ -328,17 +344,23 @@ class TradingAlgorithm(object):
         self.initialize_args = args
         self.initialize_kwargs = kwargs
 
-    def init_engine(self, get_loader):
+    def init_engine(self, get_loader, result_cache=None):
         """
         Construct and store a PipelineEngine from loader.
 
         If get_loader is None, constructs a NoOpPipelineEngine.
+
+        result_cache may be a PipelineResultCache or the path of its
+        directory, in which case pipeline results are cached across runs.
         """
         if get_loader is not None:
+            if isinstance(result_cache, string_types):
+                result_cache = PipelineResultCache(result_cache)
             self.engine = SimplePipelineEngine(
                 get_loader,
                 self.trading_environment.trading_days,
                 self.asset_finder,
+                result_cache=result_cache,
             )
         else:
             self.engine = NoOpPipelineEngine()
@@ -466,7 +488,9 @@ class TradingAlgorithm(object):
             # HACK: When running with the `run` method, we set perf_tracker to
             # None so that it will be overwritten here.
             self.perf_tracker = PerformanceTracker(
-                sim_params=sim_params, env=self.trading_environment
+                sim_params=sim_params,
+                env=self.trading_environment,
+                risk_mode=self.risk_mode,
             )
 
         self.portfolio_needs_update = True
@@ -587,13 +611,8 @@ class TradingAlgorithm(object):
             )
 
         # loop through simulated_trading, each iteration returns a
-        # perf dictionary
-        perfs = []
-        for perf in self.gen:
-            perfs.append(perf)
-
-        # convert perf dict to pandas dataframe
-        daily_stats = self._create_daily_stats(perfs)
+        # perf dictionary which is consumed as soon as it is produced
+        daily_stats = self._create_daily_stats(self.gen)
 
         self.analyze(daily_stats)
 
@@ -630,26 +649,39 @@ class TradingAlgorithm(object):
 
     def _create_daily_stats(self, perfs):
         # create daily and cumulative stats dataframe
-        daily_perfs = []
+        daily_stats = DailyStatsBuilder()
+        # With deferred risk, the metrics for every day are only available
+        # once the simulation has ended, so we remember the rows that are
+        # missing them and fill them in after the last packet.
+        deferred_risk_rows = []
         # TODO: the loop here could overwrite expected properties
         # of daily_perf. Could potentially raise or log a
         # warning.
         for perf in perfs:
             if 'daily_perf' in perf:
 
-                perf['daily_perf'].update(
-                    perf['daily_perf'].pop('recorded_vars')
+                daily_perf = perf['daily_perf']
+                daily_perf.update(daily_perf.pop('recorded_vars'))
+                if 'cumulative_risk_metrics' in perf:
+                    daily_perf.update(perf['cumulative_risk_metrics'])
+                else:
+                    deferred_risk_rows.append(
+                        (len(daily_stats),
+                         normalize_date(daily_perf['period_close']))
+                    )
+                daily_stats.append(
+                    np.datetime64(daily_perf['period_close'], utc=True),
+                    daily_perf,
                 )
-                perf['daily_perf'].update(perf['cumulative_risk_metrics'])
-                daily_perfs.append(perf['daily_perf'])
             else:
                 self.risk_report = perf
 
-        daily_dts = [np.datetime64(perf['period_close'], utc=True)
-                     for perf in daily_perfs]
-        daily_stats = pd.DataFrame(daily_perfs, index=daily_dts)
+        if deferred_risk_rows:
+            risk_metrics = self.perf_tracker.cumulative_risk_metrics
+            for row, dt in deferred_risk_rows:
+                daily_stats.update(row, risk_metrics.to_dict(dt))
 
-        return daily_stats
+        return daily_stats.to_frame()
 
     @api_method
     def add_transform(self, transform, days=None):
@@ -121,6 +121,8 @@ class AssetFinder(object):
 
         # Populated on first call to `lifetimes`.
         self._asset_lifetimes = None
+        self._lifetimes_start_order = None
+        self._lifetimes_sorted_starts = None
 
     def _reset_caches(self):
         """
@@ -825,7 +827,34 @@ class AssetFinder(object):
             ('end', '<i8'),
         ])
 
-    def lifetimes(self, dates, include_start_date):
+    def _alive_lifetimes(self, first_date, last_date, include_start_date):
+        """
+        Look up the lifetimes of the assets alive at some point between
+        `first_date` and `last_date`, given as nanoseconds since the epoch, in
+        the order of our lifetimes.
+
+        Assets are kept sorted by start date, so the assets started by
+        `last_date` are found with a binary search, and only their end dates
+        are compared to `first_date`.
+        """
+        order = self._lifetimes_start_order
+        if order is None:
+            order = self._lifetimes_start_order = \
+                self._asset_lifetimes.start.argsort(kind='mergesort')
+            self._lifetimes_sorted_starts = self._asset_lifetimes.start[order]
+
+        started = self._lifetimes_sorted_starts.searchsorted(
+            last_date,
+            side='right' if include_start_date else 'left',
+        )
+        candidates = order[:started]
+        alive = candidates[
+            self._asset_lifetimes.end[candidates] >= first_date
+        ]
+        alive.sort()
+        return self._asset_lifetimes[alive]
+
+    def lifetimes(self, dates, include_start_date, only_alive=False):
         """
         Compute a DataFrame representing asset lifetimes for the specified date
         range.
@@ -842,6 +871,10 @@ class AssetFinder(object):
             this date?"  For many financial metrics, (e.g. daily close), data
             isn't available for an asset until the end of the asset's first
             day.
+        only_alive : bool, optional
+            Whether to leave out the assets which didn't exist between the
+            first and last of `dates`.  The remaining assets are found without
+            computing the lifetimes of every asset.  Default is False.
 
         Returns
         -------
@@ -863,9 +896,13 @@ class AssetFinder(object):
         # programming feature.
         if self._asset_lifetimes is None:
             self._asset_lifetimes = self._compute_asset_lifetimes()
-        lifetimes = self._asset_lifetimes
-
         raw_dates = dates.asi8[:, None]
+        if only_alive and len(dates):
+            lifetimes = self._alive_lifetimes(
+                raw_dates[0, 0], raw_dates[-1, 0], include_start_date,
+            )
+        else:
+            lifetimes = self._asset_lifetimes
         if include_start_date:
             mask = lifetimes.start <= raw_dates
         else:
@@ -88,6 +88,8 @@ from six import itervalues, iteritems
 
 import zipline.protocol as zp
 
+from . recorder import PERIOD_FIELDS, PeriodRecorder
+
 from zipline.utils.serialization_utils import (
     VERSION_LABEL
 )
@@ -166,6 +168,7 @@ class PerformancePeriod(object):
         self._execution_cash_flow_multipliers = {}
 
     _position_tracker = None
+    _recorder = None
 
     @property
     def position_tracker(self):
@@ -188,6 +191,8 @@ class PerformancePeriod(object):
         self.processed_transactions = {}
         self.orders_by_modified = {}
         self.orders_by_id = OrderedDict()
+        # every kept transaction of the period, in the order processed
+        self._transaction_log = []
 
     def handle_dividends_paid(self, net_cash_payment):
         if net_cash_payment:
@@ -247,6 +252,7 @@ class PerformancePeriod(object):
                 self.processed_transactions[txn.dt].append(txn)
             except KeyError:
                 self.processed_transactions[txn.dt] = [txn]
+            self._transaction_log.append(txn)
 
     def _calculate_execution_cash_flow(self, txn):
         """
@@ -277,36 +283,37 @@ class PerformancePeriod(object):
     def position_amounts(self):
         return self.position_tracker.position_amounts
 
-    def __core_dict(self):
+    def _core_values(self):
+        """
+        The values of PERIOD_FIELDS for the current state of the period.
+        """
         pos_stats = self.position_tracker.stats()
         period_stats = calc_period_stats(pos_stats, self.ending_cash)
 
-        rval = {
-            'ending_value': self.ending_value,
-            'ending_exposure': self.ending_exposure,
+        return (
+            self.ending_value,
+            self.ending_exposure,
             # this field is renamed to capital_used for backward
             # compatibility.
-            'capital_used': self.period_cash_flow,
-            'starting_value': self.starting_value,
-            'starting_exposure': self.starting_exposure,
-            'starting_cash': self.starting_cash,
-            'ending_cash': self.ending_cash,
-            'portfolio_value': self.ending_cash + self.ending_value,
-            'pnl': self.pnl,
-            'returns': self.returns,
-            'period_open': self.period_open,
-            'period_close': self.period_close,
-            'gross_leverage': period_stats.gross_leverage,
-            'net_leverage': period_stats.net_leverage,
-            'short_exposure': pos_stats.short_exposure,
-            'long_exposure': pos_stats.long_exposure,
-            'short_value': pos_stats.short_value,
-            'long_value': pos_stats.long_value,
-            'longs_count': pos_stats.longs_count,
-            'shorts_count': pos_stats.shorts_count,
-        }
-
-        return rval
+            self.period_cash_flow,
+            self.starting_value,
+            self.starting_exposure,
+            self.starting_cash,
+            self.ending_cash,
+            self.ending_cash + self.ending_value,
+            self.pnl,
+            self.returns,
+            self.period_open,
+            self.period_close,
+            period_stats.gross_leverage,
+            period_stats.net_leverage,
+            pos_stats.short_exposure,
+            pos_stats.long_exposure,
+            pos_stats.short_value,
+            pos_stats.long_value,
+            pos_stats.longs_count,
+            pos_stats.shorts_count,
+        )
 
     def to_dict(self, dt=None):
         """
@@ -316,7 +323,7 @@ class PerformancePeriod(object):
         Kwargs:
             dt (datetime): If present, only return transactions for the dt.
         """
-        rval = self.__core_dict()
+        rval = dict(zip(PERIOD_FIELDS, self._core_values()))
 
         if self.serialize_positions:
             positions = self.position_tracker.get_positions_list()
@@ -339,18 +346,63 @@ class PerformancePeriod(object):
             rval['transactions'] = transactions
 
         if self.keep_orders:
+            rval['orders'] = self._orders_list(dt)
+
+        return rval
+
+    def _orders_list(self, dt):
+        if dt:
+            # only include orders modified as of the given dt.
+            try:
+                return [x.to_dict()
+                        for x in itervalues(self.orders_by_modified[dt])]
+            except KeyError:
+                return []
+        return [x.to_dict() for x in itervalues(self.orders_by_id)]
+
+    @property
+    def recorder(self):
+        if self._recorder is None:
+            self._recorder = PeriodRecorder()
+        return self._recorder
+
+    def to_packet(self, dt=None):
+        """
+        Records the state of this performance period in ``self.recorder``.
+
+        Returns a mapping with the same contents as ``to_dict(dt)``, but the
+        dict is only built when the mapping is first read.  Orders are
+        mutable, so they are still converted right away.
+        """
+        if self.serialize_positions:
+            positions = self.position_tracker.get_positions_array()
+        else:
+            positions = None
+
+        transactions = None
+        if self.keep_transactions:
             if dt:
-                # only include orders modified as of the given dt.
-                try:
-                    orders = [x.to_dict()
-                              for x in itervalues(self.orders_by_modified[dt])]
-                except KeyError:
-                    orders = []
+                txns = self.processed_transactions.get(dt, [])
             else:
-                orders = [x.to_dict() for x in itervalues(self.orders_by_id)]
-            rval['orders'] = orders
+                txns = self._transaction_log
+            transactions = (txns, len(txns))
 
-        return rval
+        orders = None
+        if self.keep_orders:
+            orders = self._orders_list(dt)
+
+        return self.recorder.record(self._core_values(),
+                                    positions,
+                                    transactions,
+                                    orders)
+
+    def release_packets(self):
+        """
+        Reuse the storage of the recorded packets.  Packets which are still
+        referenced are converted to dicts first.
+        """
+        if self._recorder is not None:
+            self._recorder.clear()
 
     def as_portfolio(self):
         """
@@ -464,6 +516,9 @@ class PerformancePeriod(object):
         orders_by_modified = {}
         orders_by_modified.update(state.pop('orders_by_modified'))
         self.processed_transactions = processed_transactions
+        self._transaction_log = [
+            txn for txns in itervalues(processed_transactions) for txn in txns
+        ]
         self.orders_by_id = orders_by_id
         self.orders_by_modified = orders_by_modified
 
@@ -40,6 +40,7 @@ from math import (
 from copy import copy
 
 import logbook
+import numpy as np
 import zipline.protocol as zp
 
 from zipline.utils.serialization_utils import (
@@ -229,9 +230,152 @@ last_sale_price: {last_sale_price}"
         self.__dict__.update(state)
 
 
+def _slot_property(array_name, convert=None):
+    """
+    Create a property that reads and writes this position's slot in the
+    ``array_name`` array of the owning positiondict.
+    """
+    def fget(self):
+        value = getattr(self._store, array_name)[self._slot]
+        if convert is None:
+            return value
+        return convert(value)
+
+    def fset(self, value):
+        getattr(self._store, array_name)[self._slot] = value
+
+    return property(fget, fset)
+
+
+class PositionView(Position):
+    """
+    A Position whose amount, cost basis and last sale price are stored in the
+    arrays of a positiondict.
+
+    PositionViews are created by positiondict and should not be constructed
+    directly.  They pickle as plain Position objects.
+    """
+
+    def __init__(self, sid, store, slot):
+        self.sid = sid
+        self._store = store
+        self._slot = slot
+
+    amount = _slot_property('amounts', int)
+    cost_basis = _slot_property('cost_bases', float)
+    last_sale_price = _slot_property('last_sale_prices', float)
+    last_sale_date = _slot_property('last_sale_dates')
+
+    def __reduce__(self):
+        return (
+            Position,
+            (self.sid,
+             self.amount,
+             self.cost_basis,
+             self.last_sale_price,
+             self.last_sale_date),
+        )
+
+
 class positiondict(dict):
+    """
+    A dict of sid -> Position that creates an empty Position on first access.
+
+    The state of every position is stored in contiguous arrays indexed by a
+    slot assigned to each sid when its position is created, so that
+    aggregates over all positions can be computed with vectorized
+    operations.  The first ``len(self)`` entries of each array are in use.
+
+    Attributes
+    ----------
+    sids : np.array[int64]
+        The sid held in each slot.
+    amounts : np.array[int64]
+        The number of shares held in each slot.
+    cost_bases : np.array[float64]
+        The per share cost basis of each slot.
+    last_sale_prices : np.array[float64]
+        The last sale price of each slot.
+    last_sale_dates : np.array[object]
+        The last sale date of each slot, or None.
+    value_multipliers : np.array[float64]
+    exposure_multipliers : np.array[float64]
+    payout_multipliers : np.array[float64]
+        Multipliers used to calculate the value, exposure and cash payout of
+        each slot.  These are 0 until set by the owning PositionTracker.
+    """
+
+    _array_fields = (
+        ('sids', np.int64),
+        ('amounts', np.int64),
+        ('cost_bases', np.float64),
+        ('last_sale_prices', np.float64),
+        ('last_sale_dates', object),
+        ('value_multipliers', np.float64),
+        ('exposure_multipliers', np.float64),
+        ('payout_multipliers', np.float64),
+    )
+
+    def __init__(self, capacity=64):
+        super(positiondict, self).__init__()
+        for name, dtype in self._array_fields:
+            setattr(self, name, self._empty(capacity, dtype))
+        # Sorted copy of the sids in use, used to look up many slots at once.
+        self._sorted_sids = self.sids[:0]
+        self._sorted_slots = self.sids[:0]
+
+    @staticmethod
+    def _empty(capacity, dtype):
+        if dtype is object:
+            return np.full(capacity, None, dtype=object)
+        return np.zeros(capacity, dtype=dtype)
 
     def __missing__(self, key):
-        pos = Position(key)
+        slot = len(self)
+        capacity = len(self.sids)
+        if slot == capacity:
+            for name, dtype in self._array_fields:
+                new = self._empty(capacity * 2, dtype)
+                new[:capacity] = getattr(self, name)
+                setattr(self, name, new)
+
+        self.sids[slot] = key
+        pos = PositionView(key, self, slot)
         self[key] = pos
         return pos
+
+    def slot(self, sid):
+        return self[sid]._slot
+
+    def slots(self, sids):
+        """
+        Look up the slots of many sids at once.
+
+        Parameters
+        ----------
+        sids : np.array[int64]
+            The sids to look up.
+
+        Returns
+        -------
+        slots : np.array[int64]
+            The slot of each sid, or -1 for sids that have no position.
+        """
+        sids = np.asarray(sids, dtype=np.int64)
+        size = len(self)
+        if not size:
+            return np.full(len(sids), -1, dtype=np.int64)
+
+        if len(self._sorted_sids) != size:
+            self._sorted_slots = self.sids[:size].argsort()
+            self._sorted_sids = self.sids[self._sorted_slots]
+
+        idx = self._sorted_sids.searchsorted(sids).clip(max=size - 1)
+        return np.where(
+            self._sorted_sids[idx] == sids,
+            self._sorted_slots[idx],
+            -1,
+        )
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
@@ -20,12 +20,7 @@ import numpy as np
 import pandas as pd
 from pandas.lib import checknull
 from collections import namedtuple
-try:
-    # optional cython based OrderedDict
-    from cyordereddict import OrderedDict
-except ImportError:
-    from collections import OrderedDict
-from six import iteritems, itervalues
+from six import iteritems
 
 from zipline.protocol import Event, DATASOURCE_TYPE
 from zipline.finance.transaction import Transaction
@@ -38,7 +33,8 @@ from zipline.assets import (
     Equity, Future
 )
 from zipline.errors import PositionTrackerMissingAssetFinder
-from . position import positiondict
+from . position import Position, positiondict
+from . recorder import POSITION_DTYPE
 
 log = logbook.Logger('Performance')
 
@@ -59,58 +55,42 @@ PositionStats = namedtuple('PositionStats',
 def calc_position_values(amounts,
                          last_sale_prices,
                          value_multipliers):
-    iter_amount_price_multiplier = zip(
-        amounts,
-        last_sale_prices,
-        itervalues(value_multipliers),
-    )
-    return [
-        price * amount * multiplier for
-        price, amount, multiplier in iter_amount_price_multiplier
-    ]
+    return amounts * last_sale_prices * value_multipliers
 
 
 def calc_net(values):
     # Returns 0.0 if there are no values.
-    return sum(values, np.float64())
+    return values.sum(dtype=np.float64)
 
 
 def calc_position_exposures(amounts,
                             last_sale_prices,
                             exposure_multipliers):
-    iter_amount_price_multiplier = zip(
-        amounts,
-        last_sale_prices,
-        itervalues(exposure_multipliers),
-    )
-    return [
-        price * amount * multiplier for
-        price, amount, multiplier in iter_amount_price_multiplier
-    ]
+    return amounts * last_sale_prices * exposure_multipliers
 
 
 def calc_long_value(position_values):
-    return sum(i for i in position_values if i > 0)
+    return position_values[position_values > 0].sum()
 
 
 def calc_short_value(position_values):
-    return sum(i for i in position_values if i < 0)
+    return position_values[position_values < 0].sum()
 
 
 def calc_long_exposure(position_exposures):
-    return sum(i for i in position_exposures if i > 0)
+    return position_exposures[position_exposures > 0].sum()
 
 
 def calc_short_exposure(position_exposures):
-    return sum(i for i in position_exposures if i < 0)
+    return position_exposures[position_exposures < 0].sum()
 
 
 def calc_longs_count(position_exposures):
-    return sum(1 for i in position_exposures if i > 0)
+    return int(np.count_nonzero(position_exposures > 0))
 
 
 def calc_shorts_count(position_exposures):
-    return sum(1 for i in position_exposures if i < 0)
+    return int(np.count_nonzero(position_exposures < 0))
 
 
 def calc_gross_exposure(long_exposure, short_exposure):
@@ -126,12 +106,11 @@ class PositionTracker(object):
     def __init__(self, asset_finder):
         self.asset_finder = asset_finder
 
-        # sid => position object
+        # sid => position object, backed by arrays for quick calculations of
+        # positions value
         self.positions = positiondict()
-        # Arrays for quick calculations of positions value
-        self._position_value_multipliers = OrderedDict()
-        self._position_exposure_multipliers = OrderedDict()
-        self._position_payout_multipliers = OrderedDict()
+        # sids whose value multipliers have been looked up
+        self._sids_with_multipliers = set()
         self._unpaid_dividends = pd.DataFrame(
             columns=zp.DIVIDEND_PAYMENT_FIELDS,
         )
@@ -142,33 +121,35 @@ class PositionTracker(object):
         self._auto_close_position_sids = {}
 
     def _update_asset(self, sid):
-        try:
-            self._position_value_multipliers[sid]
-            self._position_exposure_multipliers[sid]
-            self._position_payout_multipliers[sid]
-        except KeyError:
-            # Check if there is an AssetFinder
-            if self.asset_finder is None:
-                raise PositionTrackerMissingAssetFinder()
-
-            # Collect the value multipliers from applicable sids
-            asset = self.asset_finder.retrieve_asset(sid)
-            if isinstance(asset, Equity):
-                self._position_value_multipliers[sid] = 1
-                self._position_exposure_multipliers[sid] = 1
-                self._position_payout_multipliers[sid] = 0
-            if isinstance(asset, Future):
-                self._position_value_multipliers[sid] = 0
-                self._position_exposure_multipliers[sid] = \
-                    asset.contract_multiplier
-                self._position_payout_multipliers[sid] = \
-                    asset.contract_multiplier
-                # Futures auto-close timing is controlled by the Future's
-                # auto_close_date property
-                self._insert_auto_close_position_date(
-                    dt=asset.auto_close_date,
-                    sid=sid
-                )
+        if sid in self._sids_with_multipliers:
+            return
+
+        # Check if there is an AssetFinder
+        if self.asset_finder is None:
+            raise PositionTrackerMissingAssetFinder()
+
+        # Collect the value multipliers from applicable sids
+        asset = self.asset_finder.retrieve_asset(sid)
+        positions = self.positions
+        slot = positions.slot(sid)
+        if isinstance(asset, Equity):
+            positions.value_multipliers[slot] = 1
+            positions.exposure_multipliers[slot] = 1
+            positions.payout_multipliers[slot] = 0
+            self._sids_with_multipliers.add(sid)
+        if isinstance(asset, Future):
+            positions.value_multipliers[slot] = 0
+            positions.exposure_multipliers[slot] = \
+                asset.contract_multiplier
+            positions.payout_multipliers[slot] = \
+                asset.contract_multiplier
+            self._sids_with_multipliers.add(sid)
+            # Futures auto-close timing is controlled by the Future's
+            # auto_close_date property
+            self._insert_auto_close_position_date(
+                dt=asset.auto_close_date,
+                sid=sid
+            )
 
     def _insert_auto_close_position_date(self, dt, sid):
         """
@@ -233,19 +214,68 @@ class PositionTracker(object):
         if checknull(price):
             return 0
 
-        pos = self.positions[sid]
-        old_price = pos.last_sale_price
+        positions = self.positions
+        pos = positions[sid]
+        slot = pos._slot
+        old_price = positions.last_sale_prices[slot]
         pos.last_sale_date = event.dt
-        pos.last_sale_price = price
+        positions.last_sale_prices[slot] = price
 
         # Calculate cash adjustment on assets with multipliers
-        return ((price - old_price) * self._position_payout_multipliers[sid]
-                * pos.amount)
+        return ((price - old_price) * positions.payout_multipliers[slot]
+                * positions.amounts[slot])
+
+    def update_last_sales(self, sids, prices, dt):
+        """
+        Update the last sale price of many positions at once.
+
+        Parameters
+        ----------
+        sids : np.array[int64]
+            The sids that traded.  Sids without a position are ignored.  If a
+            sid appears more than once, its last price is used.
+        prices : np.array[float64]
+            The price of each trade.  NaN prices are ignored.
+        dt : pd.Timestamp
+            The time of the trades.
+
+        Returns
+        -------
+        cash_adjustment : float
+            The total cash adjustment owed for assets with payout multipliers.
+        """
+        positions = self.positions
+        slots = positions.slots(sids)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        mask = (slots != -1) & ~np.isnan(prices)
+        slots = slots[mask]
+        prices = prices[mask]
+
+        # Keep only the last trade of each sid.
+        reversed_slots = slots[::-1]
+        _, last = np.unique(reversed_slots, return_index=True)
+        if len(last) != len(slots):
+            keep = len(slots) - 1 - last
+            slots = slots[keep]
+            prices = prices[keep]
+
+        old_prices = positions.last_sale_prices[slots]
+        positions.last_sale_prices[slots] = prices
+        positions.last_sale_dates[slots] = dt
+
+        # Calculate cash adjustment on assets with multipliers
+        return ((prices - old_prices) * positions.payout_multipliers[slots]
+                * positions.amounts[slots]).sum()
 
     def update_positions(self, positions):
         # update positions in batch
-        self.positions.update(positions)
         for sid, pos in iteritems(positions):
+            position = self.positions[sid]
+            position.amount = pos.amount
+            position.cost_basis = pos.cost_basis
+            position.last_sale_price = pos.last_sale_price
+            position.last_sale_date = pos.last_sale_date
             self._update_asset(sid)
 
     def update_position(self, sid, amount=None, last_sale_price=None,
@@ -380,52 +410,83 @@ class PositionTracker(object):
     def get_positions(self):
 
         positions = self._positions_store
-
-        for sid, pos in iteritems(self.positions):
-
-            if pos.amount == 0:
-                # Clear out the position if it has become empty since the last
-                # time get_positions was called.  Catching the KeyError is
-                # faster than checking `if sid in positions`, and this can be
-                # potentially called in a tight inner loop.
-                try:
-                    del positions[sid]
-                except KeyError:
-                    pass
-                continue
-
+        store = self.positions
+        size = len(store)
+        amounts = store.amounts[:size]
+
+        # Clear out the positions that have become empty since the last time
+        # get_positions was called.
+        for sid in store.sids[:size][amounts == 0]:
+            # Catching the KeyError is faster than checking `if sid in
+            # positions`, and this can be potentially called in a tight inner
+            # loop.
+            try:
+                del positions[sid]
+            except KeyError:
+                pass
+
+        held = np.flatnonzero(amounts)
+        for sid, amount, cost_basis, last_sale_price in zip(
+                store.sids[held].tolist(),
+                amounts[held].tolist(),
+                store.cost_bases[held].tolist(),
+                store.last_sale_prices[held].tolist()):
             # Note that this will create a position if we don't currently have
             # an entry
             position = positions[sid]
-            position.amount = pos.amount
-            position.cost_basis = pos.cost_basis
-            position.last_sale_price = pos.last_sale_price
+            position.amount = amount
+            position.cost_basis = cost_basis
+            position.last_sale_price = last_sale_price
         return positions
 
     def get_positions_list(self):
-        positions = []
-        for sid, pos in iteritems(self.positions):
-            if pos.amount != 0:
-                positions.append(pos.to_dict())
+        store = self.positions
+        held = np.flatnonzero(store.amounts[:len(store)])
+        return [
+            {
+                'sid': sid,
+                'amount': amount,
+                'cost_basis': cost_basis,
+                'last_sale_price': last_sale_price,
+            }
+            for sid, amount, cost_basis, last_sale_price in zip(
+                store.sids[held].tolist(),
+                store.amounts[held].tolist(),
+                store.cost_bases[held].tolist(),
+                store.last_sale_prices[held].tolist(),
+            )
+        ]
+
+    def get_positions_array(self):
+        """
+        The held positions as an array of ``recorder.POSITION_DTYPE``, in the
+        order of ``get_positions_list``.
+        """
+        store = self.positions
+        held = np.flatnonzero(store.amounts[:len(store)])
+        positions = np.empty(len(held), dtype=POSITION_DTYPE)
+        positions['sid'] = store.sids[held]
+        positions['amount'] = store.amounts[held]
+        positions['cost_basis'] = store.cost_bases[held]
+        positions['last_sale_price'] = store.last_sale_prices[held]
         return positions
 
     def stats(self):
-        amounts = []
-        last_sale_prices = []
-        for pos in itervalues(self.positions):
-            amounts.append(pos.amount)
-            last_sale_prices.append(pos.last_sale_price)
+        positions = self.positions
+        size = len(positions)
+        amounts = positions.amounts[:size]
+        last_sale_prices = positions.last_sale_prices[:size]
 
         position_values = calc_position_values(
             amounts,
             last_sale_prices,
-            self._position_value_multipliers
+            positions.value_multipliers[:size],
         )
 
         position_exposures = calc_position_exposures(
             amounts,
             last_sale_prices,
-            self._position_exposure_multipliers
+            positions.exposure_multipliers[:size],
         )
 
         long_value = calc_long_value(position_values)
@@ -456,7 +517,16 @@ class PositionTracker(object):
         state_dict = {}
 
         state_dict['asset_finder'] = self.asset_finder
-        state_dict['positions'] = dict(self.positions)
+        state_dict['positions'] = {
+            sid: Position(
+                sid,
+                amount=pos.amount,
+                cost_basis=pos.cost_basis,
+                last_sale_price=pos.last_sale_price,
+                last_sale_date=pos.last_sale_date,
+            )
+            for sid, pos in iteritems(self.positions)
+        }
         state_dict['unpaid_dividends'] = self._unpaid_dividends
         state_dict['auto_close_position_sids'] = self._auto_close_position_sids
 
@@ -480,10 +550,7 @@ class PositionTracker(object):
         self._unpaid_dividends = state['unpaid_dividends']
         self._auto_close_position_sids = state['auto_close_position_sids']
 
-        # Arrays for quick calculations of positions value
-        self._position_value_multipliers = OrderedDict()
-        self._position_exposure_multipliers = OrderedDict()
-        self._position_payout_multipliers = OrderedDict()
+        self._sids_with_multipliers = set()
 
         # Update positions is called without a finder
         self.update_positions(state['positions'])
@@ -0,0 +1,252 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Performance Recorder
+====================
+
+Building the nested dict of :py:meth:`PerformancePeriod.to_dict` on every
+bar is expensive when many positions are held, and most of those packets are
+never read.  A ``PeriodRecorder`` instead copies the fields of the period into
+preallocated columns and the held positions into an append-only structured
+array, and hands out a ``PeriodPacket`` for the bar.  The packet is a mapping
+with the contents of ``to_dict``, but the dict is only built the first time
+the packet is read.
+"""
+import weakref
+
+import numpy as np
+
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
+
+
+# The fields of PerformancePeriod.to_dict other than the positions,
+# transactions and orders.
+PERIOD_FIELDS = (
+    'ending_value',
+    'ending_exposure',
+    'capital_used',
+    'starting_value',
+    'starting_exposure',
+    'starting_cash',
+    'ending_cash',
+    'portfolio_value',
+    'pnl',
+    'returns',
+    'period_open',
+    'period_close',
+    'gross_leverage',
+    'net_leverage',
+    'short_exposure',
+    'long_exposure',
+    'short_value',
+    'long_value',
+    'longs_count',
+    'shorts_count',
+)
+
+POSITION_DTYPE = np.dtype([
+    ('sid', np.int64),
+    ('amount', np.int64),
+    ('cost_basis', np.float64),
+    ('last_sale_price', np.float64),
+])
+
+
+def positions_to_list(positions):
+    """
+    Convert an array of POSITION_DTYPE to the list of dicts produced by
+    ``PositionTracker.get_positions_list``.
+    """
+    return [
+        {
+            'sid': sid,
+            'amount': amount,
+            'cost_basis': cost_basis,
+            'last_sale_price': last_sale_price,
+        }
+        for sid, amount, cost_basis, last_sale_price in zip(
+            positions['sid'].tolist(),
+            positions['amount'].tolist(),
+            positions['cost_basis'].tolist(),
+            positions['last_sale_price'].tolist(),
+        )
+    ]
+
+
+class PeriodRecorder(object):
+    """
+    Columnar record of the state of a PerformancePeriod at each emitted bar.
+
+    The storage is reused once ``clear`` is called, which first builds the
+    dicts of any packets that are still referenced.
+    """
+    def __init__(self, capacity=64):
+        self._size = 0
+        self._fields = np.empty((capacity, len(PERIOD_FIELDS)), dtype=object)
+        self._serialized = np.zeros(capacity, dtype=bool)
+        self._position_bounds = np.zeros(capacity + 1, dtype=np.int64)
+        self._positions = np.empty(capacity, dtype=POSITION_DTYPE)
+        self._packets = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return self._size
+
+    def _grow(self):
+        capacity = 2 * len(self._fields)
+
+        fields = np.empty((capacity, len(PERIOD_FIELDS)), dtype=object)
+        fields[:self._size] = self._fields[:self._size]
+        self._fields = fields
+
+        serialized = np.zeros(capacity, dtype=bool)
+        serialized[:self._size] = self._serialized[:self._size]
+        self._serialized = serialized
+
+        bounds = np.zeros(capacity + 1, dtype=np.int64)
+        bounds[:self._size + 1] = self._position_bounds[:self._size + 1]
+        self._position_bounds = bounds
+
+    def _append_positions(self, positions):
+        start = self._position_bounds[self._size]
+        stop = start + len(positions)
+        if stop > len(self._positions):
+            grown = np.empty(max(2 * len(self._positions), stop),
+                             dtype=POSITION_DTYPE)
+            grown[:start] = self._positions[:start]
+            self._positions = grown
+        self._positions[start:stop] = positions
+        return stop
+
+    def record(self, values, positions=None, transactions=None, orders=None):
+        """
+        Record the state of a period for a bar.
+
+        Parameters
+        ----------
+        values : tuple
+            The values of PERIOD_FIELDS, in order.
+        positions : np.array[POSITION_DTYPE], optional
+            The held positions, or None if positions are not serialized.
+        transactions : (list[Transaction], int), optional
+            A list of transactions which is only ever appended to and the
+            number of its transactions which belong in the packet, or None if
+            transactions are not kept.
+        orders : list[dict], optional
+            The orders of the packet, or None if orders are not kept.
+
+        Returns
+        -------
+        packet : PeriodPacket
+            The mapping of the recorded state.
+        """
+        row = self._size
+        if row == len(self._fields):
+            self._grow()
+
+        self._fields[row] = values
+        if positions is None:
+            self._serialized[row] = False
+            stop = self._position_bounds[row]
+        else:
+            self._serialized[row] = True
+            stop = self._append_positions(positions)
+        self._position_bounds[row + 1] = stop
+        self._size += 1
+
+        packet = PeriodPacket(self, row, transactions, orders)
+        self._packets[row] = packet
+        return packet
+
+    def build(self, row, transactions, orders):
+        """
+        Build the dict of a recorded bar.
+        """
+        rval = dict(zip(PERIOD_FIELDS, self._fields[row]))
+        if self._serialized[row]:
+            rval['positions'] = positions_to_list(self._positions[
+                self._position_bounds[row]:self._position_bounds[row + 1]
+            ])
+        if transactions is not None:
+            txns, count = transactions
+            rval['transactions'] = [txn.to_dict() for txn in txns[:count]]
+        if orders is not None:
+            rval['orders'] = orders
+        return rval
+
+    def clear(self):
+        """
+        Release the recorded bars, building the dicts of the packets which
+        are still in use.
+        """
+        for packet in list(self._packets.values()):
+            packet.to_dict()
+        self._packets.clear()
+        self._size = 0
+        self._fields[:] = None
+
+
+class PeriodPacket(MutableMapping):
+    """
+    The state of a PerformancePeriod at a bar.  Behaves like the dict
+    returned by ``PerformancePeriod.to_dict``, which is built on first use.
+    """
+    def __init__(self, recorder, row, transactions, orders):
+        self._recorder = recorder
+        self._row = row
+        self._transactions = transactions
+        self._orders = orders
+        # items set before the dict is built, such as the recorded variables
+        # attached to every packet by the simulation loop
+        self._updates = {}
+        self._dict = None
+
+    def to_dict(self):
+        if self._dict is None:
+            self._dict = self._recorder.build(self._row,
+                                              self._transactions,
+                                              self._orders)
+            self._dict.update(self._updates)
+            self._recorder = self._transactions = self._orders = None
+            self._updates = None
+        return self._dict
+
+    def __getitem__(self, key):
+        if self._dict is None and key in self._updates:
+            return self._updates[key]
+        return self.to_dict()[key]
+
+    def __setitem__(self, key, value):
+        if self._dict is None:
+            self._updates[key] = value
+        else:
+            self._dict[key] = value
+
+    def __delitem__(self, key):
+        del self.to_dict()[key]
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
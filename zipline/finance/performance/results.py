@@ -0,0 +1,93 @@
+#
+# Copyright 2015 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+from six import iteritems, itervalues
+
+
+class DailyStatsBuilder(object):
+    """
+    Collects the daily stats of a simulation into columns as the performance
+    packets are emitted, so that the packets themselves can be discarded
+    immediately.
+
+    The frame returned by ``to_frame`` is the same as constructing a DataFrame
+    from the list of stats dicts: a stat missing from some of the packets is
+    NaN for those days.
+    """
+    def __init__(self):
+        self._index = []
+        self._columns = {}
+
+    def __len__(self):
+        return len(self._index)
+
+    def append(self, dt, stats):
+        """
+        Add the stats for a day.
+
+        Parameters
+        ----------
+        dt : np.datetime64
+            The label of the day in the resulting frame.
+        stats : dict
+            The stats of the day, keyed by column name.
+        """
+        row = len(self._index)
+        columns = self._columns
+        for key, value in iteritems(stats):
+            try:
+                column = columns[key]
+            except KeyError:
+                column = columns[key] = [np.nan] * row
+            column.append(value)
+
+        self._index.append(dt)
+        row += 1
+        for column in itervalues(columns):
+            if len(column) < row:
+                column.append(np.nan)
+
+    def update(self, row, stats):
+        """
+        Set stats of a day which has already been appended, overwriting any
+        values it already has for the same keys.
+
+        Parameters
+        ----------
+        row : int
+            The position of the day, in the order the days were appended.
+        stats : dict
+            The stats to set, keyed by column name.
+        """
+        columns = self._columns
+        for key, value in iteritems(stats):
+            try:
+                column = columns[key]
+            except KeyError:
+                column = columns[key] = [np.nan] * len(self._index)
+            column[row] = value
+
+    def to_frame(self):
+        """
+        Assemble the collected stats into a DataFrame, one column at a time.
+        """
+        return pd.DataFrame(
+            self._columns,
+            index=self._index,
+            columns=sorted(self._columns),
+        )
@@ -78,14 +78,34 @@ from . position_tracker import PositionTracker
 log = logbook.Logger('Performance')
 
 
+RISK_MODES = frozenset(['cumulative', 'deferred'])
+
+
 class PerformanceTracker(object):
     """
     Tracks the performance of the algorithm.
+
+    Parameters
+    ----------
+    sim_params : SimulationParameters
+        The parameters of the simulation being tracked.
+    env : TradingEnvironment
+        The environment of the simulation being tracked.
+    risk_mode : {'cumulative', 'deferred'}, optional
+        With 'cumulative' (the default), cumulative risk metrics are updated
+        on every bar and included in every perf packet.  With 'deferred',
+        only returns and leverage are stored on each bar, perf packets have
+        no 'cumulative_risk_metrics' entry, and the risk metrics for every
+        day are calculated at once by ``handle_simulation_end``.
     """
-    def __init__(self, sim_params, env):
+    def __init__(self, sim_params, env, risk_mode='cumulative'):
+
+        if risk_mode not in RISK_MODES:
+            raise ValueError("Invalid risk mode: %s" % risk_mode)
 
         self.sim_params = sim_params
         self.env = env
+        self.risk_mode = risk_mode
 
         self.period_start = self.sim_params.period_start
         self.period_end = self.sim_params.period_end
@@ -269,14 +289,16 @@ class PerformanceTracker(object):
             'period_start': self.period_start,
             'period_end': self.period_end,
             'capital_base': self.capital_base,
-            'cumulative_perf': self.cumulative_performance.to_dict(),
+            'cumulative_perf': self.cumulative_performance.to_packet(),
             'progress': self.progress,
-            'cumulative_risk_metrics': self.cumulative_risk_metrics.to_dict()
         }
+        if self.risk_mode == 'cumulative':
+            _dict['cumulative_risk_metrics'] = \
+                self.cumulative_risk_metrics.to_dict()
         if emission_type == 'daily':
-            _dict['daily_perf'] = self.todays_performance.to_dict()
+            _dict['daily_perf'] = self.todays_performance.to_packet()
         elif emission_type == 'minute':
-            _dict['minute_perf'] = self.todays_performance.to_dict(
+            _dict['minute_perf'] = self.todays_performance.to_packet(
                 self.saved_dt)
         else:
             raise ValueError("Invalid emission type: %s" % emission_type)
@@ -293,6 +315,21 @@ class PerformanceTracker(object):
     def process_trade(self, event):
         self._handle_event_price(event)
 
+    def update_last_sales(self, sids, prices, dt):
+        """
+        Process the prices of every trade in a bar at once.
+
+        This is equivalent to calling ``process_trade`` for each trade, as
+        long as no transactions for the given sids are processed afterwards
+        in the same bar.
+        """
+        cash_adjustment = self.position_tracker.update_last_sales(
+            sids, prices, dt,
+        )
+        if cash_adjustment != 0:
+            self.cumulative_performance.handle_cash_payment(cash_adjustment)
+            self.todays_performance.handle_cash_payment(cash_adjustment)
+
     def process_transaction(self, event):
         self._handle_event_price(event)
         self.txn_count += 1
@@ -435,10 +472,10 @@ class PerformanceTracker(object):
         # cumulative returns
         bench_since_open = (1. + bench_returns).prod() - 1
 
-        self.cumulative_risk_metrics.update(todays_date,
-                                            self.todays_performance.returns,
-                                            bench_since_open,
-                                            account.leverage)
+        self._update_risk_metrics(todays_date,
+                                  self.todays_performance.returns,
+                                  bench_since_open,
+                                  account.leverage)
 
         minute_packet = self.to_dict(emission_type='minute')
 
@@ -459,7 +496,7 @@ class PerformanceTracker(object):
         account = self.get_account(False)
 
         # update risk metrics for cumulative performance
-        self.cumulative_risk_metrics.update(
+        self._update_risk_metrics(
             completed_date,
             self.todays_performance.returns,
             self.all_benchmark_returns[completed_date],
@@ -467,6 +504,19 @@ class PerformanceTracker(object):
 
         return self._handle_market_close(completed_date)
 
+    def _update_risk_metrics(self, dt, algorithm_returns, benchmark_returns,
+                             leverage):
+        if self.risk_mode == 'deferred':
+            self.cumulative_risk_metrics.record(dt,
+                                                algorithm_returns,
+                                                benchmark_returns,
+                                                leverage)
+        else:
+            self.cumulative_risk_metrics.update(dt,
+                                                algorithm_returns,
+                                                benchmark_returns,
+                                                leverage)
+
     def _handle_market_close(self, completed_date):
 
         # increment the day counter before we move markers forward.
@@ -481,6 +531,11 @@ class PerformanceTracker(object):
         if next_trading_day:
             self.check_asset_auto_closes(next_trading_day=next_trading_day)
 
+        # The packets of the day's bars only hold on to the day's records
+        # if they are still in use.
+        self.cumulative_performance.release_packets()
+        self.todays_performance.release_packets()
+
         # Take a snapshot of our current performance to return to the
         # browser.
         daily_update = self.to_dict(emission_type='daily')
@@ -523,6 +578,9 @@ class PerformanceTracker(object):
         log.info("last close: {d}".format(
             d=self.sim_params.last_close))
 
+        if self.risk_mode == 'deferred':
+            self.cumulative_risk_metrics.finalize()
+
         bms = pd.Series(
             index=self.cumulative_risk_metrics.cont_index,
             data=self.cumulative_risk_metrics.benchmark_returns_cont)
@@ -562,6 +620,9 @@ class PerformanceTracker(object):
         if version < OLDEST_SUPPORTED_STATE:
             raise BaseException("PerformanceTracker saved state is too old.")
 
+        # States saved before risk modes were added always used cumulative
+        # risk.
+        state.setdefault('risk_mode', 'cumulative')
         self.__dict__.update(state)
 
         # Handle the dividend frame specially
@@ -72,11 +72,111 @@ def information_ratio(algo_volatility, algorithm_return, benchmark_return):
     return (algorithm_return - benchmark_return) / algo_volatility
 
 
+class RunningMoments(object):
+    """
+    Running means, variances and covariance of a pair of series, updated one
+    observation at a time using Welford's algorithm.
+
+    Series of a single variable can be tracked by leaving ``y`` as 0.0.
+    """
+    __slots__ = ('count', 'mean_x', 'mean_y', 'm2_x', 'm2_y', 'c_xy')
+
+    def __init__(self):
+        self.count = 0
+        self.mean_x = np.float64(0.0)
+        self.mean_y = np.float64(0.0)
+        self.m2_x = np.float64(0.0)
+        self.m2_y = np.float64(0.0)
+        self.c_xy = np.float64(0.0)
+
+    def copy(self):
+        new = RunningMoments()
+        for name in self.__slots__:
+            setattr(new, name, getattr(self, name))
+        return new
+
+    def update(self, x, y=0.0):
+        self.count += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.count
+        self.mean_y += dy / self.count
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def std_x(self):
+        """
+        The sample (ddof=1) standard deviation of x, or 0.0 if there are
+        fewer than two observations.
+        """
+        if self.count <= 1:
+            return 0.0
+        return np.sqrt(self.m2_x / (self.count - 1))
+
+    def std_y(self):
+        if self.count <= 1:
+            return 0.0
+        return np.sqrt(self.m2_y / (self.count - 1))
+
+    def beta(self):
+        """
+        Cov(x, y) / Var(y), or 0.0 if there are fewer than two observations.
+        """
+        if self.count < 2:
+            return 0.0
+        return self.c_xy / self.m2_y
+
+
+def downside_diff(algorithm_return, mean_return):
+    """
+    The contribution of a single day to ``downside_risk``, or None if the
+    algorithm return was not below the minimum acceptable return.
+    """
+    ret = np.round(algorithm_return, 8)
+    mar = np.round(mean_return, 8)
+    if ret < mar:
+        return ret - mar
+    return None
+
+
+def expanding_var_cov(x, y):
+    """
+    Calculate the expanding sample (ddof=1) variances and covariance of x and
+    y.
+
+    Returns
+    -------
+    var_x, var_y, cov_xy : np.array[float64]
+        Element i holds the statistic over x[:i + 1] and y[:i + 1].  The first
+        element is NaN.
+    """
+    count = np.arange(1, len(x) + 1, dtype=np.float64)
+
+    # Center the data to limit the cancellation error of the sums of squares.
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x = x - (np.nanmean(x) if np.isfinite(x).any() else 0.0)
+        y = y - (np.nanmean(y) if np.isfinite(y).any() else 0.0)
+
+        sum_x = np.cumsum(x)
+        sum_y = np.cumsum(y)
+        var_x = (np.cumsum(x * x) - sum_x * sum_x / count) / (count - 1)
+        var_y = (np.cumsum(y * y) - sum_y * sum_y / count) / (count - 1)
+        cov_xy = (np.cumsum(x * y) - sum_x * sum_y / count) / (count - 1)
+
+    return np.maximum(var_x, 0.0), np.maximum(var_y, 0.0), cov_xy
+
+
 class RiskMetricsCumulative(object):
     """
     :Usage:
         Instantiate RiskMetricsCumulative once.
         Call update() method on each dt to update the metrics.
+
+    Calls to update() with the same dt overwrite that dt's values, as happens
+    with minute emission.  The volatilities, beta, downside risk and
+    cumulative returns are calculated from running statistics over all prior
+    dts, so each update takes constant time.
     """
 
     METRIC_NAMES = (
@@ -171,12 +271,45 @@ class RiskMetricsCumulative(object):
 
         self.num_trading_days = 0
 
+        self._reset_running_stats()
+
+    def _reset_running_stats(self):
+        # Running statistics over the days before the latest dt, which are no
+        # longer updated.
+        self._committed_loc = 0
+        self._algorithm_growth = 1.0
+        self._benchmark_growth = 1.0
+        self._return_moments = RunningMoments()
+        self._downside_moments = RunningMoments()
+
+    def _commit_through(self, dt_loc):
+        """
+        Fold the returns of every day before dt_loc into the running
+        statistics.
+        """
+        if dt_loc < self._committed_loc:
+            self._reset_running_stats()
+
+        while self._committed_loc < dt_loc:
+            loc = self._committed_loc
+            algorithm_returns = self.algorithm_returns_cont[loc]
+            benchmark_returns = self.benchmark_returns_cont[loc]
+            self._algorithm_growth *= 1. + algorithm_returns
+            self._benchmark_growth *= 1. + benchmark_returns
+            self._return_moments.update(algorithm_returns, benchmark_returns)
+            diff = downside_diff(algorithm_returns,
+                                 self.mean_returns_cont[loc])
+            if diff is not None:
+                self._downside_moments.update(diff)
+            self._committed_loc += 1
+
     def update(self, dt, algorithm_returns, benchmark_returns, leverage):
         # Keep track of latest dt for use in to_dict and other methods
         # that report current state.
         self.latest_dt = dt
         dt_loc = self.cont_index.get_loc(dt)
         self.latest_dt_loc = dt_loc
+        self._commit_through(dt_loc)
 
         self.algorithm_returns_cont[dt_loc] = algorithm_returns
         self.algorithm_returns = self.algorithm_returns_cont[:dt_loc + 1]
@@ -188,7 +321,7 @@ class RiskMetricsCumulative(object):
                 self.algorithm_returns = np.append(0.0, self.algorithm_returns)
 
         self.algorithm_cumulative_returns[dt_loc] = \
-            self.calculate_cumulative_returns(self.algorithm_returns)
+            self._algorithm_growth * (1. + algorithm_returns) - 1
 
         algo_cumulative_returns_to_date = \
             self.algorithm_cumulative_returns[:dt_loc + 1]
@@ -218,7 +351,7 @@ class RiskMetricsCumulative(object):
                 self.benchmark_returns = np.append(0.0, self.benchmark_returns)
 
         self.benchmark_cumulative_returns[dt_loc] = \
-            self.calculate_cumulative_returns(self.benchmark_returns)
+            self._benchmark_growth * (1. + benchmark_returns) - 1
 
         benchmark_cumulative_returns_to_date = \
             self.benchmark_cumulative_returns[:dt_loc + 1]
@@ -258,10 +391,33 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             raise Exception(message)
 
         self.update_current_max()
-        self.benchmark_volatility[dt_loc] = \
-            self.calculate_volatility(self.benchmark_returns)
-        self.algorithm_volatility[dt_loc] = \
-            self.calculate_volatility(self.algorithm_returns)
+
+        if self.create_first_day_stats and dt_loc == 0:
+            # The first day's stats include the padded 0.0 returns, so
+            # calculate them directly from the (two element) return arrays.
+            benchmark_volatility = \
+                self.calculate_volatility(self.benchmark_returns)
+            algorithm_volatility = \
+                self.calculate_volatility(self.algorithm_returns)
+            beta = self.calculate_beta()
+            downside_risk = self.calculate_downside_risk()
+        else:
+            return_moments = self._return_moments.copy()
+            return_moments.update(algorithm_returns, benchmark_returns)
+            downside_moments = self._downside_moments
+            diff = downside_diff(algorithm_returns,
+                                 self.mean_returns_cont[dt_loc])
+            if diff is not None:
+                downside_moments = downside_moments.copy()
+                downside_moments.update(diff)
+
+            benchmark_volatility = return_moments.std_y() * math.sqrt(252)
+            algorithm_volatility = return_moments.std_x() * math.sqrt(252)
+            beta = return_moments.beta()
+            downside_risk = downside_moments.std_x() * math.sqrt(252)
+
+        self.benchmark_volatility[dt_loc] = benchmark_volatility
+        self.algorithm_volatility[dt_loc] = algorithm_volatility
 
         # caching the treasury rates for the minutely case is a
         # big speedup, because it avoids searching the treasury
@@ -280,11 +436,10 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         self.excess_returns[dt_loc] = (
             self.algorithm_cumulative_returns[dt_loc] -
             self.treasury_period_return)
-        self.beta[dt_loc] = self.calculate_beta()
+        self.beta[dt_loc] = beta
         self.alpha[dt_loc] = self.calculate_alpha()
         self.sharpe[dt_loc] = self.calculate_sharpe()
-        self.downside_risk[dt_loc] = \
-            self.calculate_downside_risk()
+        self.downside_risk[dt_loc] = downside_risk
         self.sortino[dt_loc] = self.calculate_sortino()
         self.information[dt_loc] = self.calculate_information()
         self.max_drawdown = self.calculate_max_drawdown()
@@ -292,21 +447,196 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
         self.max_leverage = self.calculate_max_leverage()
         self.max_leverages[dt_loc] = self.max_leverage
 
-    def to_dict(self):
+    def record(self, dt, algorithm_returns, benchmark_returns, leverage):
+        """
+        Store the returns and leverage for dt without updating any metrics.
+
+        Like ``update``, repeated calls with the same dt overwrite that dt's
+        values.  Call ``finalize`` once every dt has been recorded to
+        calculate the metrics for all of them at once.
+        """
+        self.latest_dt = dt
+        dt_loc = self.cont_index.get_loc(dt)
+        self.latest_dt_loc = dt_loc
+        self.num_trading_days = dt_loc + 1
+
+        self.algorithm_returns_cont[dt_loc] = algorithm_returns
+        self.benchmark_returns_cont[dt_loc] = benchmark_returns
+        self.algorithm_cumulative_leverages_cont[dt_loc] = leverage
+
+    def finalize(self):
+        """
+        Calculate the metrics for every dt stored with ``record``.
+
+        The results match those of calling ``update`` once per dt with the
+        recorded values, except that drawdowns only consider the final value
+        recorded for each dt.
+        """
+        n = self.latest_dt_loc + 1
+        days = np.arange(1, n + 1, dtype=np.float64)
+        sqrt_252 = math.sqrt(252)
+
+        algorithm_returns = self.algorithm_returns_cont[:n]
+        benchmark_returns = self.benchmark_returns_cont[:n]
+        leverages = self.algorithm_cumulative_leverages_cont[:n]
+
+        algorithm_cumulative_returns = np.cumprod(1. + algorithm_returns) - 1
+        benchmark_cumulative_returns = np.cumprod(1. + benchmark_returns) - 1
+        mean_returns = algorithm_cumulative_returns / days
+        mean_benchmark_returns = benchmark_cumulative_returns / days
+        annualized_mean_returns = mean_returns * 252
+        annualized_mean_benchmark_returns = mean_benchmark_returns * 252
+
+        var_a, var_b, cov_ab = expanding_var_cov(algorithm_returns,
+                                                 benchmark_returns)
+        algorithm_volatility = np.sqrt(var_a) * sqrt_252
+        benchmark_volatility = np.sqrt(var_b) * sqrt_252
+        with np.errstate(invalid='ignore', divide='ignore'):
+            beta = cov_ab / var_b
+        algorithm_volatility[0] = benchmark_volatility[0] = beta[0] = 0.0
+
+        rets = algorithm_returns.round(8)
+        mar = mean_returns.round(8)
+        below = rets < mar
+        diffs = np.where(below, rets - mar, 0.0)
+        below_count = np.cumsum(below).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sum_diffs = np.cumsum(diffs)
+            downside_var = (
+                np.cumsum(diffs * diffs) -
+                sum_diffs * sum_diffs / below_count
+            ) / (below_count - 1)
+        downside = np.where(
+            below_count > 1,
+            np.sqrt(np.maximum(downside_var, 0.0)) * sqrt_252,
+            0.0,
+        )
+
+        if self.create_first_day_stats:
+            # The first day's stats are calculated against a padded 0.0
+            # return.
+            padded_algorithm_returns = np.append(0.0, algorithm_returns[:1])
+            padded_benchmark_returns = np.append(0.0, benchmark_returns[:1])
+            algorithm_volatility[0] = \
+                self.calculate_volatility(padded_algorithm_returns)
+            benchmark_volatility[0] = \
+                self.calculate_volatility(padded_benchmark_returns)
+            C = np.cov(
+                np.vstack([padded_algorithm_returns,
+                           padded_benchmark_returns]),
+                ddof=1,
+            )
+            beta[0] = C[0][1] / C[1][1]
+            downside[0] = downside_risk(
+                padded_algorithm_returns,
+                np.append(0.0, mean_returns[:1]),
+                252,
+            )
+
+        for day in self.cont_index[:n]:
+            if np.isnan(self.daily_treasury[day]):
+                self.daily_treasury[day] = choose_treasury(
+                    self.treasury_curves,
+                    self.start_date,
+                    day,
+                    self.env,
+                )
+        treasury = self.daily_treasury.values[:n]
+
+        # See sharpe_ratio, sortino_ratio and information_ratio.
+        no_volatility = np.abs(algorithm_volatility) <= 10e-7
+        no_downside_risk = np.abs(downside) <= 10e-7
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = np.where(
+                no_volatility,
+                np.nan,
+                (annualized_mean_returns - treasury) / algorithm_volatility,
+            )
+            sortino = np.where(
+                no_downside_risk,
+                0.0,
+                (annualized_mean_returns - treasury) / downside,
+            )
+            information = np.where(
+                no_volatility,
+                np.nan,
+                (annualized_mean_returns - annualized_mean_benchmark_returns)
+                / algorithm_volatility,
+            )
+        alpha = annualized_mean_returns - (
+            treasury + beta * (annualized_mean_benchmark_returns - treasury)
+        )
+
+        current_max = np.fmax.accumulate(algorithm_cumulative_returns)
+        drawdowns = 1.0 - (
+            (1.0 + algorithm_cumulative_returns) / (1.0 + current_max)
+        )
+        max_drawdowns = np.fmax.accumulate(np.append(0.0, drawdowns))[1:]
+        max_leverages = np.fmax.accumulate(np.append(0.0, leverages))[1:]
+
+        self.algorithm_cumulative_returns[:n] = algorithm_cumulative_returns
+        self.benchmark_cumulative_returns[:n] = benchmark_cumulative_returns
+        self.mean_returns_cont[:n] = mean_returns
+        self.mean_benchmark_returns_cont[:n] = mean_benchmark_returns
+        self.annualized_mean_returns_cont[:n] = annualized_mean_returns
+        self.annualized_mean_benchmark_returns_cont[:n] = \
+            annualized_mean_benchmark_returns
+        self.algorithm_volatility[:n] = algorithm_volatility
+        self.benchmark_volatility[:n] = benchmark_volatility
+        self.beta[:n] = beta
+        self.alpha[:n] = alpha
+        self.sharpe[:n] = sharpe
+        self.downside_risk[:n] = downside
+        self.sortino[:n] = sortino
+        self.information[:n] = information
+        self.excess_returns[:n] = algorithm_cumulative_returns - treasury
+        self.drawdowns[:n] = drawdowns
+        self.max_drawdowns[:n] = max_drawdowns
+        self.max_leverages[:n] = max_leverages
+
+        self.algorithm_returns = algorithm_returns
+        self.benchmark_returns = benchmark_returns
+        self.algorithm_cumulative_leverages = leverages
+        self.mean_returns = mean_returns
+        self.annualized_mean_returns = annualized_mean_returns
+        self.mean_benchmark_returns = mean_benchmark_returns[:-1]
+        self.annualized_mean_benchmark_returns = \
+            annualized_mean_benchmark_returns
+        self.current_max = current_max[-1]
+        self.max_drawdown = max_drawdowns[-1]
+        self.max_leverage = max_leverages[-1]
+        self.treasury_period_return = treasury[-1]
+
+    def to_dict(self, dt=None):
         """
         Creates a dictionary representing the state of the risk report.
         Returns a dict object of the form:
+
+        If dt is given, the metrics as of dt are reported instead of the
+        metrics as of the latest dt.
         """
-        dt = self.latest_dt
-        dt_loc = self.latest_dt_loc
+        if dt is None:
+            dt = self.latest_dt
+            dt_loc = self.latest_dt_loc
+            trading_days = self.num_trading_days
+            treasury_period_return = self.treasury_period_return
+            max_drawdown = self.max_drawdown
+            max_leverage = self.max_leverage
+        else:
+            dt_loc = self.cont_index.get_loc(dt)
+            trading_days = dt_loc + 1
+            treasury_period_return = self.daily_treasury.iloc[dt_loc]
+            max_drawdown = self.max_drawdowns[dt_loc]
+            max_leverage = self.max_leverages[dt_loc]
+
         period_label = dt.strftime("%Y-%m")
         rval = {
-            'trading_days': self.num_trading_days,
+            'trading_days': trading_days,
             'benchmark_volatility':
             self.benchmark_volatility[dt_loc],
             'algo_volatility':
             self.algorithm_volatility[dt_loc],
-            'treasury_period_return': self.treasury_period_return,
+            'treasury_period_return': treasury_period_return,
             # Though the two following keys say period return,
             # they would be more accurately called the cumulative return.
             # However, the keys need to stay the same, for now, for backwards
@@ -321,8 +651,8 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
             'sortino': self.sortino[dt_loc],
             'information': self.information[dt_loc],
             'excess_return': self.excess_returns[dt_loc],
-            'max_drawdown': self.max_drawdown,
-            'max_leverage': self.max_leverage,
+            'max_drawdown': max_drawdown,
+            'max_leverage': max_leverage,
             'period_label': period_label
         }
 
@@ -474,3 +804,7 @@ algorithm_returns ({algo_count}) in range {start} : {end} on {dt}"
                     saved state is too old.")
 
         self.__dict__.update(state)
+
+        # The running statistics are rebuilt from the returns on the next
+        # call to update.
+        self._reset_running_stats()
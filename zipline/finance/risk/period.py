@@ -44,21 +44,45 @@ choose_treasury = functools.partial(risk.choose_treasury,
                                     risk.select_treasury_duration)
 
 
+def max_drawdown(algorithm_returns):
+    compounded_returns = []
+    cur_return = 0.0
+    for r in algorithm_returns:
+        try:
+            cur_return += math.log(1.0 + r)
+        # this is a guard for a single day returning -100%, if returns are
+        # greater than -1.0 it will throw an error because you cannot take
+        # the log of a negative number
+        except ValueError:
+            log.debug("{cur} return, zeroing the returns".format(
+                cur=cur_return))
+            cur_return = 0.0
+        compounded_returns.append(cur_return)
+
+    cur_max = None
+    max_drawdown = None
+    for cur in compounded_returns:
+        if cur_max is None or cur > cur_max:
+            cur_max = cur
+
+        drawdown = (cur - cur_max)
+        if max_drawdown is None or drawdown < max_drawdown:
+            max_drawdown = drawdown
+
+    if max_drawdown is None:
+        return 0.0
+
+    return 1.0 - math.exp(max_drawdown)
+
+
 class RiskMetricsPeriod(object):
     def __init__(self, start_date, end_date, returns, env,
                  benchmark_returns=None, algorithm_leverages=None):
 
         self.env = env
-        treasury_curves = env.treasury_curves
-        if treasury_curves.index[-1] >= start_date:
-            mask = ((treasury_curves.index >= start_date) &
-                    (treasury_curves.index <= end_date))
-
-            self.treasury_curves = treasury_curves[mask]
-        else:
-            # our test is beyond the treasury curve history
-            # so we'll use the last available treasury curve
-            self.treasury_curves = treasury_curves[-1:]
+        self.treasury_curves = _period_treasury_curves(
+            env, start_date, end_date,
+        )
 
         self.start_date = start_date
         self.end_date = end_date
@@ -98,11 +122,7 @@ class RiskMetricsPeriod(object):
             raise Exception(message)
 
         self.num_trading_days = len(self.benchmark_returns)
-        self.trading_day_counts = pd.stats.moments.rolling_count(
-            self.algorithm_returns, self.num_trading_days)
-
-        self.mean_algorithm_returns = \
-            self.algorithm_returns.cumsum() / self.trading_day_counts
+        self.calculate_mean_algorithm_returns()
 
         self.benchmark_volatility = self.calculate_volatility(
             self.benchmark_returns)
@@ -207,6 +227,17 @@ class RiskMetricsPeriod(object):
         returns = returns[mask]
         return returns
 
+    def calculate_mean_algorithm_returns(self):
+        """
+        Compute the mean of the algorithm returns through each day, used as
+        the minimum acceptable return by calculate_sortino.
+        """
+        self.trading_day_counts = pd.stats.moments.rolling_count(
+            self.algorithm_returns, self.num_trading_days)
+
+        self.mean_algorithm_returns = \
+            self.algorithm_returns.cumsum() / self.trading_day_counts
+
     def calculate_period_returns(self, returns):
         period_returns = (1. + returns).prod() - 1
         return period_returns
@@ -289,34 +320,7 @@ class RiskMetricsPeriod(object):
                      self.beta)
 
     def calculate_max_drawdown(self):
-        compounded_returns = []
-        cur_return = 0.0
-        for r in self.algorithm_returns:
-            try:
-                cur_return += math.log(1.0 + r)
-            # this is a guard for a single day returning -100%, if returns are
-            # greater than -1.0 it will throw an error because you cannot take
-            # the log of a negative number
-            except ValueError:
-                log.debug("{cur} return, zeroing the returns".format(
-                    cur=cur_return))
-                cur_return = 0.0
-            compounded_returns.append(cur_return)
-
-        cur_max = None
-        max_drawdown = None
-        for cur in compounded_returns:
-            if cur_max is None or cur > cur_max:
-                cur_max = cur
-
-            drawdown = (cur - cur_max)
-            if max_drawdown is None or drawdown < max_drawdown:
-                max_drawdown = drawdown
-
-        if max_drawdown is None:
-            return 0.0
-
-        return 1.0 - math.exp(max_drawdown)
+        return max_drawdown(self.algorithm_returns)
 
     def calculate_max_leverage(self):
         if self.algorithm_leverages is None:
@@ -343,3 +347,302 @@ class RiskMetricsPeriod(object):
                     is too old.")
 
         self.__dict__.update(state)
+
+
+def _tolerant_zero(values):
+    return np.abs(values) <= 10e-7
+
+
+def _window_rows(values, starts, stops):
+    """
+    Gather the windows values[starts[i]:stops[i]] into the rows of a 2D array
+    padded with NaN, so that every window can be reduced at once.
+    """
+    lengths = stops - starts
+    width = max(lengths.max(), 1) if len(lengths) else 1
+    offsets = np.arange(width)
+    inside = offsets < lengths[:, np.newaxis]
+    if len(values) == 0:
+        return np.full(inside.shape, np.nan), inside
+    index = np.minimum(starts[:, np.newaxis] + offsets, len(values) - 1)
+    return np.where(inside, values[index], np.nan), inside
+
+
+def _nanstd(rows, count):
+    """
+    Sample standard deviation of every row, ignoring NaNs.  Rows with fewer
+    than two values are NaN, like ``pd.Series.std``.
+    """
+    valid = ~np.isnan(rows)
+    mean = np.where(valid, rows, 0.0).sum(axis=1) / count
+    dev = np.where(valid, rows - mean[:, np.newaxis], 0.0)
+    return np.where(count > 1,
+                    np.sqrt((dev * dev).sum(axis=1) / (count - 1)),
+                    np.nan)
+
+
+def _demeaned(rows, inside, count):
+    """
+    Subtract the mean of each window from its values, zeroing the padding.
+    """
+    mean = np.where(inside, rows, 0.0).sum(axis=1) / count
+    return np.where(inside, rows - mean[:, np.newaxis], 0.0)
+
+
+def risk_metrics_periods(start_dates, end_dates, returns, env,
+                         benchmark_returns=None, algorithm_leverages=None):
+    """
+    Build the RiskMetricsPeriod for every (start_date, end_date) window at
+    once.
+
+    This is equivalent to constructing a RiskMetricsPeriod per window, but the
+    returns are only masked to trading days once.  Each window is then located
+    with a binary search over the index and the windows are gathered into the
+    rows of a padded 2D array, so that the period returns, volatilities, beta,
+    sharpe, sortino, information ratio and max drawdown of every window are
+    computed by whole-array reductions.
+
+    Parameters
+    ----------
+    start_dates : list[datetime]
+        The first day of each window.
+    end_dates : list[datetime]
+        The last day of each window.
+    returns : pd.Series
+        The daily algorithm returns.
+    env : TradingEnvironment
+        The environment providing the trading calendar, benchmark returns and
+        treasury curves.
+    benchmark_returns : pd.Series, optional
+        The daily benchmark returns.  Defaults to the environment's benchmark
+        returns over the algorithm returns' date range.
+    algorithm_leverages : list[float], optional
+        The gross leverages of the algorithm.
+
+    Returns
+    -------
+    periods : list[RiskMetricsPeriod]
+        The metrics of each window, in the order of ``start_dates``.
+    """
+    if len(start_dates) == 0:
+        return []
+
+    if benchmark_returns is None:
+        br = env.benchmark_returns
+        benchmark_returns = br[(br.index >= returns.index[0]) &
+                               (br.index <= returns.index[-1])]
+
+    def to_trading_days(daily_returns):
+        if isinstance(daily_returns, list):
+            daily_returns = pd.Series([x.returns for x in daily_returns],
+                                      index=[x.date for x in daily_returns])
+        trade_day_mask = daily_returns.index.normalize().isin(
+            env.trading_days)
+        return daily_returns[trade_day_mask]
+
+    returns = to_trading_days(returns)
+    benchmark_returns = to_trading_days(benchmark_returns)
+
+    start_index = pd.DatetimeIndex(start_dates)
+    end_index = pd.DatetimeIndex(end_dates)
+
+    algo_lo = returns.index.searchsorted(start_index, side='left')
+    algo_hi = returns.index.searchsorted(end_index, side='right')
+    bm_lo = benchmark_returns.index.searchsorted(start_index, side='left')
+    bm_hi = benchmark_returns.index.searchsorted(end_index, side='right')
+
+    algo, inside = _window_rows(returns.values.astype(np.float64),
+                                algo_lo, algo_hi)
+    bench, _ = _window_rows(benchmark_returns.values.astype(np.float64),
+                            bm_lo, bm_hi)
+    num_trading_days = bm_hi - bm_lo
+
+    # Every window must cover the same days in both series.
+    mismatched = (algo_hi - algo_lo) != num_trading_days
+    if not mismatched.any() and inside.any():
+        offsets = np.arange(inside.shape[1])
+        algo_days = returns.index.asi8[
+            np.minimum(algo_lo[:, np.newaxis] + offsets, len(returns) - 1)
+        ]
+        bm_days = benchmark_returns.index.asi8[
+            np.minimum(bm_lo[:, np.newaxis] + offsets,
+                       len(benchmark_returns) - 1)
+        ]
+        mismatched = (inside & (algo_days != bm_days)).any(axis=1)
+    if mismatched.any():
+        i = np.flatnonzero(mismatched)[0]
+        message = "Mismatch between benchmark_returns ({bm_count}) and \
+        algorithm_returns ({algo_count}) in range {start} : {end}"
+        message = message.format(
+            bm_count=bm_hi[i] - bm_lo[i],
+            algo_count=algo_hi[i] - algo_lo[i],
+            start=start_dates[i],
+            end=end_dates[i]
+        )
+        raise Exception(message)
+
+    algo_valid = ~np.isnan(algo)
+    bench_valid = ~np.isnan(bench)
+    algo_count = algo_valid.sum(axis=1)
+    bench_count = bench_valid.sum(axis=1)
+    sqrt_days = np.sqrt(num_trading_days)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        algorithm_period_returns = \
+            np.where(algo_valid, 1.0 + algo, 1.0).prod(axis=1) - 1
+        benchmark_period_returns = \
+            np.where(bench_valid, 1.0 + bench, 1.0).prod(axis=1) - 1
+
+        algorithm_volatility = _nanstd(algo, algo_count) * sqrt_days
+        benchmark_volatility = _nanstd(bench, bench_count) * sqrt_days
+
+        treasury_curves = [
+            _period_treasury_curves(env, start_date, end_date)
+            for start_date, end_date in zip(start_dates, end_dates)
+        ]
+        treasury_period_returns = np.array([
+            choose_treasury(curves, start_date, end_date, env)
+            for curves, start_date, end_date in zip(
+                treasury_curves, start_dates, end_dates,
+            )
+        ])
+        excess_returns = algorithm_period_returns - treasury_period_returns
+
+        sharpe = excess_returns / algorithm_volatility
+        sharpe[_tolerant_zero(algorithm_volatility) | np.isnan(sharpe)] = 0.0
+
+        # The minimum acceptable return of each day is the mean of the window
+        # through that day.
+        mean_returns = np.cumsum(np.where(algo_valid, algo, 0.0), axis=1) / \
+            np.cumsum(algo_valid, axis=1)
+        rets = np.round(algo, 8)
+        mar = np.round(mean_returns, 8)
+        below = inside & (rets < mar)
+        downside_count = below.sum(axis=1)
+        downside = np.where(below, rets - mar, np.nan)
+        downside_risk = np.where(
+            downside_count > 1,
+            _nanstd(downside, downside_count) * sqrt_days,
+            0.0,
+        )
+        sortino = excess_returns / downside_risk
+        sortino[_tolerant_zero(downside_risk)] = 0.0
+
+        relative = algo - bench
+        relative_count = (~np.isnan(relative)).sum(axis=1)
+        relative_deviation = _nanstd(relative, relative_count)
+        information = np.nansum(relative, axis=1) / relative_count / \
+            relative_deviation
+        information[_tolerant_zero(relative_deviation) |
+                    np.isnan(relative_deviation)] = 0.0
+
+        # np.cov, as used by RiskMetricsPeriod.calculate_beta, propagates
+        # NaNs, so any missing value leaves the window without a beta.
+        complete = (num_trading_days >= 2) & \
+            (algo_count == num_trading_days) & \
+            (bench_count == num_trading_days)
+        algo_dev = _demeaned(algo, inside, num_trading_days)
+        bench_dev = _demeaned(bench, inside, num_trading_days)
+        ddof = num_trading_days - 1
+        algorithm_variance = (algo_dev * algo_dev).sum(axis=1) / ddof
+        benchmark_variance = (bench_dev * bench_dev).sum(axis=1) / ddof
+        algorithm_covariance = (algo_dev * bench_dev).sum(axis=1) / ddof
+        complete &= np.isfinite(algorithm_variance) & \
+            np.isfinite(benchmark_variance) & \
+            np.isfinite(algorithm_covariance)
+
+        # The eigenvalues of the symmetric 2x2 covariance matrix.
+        half_trace = (algorithm_variance + benchmark_variance) / 2
+        radius = np.hypot((algorithm_variance - benchmark_variance) / 2,
+                          algorithm_covariance)
+        eigen_high = half_trace + radius
+        eigen_low = half_trace - radius
+        condition_number = eigen_high / eigen_low
+
+        beta = np.where(complete,
+                        algorithm_covariance / benchmark_variance,
+                        np.nan)
+        alpha_ = algorithm_period_returns - (
+            treasury_period_returns +
+            beta * (benchmark_period_returns - treasury_period_returns))
+
+        # Windows with a day losing everything (or a NaN) are compounded by
+        # the scalar max_drawdown, which restarts the compounded returns.
+        irregular = (inside & ~(algo > -1.0)).any(axis=1)
+        log_returns = np.log(np.where(inside & ~irregular[:, np.newaxis],
+                                      1.0 + algo, 1.0))
+        compounded = np.cumsum(log_returns, axis=1)
+        drawdowns = (compounded - np.maximum.accumulate(compounded, axis=1))
+        max_drawdowns = 1.0 - np.exp(drawdowns.min(axis=1))
+
+    if algorithm_leverages is None:
+        max_leverage = 0.0
+    else:
+        max_leverage = max(algorithm_leverages)
+
+    periods = []
+    for i, (start_date, end_date) in enumerate(zip(start_dates, end_dates)):
+        algorithm_returns = returns.iloc[algo_lo[i]:algo_hi[i]]
+        if irregular[i]:
+            period_max_drawdown = max_drawdown(algorithm_returns)
+        else:
+            period_max_drawdown = max_drawdowns[i]
+        if complete[i]:
+            beta_stats = (
+                beta[i],
+                algorithm_covariance[i],
+                benchmark_variance[i],
+                condition_number[i],
+                np.array([eigen_high[i], eigen_low[i]]),
+            )
+        else:
+            beta_stats = (np.nan, np.nan, np.nan, np.nan, [])
+
+        # Set everything __init__ would, so that the calculate_* methods
+        # still work on the period.
+        period = RiskMetricsPeriod.__new__(RiskMetricsPeriod)
+        period.env = env
+        period.treasury_curves = treasury_curves[i]
+        period.start_date = start_date
+        period.end_date = end_date
+        period.algorithm_returns = algorithm_returns
+        period.benchmark_returns = \
+            benchmark_returns.iloc[bm_lo[i]:bm_hi[i]]
+        period.algorithm_leverages = algorithm_leverages
+        period.num_trading_days = int(num_trading_days[i])
+        period.calculate_mean_algorithm_returns()
+        period.algorithm_period_returns = algorithm_period_returns[i]
+        period.benchmark_period_returns = benchmark_period_returns[i]
+        period.algorithm_volatility = algorithm_volatility[i]
+        period.benchmark_volatility = benchmark_volatility[i]
+        period.treasury_period_return = treasury_period_returns[i]
+        period.sharpe = sharpe[i]
+        period.downside_risk = downside_risk[i]
+        period.sortino = sortino[i]
+        period.information = information[i]
+        period.beta, period.algorithm_covariance, \
+            period.benchmark_variance, period.condition_number, \
+            period.eigen_values = beta_stats
+        period.alpha = alpha_[i]
+        period.excess_return = excess_returns[i]
+        period.max_drawdown = period_max_drawdown
+        period.max_leverage = max_leverage
+        periods.append(period)
+
+    return periods
+
+
+def _period_treasury_curves(env, start_date, end_date):
+    """
+    Get the treasury curves of `env` from `start_date` through `end_date`.
+    """
+    treasury_curves = env.treasury_curves
+    if treasury_curves.index[-1] >= start_date:
+        index = treasury_curves.index
+        return treasury_curves.iloc[
+            index.searchsorted(start_date, side='left'):
+            index.searchsorted(end_date, side='right')
+        ]
+    # our test is beyond the treasury curve history
+    # so we'll use the last available treasury curve
+    return treasury_curves[-1:]
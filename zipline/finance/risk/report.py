@@ -62,7 +62,7 @@ import datetime
 from dateutil.relativedelta import relativedelta
 from six import iteritems
 
-from . period import RiskMetricsPeriod
+from . period import risk_metrics_periods
 
 from zipline.utils.serialization_utils import (
     VERSION_LABEL
@@ -125,13 +125,14 @@ class RiskReport(object):
 
     def periods_in_range(self, months_per, start, end):
         one_day = datetime.timedelta(days=1)
-        ends = []
+        start_dates = []
+        end_dates = []
         cur_start = start.replace(day=1)
 
         # in edge cases (all sids filtered out, start/end are adjacent)
         # a test will not generate any returns data
         if len(self.algorithm_returns) == 0:
-            return ends
+            return []
 
         # ensure that we have an end at the end of a calendar month, in case
         # the return series ends mid-month...
@@ -140,19 +141,18 @@ class RiskReport(object):
             cur_end = cur_start + relativedelta(months=months_per) - one_day
             if(cur_end > the_end):
                 break
-            cur_period_metrics = RiskMetricsPeriod(
-                start_date=cur_start,
-                end_date=cur_end,
-                returns=self.algorithm_returns,
-                benchmark_returns=self.benchmark_returns,
-                env=self.env,
-                algorithm_leverages=self.algorithm_leverages,
-            )
-
-            ends.append(cur_period_metrics)
+            start_dates.append(cur_start)
+            end_dates.append(cur_end)
             cur_start = cur_start + relativedelta(months=1)
 
-        return ends
+        return risk_metrics_periods(
+            start_dates,
+            end_dates,
+            returns=self.algorithm_returns,
+            benchmark_returns=self.benchmark_returns,
+            env=self.env,
+            algorithm_leverages=self.algorithm_leverages,
+        )
 
     def __getstate__(self):
         state_dict = \
@@ -18,9 +18,11 @@ import abc
 
 import math
 
+from collections import namedtuple
 from copy import copy
 from functools import partial
 
+import numpy as np
 from six import with_metaclass
 
 from zipline.finance.transaction import create_transaction
@@ -56,6 +58,66 @@ class LiquidityExceeded(Exception):
     pass
 
 
+BarFills = namedtuple(
+    'BarFills',
+    ['amounts', 'prices', 'stops', 'stop_reached', 'limit_reached'],
+)
+
+
+def update_triggers(prices, directions, stops, limits,
+                    stop_reached, limit_reached):
+    """
+    Vectorized version of ``Order.check_triggers``.
+
+    Parameters
+    ----------
+    prices : np.array[float64]
+        The bar price seen by each order.
+    directions : np.array[float64]
+        The direction (1 or -1) of each order.
+    stops : np.array[float64]
+        The stop price of each order, or NaN if the order has no stop.
+    limits : np.array[float64]
+        The limit price of each order, or NaN if the order has no limit.
+    stop_reached : np.array[bool]
+        Whether each order's stop has already been reached.
+    limit_reached : np.array[bool]
+        Whether each order's limit has already been reached.
+
+    Returns
+    -------
+    stops, stop_reached, limit_reached : np.array
+        New copies of the trigger state.  Stop-limit orders whose stop was
+        reached have their stop replaced by NaN, matching the conversion of a
+        STOP LIMIT order into a LIMIT order done by ``Order.check_triggers``.
+    """
+    stops = np.array(stops, dtype=float, copy=True)
+    stop_reached = np.array(stop_reached, dtype=bool, copy=True)
+    limit_reached = np.array(limit_reached, dtype=bool, copy=True)
+
+    has_stop = ~np.isnan(stops)
+    has_limit = ~np.isnan(limits)
+
+    # Orders that have already been triggered keep their current state.
+    pending = ~(
+        (~has_stop | stop_reached) & (~has_limit | limit_reached)
+    )
+
+    buy = directions > 0
+    with np.errstate(invalid='ignore'):
+        stop_hit = has_stop & np.where(buy, prices >= stops, prices <= stops)
+        limit_hit = has_limit & np.where(
+            buy, prices <= limits, prices >= limits,
+        )
+
+    sl_stop_hit = pending & has_stop & has_limit & stop_hit
+    stop_reached[pending] = (stop_hit & ~has_limit)[pending]
+    limit_reached[pending] = (limit_hit & (~has_stop | stop_hit))[pending]
+    stops[sl_stop_hit] = np.nan
+
+    return stops, stop_reached, limit_reached
+
+
 class SlippageModel(with_metaclass(abc.ABCMeta)):
 
     @property
@@ -160,6 +222,186 @@ class VolumeShareSlippage(SlippageModel):
             math.copysign(cur_volume, order.direction)
         )
 
+    def fill_orders(self,
+                    bars,
+                    open_amounts,
+                    directions,
+                    limits,
+                    stops,
+                    volumes,
+                    prices,
+                    stop_reached=None,
+                    limit_reached=None):
+        """
+        Fill every open order for a bar at once.
+
+        This is an array-based equivalent of calling ``simulate`` once per
+        trade event.  Orders are grouped by the bar they trade against, and
+        within a bar they are filled in the order in which they appear in the
+        inputs, so that price impact and volume limits accumulate exactly as
+        they do in ``simulate``.  The work is done one "depth" at a time: the
+        first order of every bar is processed in a single vectorized step,
+        then the second order of every bar, and so on.
+
+        Parameters
+        ----------
+        bars : np.array[intp]
+            For each order, the index into ``volumes`` and ``prices`` of the
+            bar it trades against.
+        open_amounts : np.array[int64]
+            The signed number of shares still open on each order.
+        directions : np.array[float64]
+            The direction (1 or -1) of each order.
+        limits : np.array[float64]
+            The limit price of each order, or NaN for orders without a limit.
+        stops : np.array[float64]
+            The stop price of each order, or NaN for orders without a stop.
+        volumes : np.array[float64]
+            The traded volume of each bar.
+        prices : np.array[float64]
+            The traded price of each bar.
+        stop_reached : np.array[bool], optional
+            Whether each order's stop has already been reached.  Defaults to
+            all False.
+        limit_reached : np.array[bool], optional
+            Whether each order's limit has already been reached.  Defaults to
+            all False.
+
+        Returns
+        -------
+        fills : BarFills
+            ``amounts`` holds the signed number of shares filled for each
+            order (0 for unfilled orders) and ``prices`` the impacted fill
+            price (NaN for unfilled orders).  ``stops``, ``stop_reached`` and
+            ``limit_reached`` hold the updated trigger state of each order.
+        """
+        bars = np.asarray(bars, dtype=np.intp)
+        open_amounts = np.asarray(open_amounts)
+        directions = np.asarray(directions, dtype=float)
+        limits = np.asarray(limits, dtype=float)
+        volumes = np.asarray(volumes, dtype=float)
+        prices = np.asarray(prices, dtype=float)
+
+        n = len(bars)
+        stops = np.array(stops, dtype=float, copy=True)
+        if stop_reached is None:
+            stop_reached = np.zeros(n, dtype=bool)
+        else:
+            stop_reached = np.array(stop_reached, dtype=bool, copy=True)
+        if limit_reached is None:
+            limit_reached = np.zeros(n, dtype=bool)
+        else:
+            limit_reached = np.array(limit_reached, dtype=bool, copy=True)
+
+        fill_amounts = np.zeros(n, dtype=np.int64)
+        fill_prices = np.full(n, np.nan)
+
+        if not n:
+            return BarFills(
+                fill_amounts, fill_prices, stops, stop_reached, limit_reached,
+            )
+
+        # Position of each order within its bar, preserving input order.
+        by_bar = bars.argsort(kind='mergesort')
+        sorted_bars = bars[by_bar]
+        is_first = np.r_[True, sorted_bars[1:] != sorted_bars[:-1]]
+        first_pos = np.maximum.accumulate(
+            np.where(is_first, np.arange(n), 0),
+        )
+        depth = np.empty(n, dtype=np.intp)
+        depth[by_bar] = np.arange(n) - first_pos
+
+        max_volume = self.volume_limit * volumes
+        volume_for_bar = np.zeros(len(volumes))
+        exhausted = np.zeros(len(volumes), dtype=bool)
+
+        by_depth = depth.argsort(kind='mergesort')
+        level_bounds = np.searchsorted(
+            depth[by_depth], np.arange(depth.max() + 2),
+        )
+        for start, stop in zip(level_bounds[:-1], level_bounds[1:]):
+            idx = by_depth[start:stop]
+            idx = idx[~exhausted[bars[idx]] & (open_amounts[idx] != 0)]
+            if not len(idx):
+                continue
+
+            order_bars = bars[idx]
+            order_stops, order_stop_reached, order_limit_reached = \
+                update_triggers(
+                    prices[order_bars],
+                    directions[idx],
+                    stops[idx],
+                    limits[idx],
+                    stop_reached[idx],
+                    limit_reached[idx],
+                )
+            stops[idx] = order_stops
+            stop_reached[idx] = order_stop_reached
+            limit_reached[idx] = order_limit_reached
+
+            triggered = (
+                (np.isnan(order_stops) | order_stop_reached) &
+                (np.isnan(limits[idx]) | order_limit_reached)
+            )
+            idx = idx[triggered]
+            order_bars = order_bars[triggered]
+
+            # we can't fill any more transactions against these bars
+            remaining_volume = max_volume[order_bars] - \
+                volume_for_bar[order_bars]
+            out_of_volume = remaining_volume < 1
+            exhausted[order_bars[out_of_volume]] = True
+            idx = idx[~out_of_volume]
+            order_bars = order_bars[~out_of_volume]
+            remaining_volume = remaining_volume[~out_of_volume]
+
+            cur_volume = np.floor(
+                np.minimum(remaining_volume, np.abs(open_amounts[idx])),
+            )
+            fillable = cur_volume >= 1
+            idx = idx[fillable]
+            order_bars = order_bars[fillable]
+            cur_volume = cur_volume[fillable]
+
+            total_volume = volume_for_bar[order_bars] + cur_volume
+            volume_share = np.minimum(
+                total_volume / volumes[order_bars],
+                self.volume_limit,
+            )
+            order_directions = directions[idx]
+            bar_prices = prices[order_bars]
+            impacted_prices = bar_prices + (
+                volume_share ** 2 *
+                np.copysign(self.price_impact, order_directions) *
+                bar_prices
+            )
+
+            # do not fill orders whose impacted price is worse than their
+            # limit price.  see ``process_order``.
+            order_limits = limits[idx]
+            with np.errstate(invalid='ignore'):
+                worse_than_limit = (
+                    ~np.isnan(order_limits) & (order_limits != 0) & (
+                        ((order_directions > 0) &
+                         (impacted_prices > order_limits)) |
+                        ((order_directions < 0) &
+                         (impacted_prices < order_limits))
+                    )
+                )
+            fill = ~worse_than_limit
+            idx = idx[fill]
+            order_bars = order_bars[fill]
+            cur_volume = cur_volume[fill]
+
+            fill_amounts[idx] = np.copysign(cur_volume, directions[idx])
+            fill_prices[idx] = impacted_prices[fill]
+            # Each bar appears at most once per depth level.
+            volume_for_bar[order_bars] += cur_volume
+
+        return BarFills(
+            fill_amounts, fill_prices, stops, stop_reached, limit_reached,
+        )
+
     def __getstate__(self):
 
         state_dict = copy(self.__dict__)
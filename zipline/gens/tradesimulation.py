@@ -104,16 +104,24 @@ class AlgorithmSimulator(object):
                 # update our universe, but don't yield any perf messages,
                 # and don't send a snapshot to handle_data.
                 if date < self.algo_start:
+                    trade_sids = []
+                    trade_prices = []
                     for event in snapshot:
                         if event.type == DATASOURCE_TYPE.SPLIT:
                             self.algo.blotter.process_split(event)
 
                         elif event.type == DATASOURCE_TYPE.TRADE:
                             self.update_universe(event)
-                            self.algo.perf_tracker.process_trade(event)
+                            trade_sids.append(event.sid)
+                            trade_prices.append(event.price)
                         elif event.type == DATASOURCE_TYPE.CUSTOM:
                             self.update_universe(event)
 
+                    if trade_sids:
+                        self.algo.perf_tracker.update_last_sales(
+                            trade_sids, trade_prices, date,
+                        )
+
                 else:
                     messages = self._process_snapshot(
                         date,
@@ -189,7 +197,7 @@ class AlgorithmSimulator(object):
         #
         # Done here, to allow for perf_tracker or blotter to be swapped out
         # or changed in between snapshots.
-        perf_process_trade = self.algo.perf_tracker.process_trade
+        perf_update_last_sales = self.algo.perf_tracker.update_last_sales
         perf_process_transaction = self.algo.perf_tracker.process_transaction
         perf_process_order = self.algo.perf_tracker.process_order
         perf_process_benchmark = self.algo.perf_tracker.process_benchmark
@@ -274,7 +282,16 @@ class AlgorithmSimulator(object):
                     elif txn.type == DATASOURCE_TYPE.COMMISSION:
                         perf_process_commission(txn)
                     perf_process_order(order)
-                perf_process_trade(trade)
+
+        # The last sale prices of every trade in the snapshot are applied in
+        # one step, after all of the snapshot's transactions, rather than once
+        # per trade.
+        if trades and not instant_fill:
+            perf_update_last_sales(
+                [trade.sid for trade in trades],
+                [trade.price for trade in trades],
+                dt,
+            )
 
         for custom in customs:
             self.update_universe(custom)
@@ -309,7 +326,13 @@ class AlgorithmSimulator(object):
                         perf_process_transaction(txn)
                     if order is not None:
                         perf_process_order(order)
-                perf_process_trade(trade)
+
+            if events_to_be_processed:
+                perf_update_last_sales(
+                    [trade.sid for trade in events_to_be_processed],
+                    [trade.price for trade in events_to_be_processed],
+                    dt,
+                )
 
         if benchmark_event_occurred:
             return self.generate_messages(dt)
@@ -12,11 +12,29 @@ zipline.lib._intwindow
 zipline.lib._datewindow
 """
 from numpy cimport ndarray
-from numpy import asarray
+from numpy import asarray, datetime64, unique
+
+from zipline.lib.adjustment import Datetime64Adjustment
 
 ctypedef ctype[:, :] databuffer
 
 
+cdef object _moved_adjustment(object adjustment, dict positions):
+    """
+    Copy `adjustment`, moving its columns to their `positions`.
+    """
+    cdef object value = adjustment.value
+    if isinstance(adjustment, Datetime64Adjustment):
+        value = datetime64(value, 'ns')
+    return type(adjustment)(
+        adjustment.first_row,
+        adjustment.last_row,
+        positions[adjustment.first_col],
+        positions[adjustment.last_col],
+        value,
+    )
+
+
 cdef class AdjustedArrayWindow:
     """
     An iterator representing a moving view over an AdjustedArray.
@@ -24,19 +42,34 @@ cdef class AdjustedArrayWindow:
     Concrete subtypes should subclass this and provide a `data` attribute for
     specific types.
 
-    This object stores a copy of the data from the AdjustedArray over which
-    it's iterating.  At each step in the iteration, it mutates its copy to
-    allow us to show different data when looking back over the array.
+    The data of the AdjustedArray over which it's iterating is never
+    modified.  Adjustments only modify the rows up to their `last_row` of the
+    columns between their `first_col` and `last_col`, so this object stores
+    a copy of just those columns, up to the last adjusted row, and mutates
+    it to allow us to show different data when looking back over the array.
 
     The arrays yielded by this iterator are always views over the underlying
-    data.
+    data.  Windows which don't contain any row modified by the adjustments
+    applied so far are views of the shared data.  The other windows are
+    views of a buffer built from the shared rows and the adjusted columns,
+    which is shared by the windows up to the next adjustment.
+
+    When the adjustments are so frequent that these buffers would copy more
+    than the adjusted rows, this object instead stores a copy of every column
+    of the adjusted rows, followed by enough unmodified rows to complete the
+    windows which start among them, and adjusts it in place.
     """
     cdef:
         # ctype must be defined by the file into which this is being copied.
-        databuffer data
-        object viewtype
+        databuffer data, shared
+        # A copy of the adjusted columns, when we copy them.
+        readonly databuffer adjusted
+        object viewtype, columns
         readonly Py_ssize_t window_length
-        Py_ssize_t anchor, max_anchor, next_adj
+        Py_ssize_t anchor, max_anchor, next_adj, shared_start
+        # Only used when we copy the adjusted columns.
+        bint by_columns
+        Py_ssize_t applied_last_row, block_start, block_stop
         dict adjustments
         list adjustment_indices
 
@@ -47,7 +80,52 @@ cdef class AdjustedArrayWindow:
                   Py_ssize_t offset,
                   Py_ssize_t window_length):
 
-        self.data = data
+        cdef:
+            Py_ssize_t shared_start = 0, ncopied = 0
+            object adjustment
+            list row_adjustments, adjusted_columns = []
+            dict positions
+
+        for row_adjustments in adjustments.values():
+            for adjustment in row_adjustments:
+                shared_start = max(shared_start, adjustment.last_row + 1)
+                adjusted_columns.extend(
+                    range(adjustment.first_col, adjustment.last_col + 1)
+                )
+
+        self.shared = data
+        if shared_start:
+            ncopied = min(data.shape[0], shared_start + window_length - 1)
+
+        # Each adjustment starts a buffer of at most 2 * (window_length - 1)
+        # rows, so copying columns pays off when adjustments are rare
+        # compared to the rows that a copy of whole rows would take.
+        self.by_columns = (
+            shared_start > 0 and
+            2 * (window_length - 1) * len(adjustments) < ncopied
+        )
+        if self.by_columns:
+            self.columns = unique(adjusted_columns)
+            positions = {
+                column: position
+                for position, column in enumerate(self.columns)
+            }
+            self.adjusted = asarray(data[:shared_start])[:, self.columns]
+            adjustments = {
+                row: [
+                    _moved_adjustment(adjustment, positions)
+                    for adjustment in row_adjustments
+                ]
+                for row, row_adjustments in adjustments.items()
+            }
+        elif shared_start:
+            self.data = asarray(data[:ncopied]).copy()
+        else:
+            self.data = data
+        self.shared_start = shared_start
+        self.applied_last_row = -1
+        self.block_start = self.block_stop = 0
+
         self.viewtype = viewtype
         self.adjustments = adjustments
         self.adjustment_indices = sorted(adjustments, reverse=True)
@@ -69,33 +147,146 @@ cdef class AdjustedArrayWindow:
     def __iter__(self):
         return self
 
+    cdef apply_adjustments(self, Py_ssize_t anchor):
+        """
+        Apply any adjustments that occured before `anchor`.  Equivalently,
+        apply any adjustments known **on or before** the date for which we're
+        calculating a window.
+        """
+        cdef object adjustment
+
+        while self.next_adj < anchor:
+
+            for adjustment in self.adjustments[self.next_adj]:
+                if self.by_columns:
+                    adjustment.mutate(self.adjusted)
+                    self.applied_last_row = max(
+                        self.applied_last_row, adjustment.last_row,
+                    )
+                    # The buffer no longer matches the adjusted columns.
+                    self.block_stop = 0
+                else:
+                    adjustment.mutate(self.data)
+
+            self.next_adj = self.pop_next_adj()
+
+    cdef ndarray adjusted_rows(self, Py_ssize_t start, Py_ssize_t stop):
+        """
+        Get the rows from `start` to `stop` with the adjustments applied so
+        far, when we copy the adjusted columns.
+
+        The rows are read from the buffer, which is rebuilt from the shared
+        rows and the adjusted columns if it doesn't cover them.  A rebuilt
+        buffer covers the rows of every window up to the next adjustment
+        which contains an adjusted row.
+        """
+        cdef:
+            ndarray buf
+            Py_ssize_t end, nadjusted
+
+        if not (self.block_start <= start and stop <= self.block_stop):
+            end = min(
+                self.next_adj,
+                self.max_anchor,
+                self.applied_last_row + self.window_length,
+            )
+            buf = asarray(self.shared[start:end]).copy()
+            nadjusted = min(end, self.shared_start) - start
+            if nadjusted > 0:
+                buf[:nadjusted, self.columns] = asarray(
+                    self.adjusted[start:start + nadjusted]
+                )
+            self.data = buf
+            self.block_start = start
+            self.block_stop = end
+
+        return asarray(
+            self.data[start - self.block_start:stop - self.block_start]
+        )
+
     def __next__(self):
         cdef:
             ndarray out
-            object adjustment
             Py_ssize_t start, anchor
 
         anchor = self.anchor
         if anchor > self.max_anchor:
             raise StopIteration()
 
-        # Apply any adjustments that occured before our current anchor.
-        # Equivalently, apply any adjustments known **on or before** the date
-        # for which we're calculating a window.
-        while self.next_adj < anchor:
+        start = anchor - self.window_length
+        if start >= self.shared_start:
+            # No adjustment modifies the rows of this window, or of any later
+            # window, so the remaining adjustments can be skipped.
+            out = asarray(self.shared[start:anchor]).view(self.viewtype)
+            out.setflags(write=False)
 
-            for adjustment in self.adjustments[self.next_adj]:
-                adjustment.mutate(self.data)
+            self.anchor += 1
+            return out
 
-            self.next_adj = self.pop_next_adj()
+        self.apply_adjustments(anchor)
 
-        start = anchor - self.window_length
-        out = asarray(self.data[start:self.anchor]).view(self.viewtype)
+        if not self.by_columns:
+            out = asarray(self.data[start:anchor])
+        elif self.applied_last_row < start:
+            out = asarray(self.shared[start:anchor])
+        else:
+            out = self.adjusted_rows(start, anchor)
+        out = out.view(self.viewtype)
         out.setflags(write=False)
 
         self.anchor += 1
         return out
 
+    def next_block(self):
+        """
+        Advance over every window up to the next adjustment at once.
+
+        The windows advanced over are all views of the same rows, so they can
+        be computed on together.
+
+        Returns
+        -------
+        rows : np.ndarray
+            The rows covered by the windows.  The i-th window is
+            ``rows[i:i + window_length]``.
+        nwindows : int
+            The number of windows advanced over.
+        """
+        cdef:
+            ndarray out
+            Py_ssize_t start, stop, anchor
+
+        anchor = self.anchor
+        if anchor > self.max_anchor:
+            raise StopIteration()
+
+        start = anchor - self.window_length
+        if start >= self.shared_start:
+            stop = self.max_anchor
+            out = asarray(self.shared[start:stop]).view(self.viewtype)
+        elif not self.by_columns:
+            self.apply_adjustments(anchor)
+            # Stop at the last window that starts among the copied rows.
+            stop = min(
+                self.next_adj,
+                self.max_anchor,
+                self.shared_start + self.window_length - 1,
+            )
+            out = asarray(self.data[start:stop]).view(self.viewtype)
+        else:
+            self.apply_adjustments(anchor)
+            stop = min(self.next_adj, self.max_anchor)
+            if self.applied_last_row < start:
+                out = asarray(self.shared[start:stop]).view(self.viewtype)
+            else:
+                # Stop at the last window containing an adjusted row.
+                stop = min(stop, self.applied_last_row + self.window_length)
+                out = self.adjusted_rows(start, stop).view(self.viewtype)
+        out.setflags(write=False)
+
+        self.anchor = stop + 1
+        return out, stop - anchor + 1
+
     def __repr__(self):
         return "<%s: window_length=%d, anchor=%d, max_anchor=%d, dtype=%r>" % (
             type(self).__name__,
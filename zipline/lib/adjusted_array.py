@@ -10,7 +10,11 @@ from numpy import (
     ndarray,
     uint32,
     uint8,
+    vstack,
+    where,
 )
+from six import iteritems
+
 from zipline.errors import (
     WindowLengthNotPositive,
     WindowLengthTooLong,
@@ -25,6 +29,8 @@ from zipline.utils.numpy_utils import (
 from zipline.utils.memoize import lazyval
 from zipline.utils.sentinel import sentinel
 
+from .adjustment import Float64Adjustment
+
 # These class names are all the same because of our bootleg templating system.
 from ._float64window import AdjustedArrayWindow as Float64Window
 from ._int64window import AdjustedArrayWindow as Int64Window
@@ -153,6 +159,9 @@ class AdjustedArray(object):
         Produce an iterator rolling windows rows over our data.
         Each emitted window will have `window_length` rows.
 
+        The iterator shares our data, copying only the rows that our
+        adjustments modify.
+
         Parameters
         ----------
         window_length : int
@@ -160,7 +169,7 @@ class AdjustedArray(object):
         offset : int, optional
             Number of rows to skip before the first window.
         """
-        data = self._data.copy()
+        data = self._data
         _check_window_params(data, window_length)
         return self._iterator_type(
             data,
@@ -217,6 +226,154 @@ def ensure_ndarray(ndarray_or_adjusted_array):
         )
 
 
+def _moved_adjustment(adjustment, first_row, last_row, column):
+    """
+    Copy a single-column Float64Adjustment to new rows and a new column.
+    """
+    if not isinstance(adjustment, Float64Adjustment):
+        raise TypeError(
+            "Can't move adjustment of type %s." % type(adjustment).__name__
+        )
+    return type(adjustment)(
+        first_row,
+        last_row,
+        column,
+        column,
+        adjustment.value,
+    )
+
+
+def _add_adjustment(adjustments, row, adjustment):
+    try:
+        adjustments[row].append(adjustment)
+    except KeyError:
+        adjustments[row] = [adjustment]
+
+
+def trailing_rows(array, nrows):
+    """
+    Return an AdjustedArray of the last `nrows` rows of `array`.
+
+    Adjustments that take effect before the first kept row are applied as
+    soon as the new array is traversed.
+
+    Raises
+    ------
+    TypeError
+        If `array` has adjustments other than Float64Adjustments.
+    """
+    start = array.data.shape[0] - nrows
+    adjustments = {}
+    for row, row_adjustments in iteritems(array.adjustments):
+        for adjustment in row_adjustments:
+            if adjustment.last_row < start:
+                continue
+            for column in range(adjustment.first_col,
+                                adjustment.last_col + 1):
+                _add_adjustment(
+                    adjustments,
+                    max(row - start, 0),
+                    _moved_adjustment(
+                        adjustment,
+                        max(adjustment.first_row - start, 0),
+                        adjustment.last_row - start,
+                        column,
+                    ),
+                )
+    return AdjustedArray(array.data[start:], NOMASK, adjustments)
+
+
+def take_columns(array, indexer):
+    """
+    Return an AdjustedArray of the columns `indexer` of `array`.
+
+    Entries of `indexer` equal to -1 produce columns of missing values.
+
+    Raises
+    ------
+    TypeError
+        If `array` has adjustments other than Float64Adjustments, or if
+        missing values are requested for a dtype without a default missing
+        value.
+    """
+    data = array.data
+    missing = indexer == -1
+    out = data[:, where(missing, 0, indexer)]
+    if missing.any():
+        try:
+            out[:, missing] = default_fillvalue_for_dtype(data.dtype)
+        except KeyError:
+            raise TypeError("No missing value for %s data." % data.dtype)
+
+    new_columns = {old: new for new, old in enumerate(indexer) if old != -1}
+    adjustments = {}
+    for row, row_adjustments in iteritems(array.adjustments):
+        for adjustment in row_adjustments:
+            for column in range(adjustment.first_col,
+                                adjustment.last_col + 1):
+                try:
+                    new_column = new_columns[column]
+                except KeyError:
+                    continue
+                _add_adjustment(
+                    adjustments,
+                    row,
+                    _moved_adjustment(
+                        adjustment,
+                        adjustment.first_row,
+                        adjustment.last_row,
+                        new_column,
+                    ),
+                )
+    return AdjustedArray(out, NOMASK, adjustments)
+
+
+def prepend_rows(head, array):
+    """
+    Return an AdjustedArray of the rows of `head` followed by those of
+    `array`.
+
+    The adjustments of `array` that start at its first row are taken to apply
+    to all data before the row at which they take effect, so they are
+    extended over the rows of `head`.  This is how adjustments from corporate
+    actions are expressed.
+
+    Raises
+    ------
+    TypeError
+        If `array` has adjustments other than Float64Adjustments.
+    """
+    if head.dtype != array.dtype:
+        raise TypeError(
+            "Can't prepend %s rows to %s data." % (head.dtype, array.dtype)
+        )
+    nrows = head.data.shape[0]
+    adjustments = {
+        row: list(row_adjustments)
+        for row, row_adjustments in iteritems(head.adjustments)
+    }
+    for row, row_adjustments in iteritems(array.adjustments):
+        for adjustment in row_adjustments:
+            first_row = adjustment.first_row
+            for column in range(adjustment.first_col,
+                                adjustment.last_col + 1):
+                _add_adjustment(
+                    adjustments,
+                    row + nrows,
+                    _moved_adjustment(
+                        adjustment,
+                        first_row + nrows if first_row else 0,
+                        adjustment.last_row + nrows,
+                        column,
+                    ),
+                )
+    return AdjustedArray(
+        vstack([head.data, array.data]),
+        NOMASK,
+        adjustments,
+    )
+
+
 def _check_window_params(data, window_length):
     """
     Check that a window of length `window_length` is well-defined on `data`.
@@ -9,18 +9,37 @@ from numpy cimport (
     intp_t,
     ndarray,
     NPY_DOUBLE,
+    NPY_INTP,
     NPY_MERGESORT,
+    NPY_QUICKSORT,
     PyArray_ArgSort,
     PyArray_DIMS,
     PyArray_EMPTY,
+    uint8_t,
 )
-from numpy import apply_along_axis, float64, isnan, nan
-from scipy.stats import rankdata
+from numpy import float64, isnan, nan
 
 
 import_array()
 
 
+cdef enum RankMethod:
+    ORDINAL
+    AVERAGE
+    MIN
+    MAX
+    DENSE
+
+
+cdef dict _RANK_METHODS = {
+    'ordinal': ORDINAL,
+    'average': AVERAGE,
+    'min': MIN,
+    'max': MAX,
+    'dense': DENSE,
+}
+
+
 def masked_rankdata_2d(ndarray data,
                        ndarray mask,
                        object missing_value,
@@ -43,54 +62,115 @@ def masked_rankdata_2d(ndarray data,
         missing_locations |= (data == missing_value)
 
     # Interpret the bytes of integral data as floats for sorting.
-    data = data.copy().view(float64)
-    data[missing_locations] = nan
-    if not ascending:
-        data = -data
-
-    # OPTIMIZATION: Fast path the default case with our own specialized
-    # Cython implementation.
-    if method == 'ordinal':
-        result = rankdata_2d_ordinal(data)
-    else:
-        # FUTURE OPTIMIZATION:
-        # Write a less general "apply to rows" method that doesn't do all
-        # the extra work that apply_along_axis does.
-        result = apply_along_axis(rankdata, 1, data, method=method)
-
-    # rankdata will sort missing values into last place, but we want our nans
-    # to propagate, so explicitly re-apply.
-    result[missing_locations] = nan
-    return result
+    return rankdata_2d(
+        data.view(float64),
+        missing_locations,
+        method,
+        ascending,
+    )
 
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
 @cython.embedsignature(True)
-cpdef rankdata_2d_ordinal(ndarray[float64_t, ndim=2] array):
+cpdef rankdata_2d(ndarray[float64_t, ndim=2] array,
+                  ndarray[uint8_t, ndim=2, cast=True] missing,
+                  str method,
+                  bint ascending):
     """
+    Rank each row of `array`, ignoring the entries where `missing` is True.
+
     Equivalent to:
 
-    numpy.apply_over_axis(scipy.stats.rankdata, 1, array, method='ordinal')
+    numpy.apply_along_axis(scipy.stats.rankdata, 1, array, method=method)
+
+    computed over the entries that aren't missing, which get NaN for a rank.
+    If `ascending` is False, ranks are assigned as if `array` were negated.
     """
+    cdef RankMethod rank_method
+    try:
+        rank_method = _RANK_METHODS[method]
+    except KeyError:
+        raise ValueError("Unknown rank method %r." % method)
+
     cdef:
-        int nrows, ncols
+        Py_ssize_t nrows = array.shape[0]
+        Py_ssize_t ncols = array.shape[1]
+        Py_ssize_t i, j, n, nvalid, pos, start, stop, group
+        float64_t value, rank
         ndarray[intp_t, ndim=2] sort_idxs
         ndarray[float64_t, ndim=2] out
-
-    nrows = array.shape[0]
-    ncols = array.shape[1]
-
-    # scipy.stats.rankdata explicitly uses MERGESORT instead of QUICKSORT for
-    # the ordinal branch.  c.f. commit ab21d2fee2d27daca0b2c161bbb7dba7e73e70ba
-    sort_idxs = PyArray_ArgSort(array, 1, NPY_MERGESORT)
+        ndarray[intp_t, ndim=1] order, reordered
+
+    # One sort serves every method.  Only ordinal ranks depend on the order
+    # of tied entries, so scipy.stats.rankdata explicitly uses MERGESORT
+    # instead of QUICKSORT for the ordinal branch.
+    # c.f. commit ab21d2fee2d27daca0b2c161bbb7dba7e73e70ba
+    sort_idxs = PyArray_ArgSort(
+        array,
+        1,
+        NPY_MERGESORT if rank_method == ORDINAL else NPY_QUICKSORT,
+    )
 
     # Roughly, "out = np.empty_like(array)"
     out = PyArray_EMPTY(2, PyArray_DIMS(array), NPY_DOUBLE, False)
+    order = PyArray_EMPTY(1, &PyArray_DIMS(array)[1], NPY_INTP, False)
+    reordered = PyArray_EMPTY(1, &PyArray_DIMS(array)[1], NPY_INTP, False)
 
-    cdef intp_t i, j
     for i in range(nrows):
+        # Collect the non-missing entries of the row in sorted order.
+        n = 0
         for j in range(ncols):
-            out[i, sort_idxs[i, j]] = j + 1.0
+            if missing[i, sort_idxs[i, j]]:
+                out[i, sort_idxs[i, j]] = nan
+            else:
+                order[n] = sort_idxs[i, j]
+                n += 1
+
+        if not ascending:
+            # Reverse the order of the runs of equal values, keeping the
+            # order within each run so that ordinal ranks match a stable sort
+            # of the negated values.  NaNs are sorted last either way.
+            nvalid = n
+            while nvalid and array[i, order[nvalid - 1]] != \
+                    array[i, order[nvalid - 1]]:
+                nvalid -= 1
+            pos = 0
+            stop = nvalid
+            while stop:
+                start = stop - 1
+                value = array[i, order[start]]
+                while start and array[i, order[start - 1]] == value:
+                    start -= 1
+                for j in range(start, stop):
+                    reordered[pos] = order[j]
+                    pos += 1
+                stop = start
+            for j in range(nvalid, n):
+                reordered[j] = order[j]
+            order, reordered = reordered, order
+
+        group = 0
+        start = 0
+        while start < n:
+            value = array[i, order[start]]
+            stop = start + 1
+            while stop < n and array[i, order[stop]] == value:
+                stop += 1
+            group += 1
+
+            if rank_method == AVERAGE:
+                rank = (start + stop + 1) / 2.0
+            elif rank_method == MIN:
+                rank = start + 1
+            elif rank_method == MAX:
+                rank = stop
+            elif rank_method == DENSE:
+                rank = group
+            for j in range(start, stop):
+                if rank_method == ORDINAL:
+                    rank = j + 1
+                out[i, order[j]] = rank
+            start = stop
 
     return out
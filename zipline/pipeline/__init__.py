@@ -1,8 +1,9 @@
 from __future__ import print_function
 from zipline.assets import AssetFinder
 
+from .cache import PipelineResultCache
 from .classifier import Classifier
-from .engine import SimplePipelineEngine
+from .engine import PipelineArrays, SimplePipelineEngine
 from .factors import Factor, CustomFactor
 from .filters import Filter
 from .term import Term
@@ -15,7 +16,9 @@ def engine_from_files(daily_bar_path,
                       adjustments_path,
                       asset_db_path,
                       calendar,
-                      warmup_assets=False):
+                      warmup_assets=False,
+                      cache_path=None,
+                      workers=1):
     """
     Construct a SimplePipelineEngine from local filesystem resources.
 
@@ -33,6 +36,12 @@ def engine_from_files(daily_bar_path,
         Whether or not to populate AssetFinder caches.  This can speed up
         initial latency on subsequent pipeline runs, at the cost of extra
         memory consumption.  Default is False
+    cache_path : str, optional
+        Directory in which to cache the results of pipelines, so that
+        running a pipeline again over the same dates reads the results from
+        disk.  Default is None, meaning results aren't cached.
+    workers : int, optional
+        The number of threads used to compute terms.  Default is 1.
     """
     loader = USEquityPricingLoader.from_files(daily_bar_path, adjustments_path)
 
@@ -47,6 +56,10 @@ def engine_from_files(daily_bar_path,
         lambda _: loader,
         calendar,
         asset_finder,
+        result_cache=(
+            PipelineResultCache(cache_path) if cache_path is not None else None
+        ),
+        workers=workers,
     )
 
 
@@ -57,6 +70,8 @@ __all__ = (
     'Factor',
     'Filter',
     'Pipeline',
+    'PipelineArrays',
+    'PipelineResultCache',
     'SimplePipelineEngine',
     'Term',
     'TermGraph',
@@ -0,0 +1,340 @@
+"""
+On-disk cache of Pipeline results.
+
+Research workflows tend to run the same pipeline over the same dates many
+times, each run recomputing every term from raw data.  A
+``PipelineResultCache`` stores the frame produced by
+``SimplePipelineEngine.run_pipeline`` under a key derived from the pipeline's
+terms, the loaders that feed them and the trading calendar, so that a later
+run over the same or a narrower date range is read back from disk instead.
+
+Results are only cached when every loader used by the pipeline declares a
+``cache_identity``; loaders which can't name the data they serve opt out by
+leaving it as None.  The asset database is not part of the key, so a cache
+should be cleared when the assets it was built with change.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from numpy import (
+    array,
+    dtype as dtype_class,
+    empty,
+    int64 as int64_dtype,
+    load,
+    save,
+    unique,
+)
+from pandas import DataFrame, MultiIndex
+from six import iteritems
+
+from .term import AssetExists, Term
+
+_METADATA_FILENAME = 'metadata.json'
+_DATES_FILENAME = 'dates.npy'
+_SIDS_FILENAME = 'sids.npy'
+
+
+class Uncacheable(Exception):
+    """
+    Raised when a pipeline can't be given a stable cache key.
+    """
+
+
+def _code_token(func):
+    """
+    Summarize the bytecode of a function, so that editing the ``compute`` of
+    a CustomFactor invalidates the results cached for it.
+    """
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return ''
+    consts = [c for c in code.co_consts if not hasattr(c, 'co_code')]
+    return hashlib.sha1(
+        code.co_code + repr((consts, code.co_names)).encode('utf-8')
+    ).hexdigest()
+
+
+def _class_token(cls):
+    name = '.'.join(
+        [cls.__module__, getattr(cls, '__qualname__', cls.__name__)]
+    )
+    compute = cls.__dict__.get('compute')
+    if compute is not None:
+        name += ':' + _code_token(compute)
+    return name
+
+
+def _identity_token(obj, memo):
+    if isinstance(obj, Term):
+        try:
+            return memo[obj]
+        except KeyError:
+            pass
+        try:
+            identity = obj._static_identity
+        except AttributeError:
+            raise Uncacheable("%r has no static identity." % obj)
+        token = memo[obj] = _identity_token(identity, memo)
+        return token
+    if isinstance(obj, type):
+        return _class_token(obj)
+    if isinstance(obj, dtype_class):
+        return obj.str
+    if isinstance(obj, (tuple, list)):
+        return '(%s)' % ', '.join(_identity_token(o, memo) for o in obj)
+
+    token = repr(obj)
+    if ' at 0x' in token:
+        # The default repr contains the address of the object, which isn't
+        # stable between runs.
+        raise Uncacheable("%r has no stable representation." % obj)
+    return token
+
+
+def term_fingerprint(term, memo=None):
+    """
+    Compute a string identifying ``term`` which is the same in every process.
+
+    Terms are memoized on their ``static_identity``; the fingerprint is built
+    from the same identity, with classes replaced by their qualified names and
+    input terms replaced by their own fingerprints.
+
+    Parameters
+    ----------
+    term : zipline.pipeline.term.Term
+        The term to fingerprint.
+    memo : dict, optional
+        Fingerprints of already visited terms.
+
+    Returns
+    -------
+    fingerprint : str
+
+    Raises
+    ------
+    Uncacheable
+        Raised if some part of the identity of ``term`` has no stable
+        representation.
+    """
+    return _identity_token(term, {} if memo is None else memo)
+
+
+def pipeline_cache_key(graph, screen_name, get_loader, calendar):
+    """
+    Compute the key under which the results of a pipeline are cached.
+
+    Parameters
+    ----------
+    graph : zipline.pipeline.graph.TermGraph
+        The graph of the pipeline.
+    screen_name : str
+        The name of the screen among the outputs of ``graph``.
+    get_loader : callable
+        Function returning the loader of an atomic term.
+    calendar : pd.DatetimeIndex
+        The trading calendar the pipeline is run against.
+
+    Returns
+    -------
+    key : str or None
+        A hex digest, or None if the results of the pipeline can't be cached.
+    """
+    memo = {}
+    try:
+        outputs = sorted(
+            (name, term_fingerprint(term, memo))
+            for name, term in iteritems(graph.outputs)
+            if name != screen_name
+        )
+        screen = term_fingerprint(graph.outputs[screen_name], memo)
+    except Uncacheable:
+        return None
+
+    loaders = set()
+    for term in graph.atomic_terms:
+        if term is AssetExists():
+            continue
+        identity = getattr(get_loader(term), 'cache_identity', None)
+        if identity is None:
+            return None
+        loaders.add(repr(identity))
+
+    sha = hashlib.sha1()
+    sha.update(repr((outputs, screen, sorted(loaders))).encode('utf-8'))
+    sha.update(calendar.values.view(int64_dtype).tobytes())
+    return sha.hexdigest()
+
+
+class PipelineResultCache(object):
+    """
+    A directory of cached Pipeline results.
+
+    Each entry holds the results for a key over a range of dates.  The
+    results are stored by column, one ``.npy`` file per column of the frame
+    plus one each for the dates and sids of its index, and are memory mapped
+    when read so that a narrower query only reads the rows it returns.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the cache.  It is created if it doesn't exist.
+    """
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.path)
+
+    def _entries(self, key):
+        """
+        Yield the (start, end, path) of the entries stored for ``key``.
+        """
+        keydir = os.path.join(self.path, key)
+        if not os.path.isdir(keydir):
+            return
+        for name in os.listdir(keydir):
+            start, sep, end = name.partition('_')
+            if not (sep and start.isdigit() and end.isdigit()):
+                # A partially written entry.
+                continue
+            yield int(start), int(end), os.path.join(keydir, name)
+
+    def get(self, key, start_date, end_date, finder):
+        """
+        Read the cached results for ``key`` between ``start_date`` and
+        ``end_date``.
+
+        Parameters
+        ----------
+        key : str
+            The key of the pipeline.
+        start_date : pd.Timestamp
+            The first date of the results.
+        end_date : pd.Timestamp
+            The last date of the results.
+        finder : zipline.assets.AssetFinder
+            The finder used to look up the assets of the results.
+
+        Returns
+        -------
+        results : pd.DataFrame or None
+            The results of the pipeline, or None if no entry covers the
+            requested dates.
+        """
+        start, end = start_date.value, end_date.value
+        covering = [
+            (entry_end - entry_start, path)
+            for entry_start, entry_end, path in self._entries(key)
+            if entry_start <= start and end <= entry_end
+        ]
+        if not covering:
+            return None
+        _, path = min(covering)
+
+        with open(os.path.join(path, _METADATA_FILENAME)) as f:
+            metadata = json.load(f)
+
+        dates = load(os.path.join(path, _DATES_FILENAME), mmap_mode='r')
+        lo = dates.searchsorted(start, 'left')
+        hi = dates.searchsorted(end, 'right')
+        dates_kept = array(dates[lo:hi]).view('datetime64[ns]')
+
+        sids = load(os.path.join(path, _SIDS_FILENAME), mmap_mode='r')
+        unique_sids, positions = unique(sids[lo:hi], return_inverse=True)
+        resolved_assets = empty(len(unique_sids), dtype=object)
+        resolved_assets[:] = finder.retrieve_all(unique_sids)
+        assets_kept = resolved_assets[positions]
+
+        data = {}
+        for i, name in enumerate(metadata['columns']):
+            column = load(os.path.join(path, 'c%d.npy' % i), mmap_mode='r')
+            data[name] = array(column[lo:hi])
+
+        return DataFrame(
+            data=data,
+            index=MultiIndex.from_arrays([dates_kept, assets_kept]),
+            columns=metadata['columns'],
+        ).tz_localize('UTC', level=0)
+
+    def put(self, key, start_date, end_date, results):
+        """
+        Store the results of a pipeline.
+
+        Parameters
+        ----------
+        key : str
+            The key of the pipeline.
+        start_date : pd.Timestamp
+            The first date of the results.
+        end_date : pd.Timestamp
+            The last date of the results.
+        results : pd.DataFrame
+            The frame returned by ``SimplePipelineEngine.run_pipeline``.
+
+        Returns
+        -------
+        stored : bool
+            Whether the results were stored.  Results with object columns
+            aren't stored.
+        """
+        columns = list(results.columns)
+        if any(results[c].dtype == object for c in columns):
+            return False
+
+        keydir = os.path.join(self.path, key)
+        if not os.path.isdir(keydir):
+            try:
+                os.makedirs(keydir)
+            except OSError:
+                # Another process created it first.
+                if not os.path.isdir(keydir):
+                    raise
+
+        # Write to a scratch directory first so that readers never see a
+        # partially written entry.
+        tmpdir = tempfile.mkdtemp(prefix='tmp', dir=keydir)
+        try:
+            index = results.index
+            save(
+                os.path.join(tmpdir, _DATES_FILENAME),
+                index.get_level_values(0).values.view(int64_dtype),
+            )
+            save(
+                os.path.join(tmpdir, _SIDS_FILENAME),
+                array(
+                    [int(asset) for asset in index.get_level_values(1)],
+                    dtype=int64_dtype,
+                ),
+            )
+            for i, name in enumerate(columns):
+                save(
+                    os.path.join(tmpdir, 'c%d.npy' % i),
+                    results[name].values,
+                )
+            with open(os.path.join(tmpdir, _METADATA_FILENAME), 'w') as f:
+                json.dump({'columns': columns}, f)
+
+            path = os.path.join(
+                keydir, '%d_%d' % (start_date.value, end_date.value),
+            )
+            if os.path.exists(path):
+                shutil.rmtree(tmpdir)
+            else:
+                os.rename(tmpdir, path)
+        except Exception:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise
+        return True
+
+    def clear(self):
+        """
+        Remove every entry of the cache.
+        """
+        for name in os.listdir(self.path):
+            shutil.rmtree(os.path.join(self.path, name))
@@ -5,14 +5,26 @@ from abc import (
     ABCMeta,
     abstractmethod,
 )
+from collections import namedtuple
+from functools import partial
+from heapq import heapify, heappop, heappush
+import multiprocessing
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
+from sys import exc_info, platform
 from uuid import uuid4
 
+from logbook import Logger
 from six import (
     iteritems,
+    itervalues,
+    reraise,
     with_metaclass,
 )
-from numpy import array
+from six.moves.queue import Empty, Queue
+from numpy import concatenate, empty, int64, vstack
 from pandas import (
+    concat,
     DataFrame,
     date_range,
     MultiIndex,
@@ -20,13 +32,146 @@ from pandas import (
 from toolz import groupby, juxt
 from toolz.curried.operator import getitem
 
-from zipline.lib.adjusted_array import ensure_ndarray
+from zipline.lib.adjusted_array import (
+    AdjustedArray,
+    ensure_ndarray,
+    NOMASK,
+    prepend_rows,
+    take_columns,
+    trailing_rows,
+)
 from zipline.errors import NoFurtherDataError
-from zipline.utils.numpy_utils import repeat_first_axis, repeat_last_axis
+from zipline.utils.control_flow import WarningContext
 from zipline.utils.pandas_utils import explode
 
+from .cache import pipeline_cache_key
 from .term import AssetExists
 
+log = Logger('Pipeline')
+
+
+_OUTPUT_FORMATS = ('narrow', 'wide', 'arrays')
+
+
+class PipelineArrays(namedtuple('PipelineArrays', [
+    'dates', 'assets', 'screen', 'columns',
+])):
+    """
+    The results of a pipeline as computed, without building a DataFrame.
+
+    Attributes
+    ----------
+    dates : pd.DatetimeIndex
+        The row labels of the arrays.
+    assets : np.ndarray[object]
+        The Assets labelling the columns of the arrays.
+    screen : np.ndarray[bool]
+        Whether each asset passed the screen of the pipeline on each date.
+    columns : dict[str -> np.ndarray]
+        The computed values of each column of the pipeline.  Values for
+        which `screen` is False aren't meaningful.
+    """
+    __slots__ = ()
+
+    def cross_section(self, date):
+        """
+        Return the results for `date` as a DataFrame indexed by the assets
+        which passed the screen on that date.
+        """
+        row = self.dates.get_loc(date)
+        kept = self.screen[row]
+        return DataFrame(
+            data={
+                name: arr[row, kept] for name, arr in iteritems(self.columns)
+            },
+            index=self.assets[kept],
+        )
+
+
+def _nbytes(value):
+    return ensure_ndarray(value).nbytes
+
+
+def _compute_after_rows(head, term, inputs, dates, assets, mask):
+    """
+    Compute `term` for `dates`, following the already computed rows `head`.
+    """
+    return vstack([head, term._compute(inputs, dates, assets, mask)])
+
+
+def _run_computation(term, computation):
+    """
+    Run the computation of `term`, capturing any exception so that it can be
+    re-raised by the thread scheduling terms.
+    """
+    try:
+        return term, computation(), None
+    except Exception:
+        return term, None, exc_info()
+
+
+def _needs_scheduling_thread(term):
+    """
+    Whether `term` must be computed on the thread scheduling terms.
+
+    This is the case for terms which aren't thread-safe, such as those
+    evaluated with numexpr, and for terms which enter a context changing the
+    process-wide warning filters, since ``warnings.catch_warnings`` isn't
+    thread-safe either.
+    """
+    return (
+        not getattr(term, 'thread_safe', True) or
+        isinstance(getattr(term, 'ctx', None), WarningContext)
+    )
+
+
+# The engine and pipeline of a parallel run, set by the initializer of each
+# worker.  The workers are forked, so the initializer's arguments are
+# inherited by the worker processes rather than pickled.
+_parallel_engine = None
+_parallel_pipeline = None
+
+
+def _fork_pool(*args, **kwargs):
+    """
+    Create a process pool whose workers are forked from this process.
+
+    Raises
+    ------
+    ValueError
+        Raised if processes can't be forked on this platform.
+    """
+    get_context = getattr(multiprocessing, 'get_context', None)
+    if get_context is None:
+        # Python 2 always forks, except on Windows.
+        if platform == 'win32':
+            raise ValueError(
+                "run_pipeline_parallel needs to fork processes, which isn't "
+                "supported on %s." % platform
+            )
+        return multiprocessing.Pool(*args, **kwargs)
+    try:
+        context = get_context('fork')
+    except ValueError:
+        raise ValueError(
+            "run_pipeline_parallel needs to fork processes, which isn't "
+            "supported on %s." % platform
+        )
+    return context.Pool(*args, **kwargs)
+
+
+def _init_parallel_worker(engine, pipeline):
+    global _parallel_engine, _parallel_pipeline
+    _parallel_engine = engine
+    _parallel_pipeline = pipeline
+
+
+def _run_parallel_chunk(dates):
+    start_date, end_date = dates
+    return _parallel_engine.run_pipeline(
+        _parallel_pipeline, start_date, end_date,
+    )
+
 
 class PipelineEngine(with_metaclass(ABCMeta)):
 
@@ -91,22 +236,64 @@ class SimplePipelineEngine(object):
     asset_finder : zipline.assets.AssetFinder
         An AssetFinder instance.  We depend on the AssetFinder to determine
         which assets are in the top-level universe at any point in time.
+    result_cache : zipline.pipeline.cache.PipelineResultCache, optional
+        A cache of the results of previous runs.  Pipelines whose loaders all
+        declare a `cache_identity` are read from the cache when a stored run
+        covers the requested dates, and stored in it otherwise.
+    workers : int, optional
+        The number of threads used to compute terms.  Terms whose inputs are
+        available are computed concurrently, while data is always loaded
+        from the calling thread, as are terms which aren't thread-safe, such
+        as arithmetic expressions evaluated with numexpr, and terms which
+        change the warning filters, such as SimpleMovingAverage.  The
+        results don't depend on the number of workers.  Default is 1,
+        meaning terms are computed one at a time.
+
+    Notes
+    -----
+    The engine keeps the trailing rows of the terms that windowed terms need
+    as lookback, so that when the next chunk starts right after the previous
+    one, only the new dates are loaded and computed.  Loaded data is only
+    kept from loaders that set `carry_rows`.
     """
     __slots__ = [
         '_get_loader',
         '_calendar',
         '_finder',
         '_root_mask_term',
+        '_result_cache',
+        '_workers',
+        '_carried',
+        '_peak_workspace_bytes',
+        '_resolved_assets',
+        '_root_mask_cache',
         '__weakref__',
     ]
 
-    def __init__(self, get_loader, calendar, asset_finder):
+    def __init__(self,
+                 get_loader,
+                 calendar,
+                 asset_finder,
+                 result_cache=None,
+                 workers=1):
+        if workers < 1:
+            raise ValueError(
+                "workers must be at least 1, got %r" % (workers,)
+            )
         self._get_loader = get_loader
         self._calendar = calendar
         self._finder = asset_finder
         self._root_mask_term = AssetExists()
+        self._result_cache = result_cache
+        self._workers = workers
+        self._carried = {}
+        self._peak_workspace_bytes = 0
+        self._resolved_assets = (
+            empty(0, dtype=int64), empty(0, dtype=object),
+        )
+        self._root_mask_cache = None
 
-    def run_pipeline(self, pipeline, start_date, end_date):
+    def run_pipeline(self, pipeline, start_date, end_date, output='narrow'):
         """
         Compute a pipeline.
 
@@ -118,6 +305,12 @@ class SimplePipelineEngine(object):
             Start date of the computed matrix.
         end_date : pd.Timestamp
             End date of the computed matrix.
+        output : {'narrow', 'wide', 'arrays'}, optional
+            The format of the results.  'narrow', the default, produces a
+            DataFrame with a MultiIndex of (date, asset) pairs.  'wide'
+            produces a DataFrame indexed by date, with a column per
+            (name, sid) pair.  'arrays' produces a `PipelineArrays` of the
+            computed 2D arrays.  Only narrow results are cached.
 
         The algorithm implemented here can be broken down into the following
         stages:
@@ -157,9 +350,29 @@ class SimplePipelineEngine(object):
                 "start_date must be before or equal to end_date \n"
                 "start_date=%s, end_date=%s" % (start_date, end_date)
             )
+        if output not in _OUTPUT_FORMATS:
+            raise ValueError(
+                "output must be one of %s, got %r" % (
+                    ', '.join(map(repr, _OUTPUT_FORMATS)), output,
+                )
+            )
 
         screen_name = uuid4().hex
         graph = pipeline.to_graph(screen_name, self._root_mask_term)
+
+        cache = self._result_cache
+        cache_key = None
+        if cache is not None and output == 'narrow':
+            cache_key = pipeline_cache_key(
+                graph, screen_name, self.get_loader, self._calendar,
+            )
+            if cache_key is not None:
+                cached = cache.get(
+                    cache_key, start_date, end_date, self._finder,
+                )
+                if cached is not None:
+                    return cached
+
         extra_rows = graph.extra_rows[self._root_mask_term]
         root_mask = self._compute_root_mask(start_date, end_date, extra_rows)
         dates, assets, root_mask_values = explode(root_mask)
@@ -174,7 +387,106 @@ class SimplePipelineEngine(object):
         out_dates = dates[extra_rows:]
         screen_values = outputs.pop(screen_name)
 
-        return self._to_narrow(outputs, screen_values, out_dates, assets)
+        if output == 'arrays':
+            return PipelineArrays(
+                out_dates,
+                self._resolve_assets(assets),
+                screen_values,
+                outputs,
+            )
+        elif output == 'wide':
+            return self._to_wide(outputs, screen_values, out_dates, assets)
+
+        results = self._to_narrow(outputs, screen_values, out_dates, assets)
+        if cache_key is not None:
+            cache.put(cache_key, start_date, end_date, results)
+        return results
+
+    def run_pipeline_parallel(self,
+                              pipeline,
+                              start_date,
+                              end_date,
+                              chunksize,
+                              workers=None):
+        """
+        Compute a pipeline in chunks of dates in a pool of processes.
+
+        Parameters
+        ----------
+        pipeline : zipline.pipeline.Pipeline
+            The pipeline to run.
+        start_date : pd.Timestamp
+            Start date of the computed matrix.
+        end_date : pd.Timestamp
+            End date of the computed matrix.
+        chunksize : int
+            The number of trading days computed at a time.
+        workers : int, optional
+            The number of worker processes.  Defaults to the number of CPUs.
+
+        Returns
+        -------
+        results : pd.DataFrame
+            The same frame as is returned by `run_pipeline`.
+
+        Raises
+        ------
+        ValueError
+            Raised if `workers` is more than 1 and processes can't be forked
+            on this platform.
+
+        Notes
+        -----
+        Each chunk is computed by `run_pipeline` with its own lookback, and
+        each worker is given consecutive chunks so that it can reuse the
+        rows kept from its previous chunk.  The worker processes are always
+        forked from this one, whatever the default start method, and inherit
+        the engine and the pipeline, which are therefore not pickled.  This
+        means that loaders holding open files or database connections can be
+        used, but that more than one worker is unsupported on platforms which
+        can't fork, such as Windows.
+
+        See Also
+        --------
+        SimplePipelineEngine.run_pipeline
+        """
+        if chunksize < 1:
+            raise ValueError(
+                "chunksize must be at least 1, got %r" % (chunksize,)
+            )
+
+        calendar = self._calendar
+        start_idx, end_idx = calendar.slice_locs(start_date, end_date)
+        chunks = [
+            (calendar[i], calendar[min(i + chunksize, end_idx) - 1])
+            for i in range(start_idx, end_idx, chunksize)
+        ]
+        if len(chunks) < 2:
+            return self.run_pipeline(pipeline, start_date, end_date)
+
+        if workers is None:
+            workers = cpu_count()
+        if workers == 1:
+            results = [
+                self.run_pipeline(pipeline, chunk_start, chunk_end)
+                for chunk_start, chunk_end in chunks
+            ]
+        else:
+            pool = _fork_pool(
+                workers,
+                initializer=_init_parallel_worker,
+                initargs=(self, pipeline),
+            )
+            try:
+                results = pool.map(
+                    _run_parallel_chunk,
+                    chunks,
+                    chunksize=-(-len(chunks) // workers),
+                )
+            finally:
+                pool.close()
+                pool.join()
+        return concat(results)
 
     def _compute_root_mask(self, start_date, end_date, extra_rows):
         """
@@ -202,7 +514,6 @@ class SimplePipelineEngine(object):
             `end_date`.
         """
         calendar = self._calendar
-        finder = self._finder
         start_idx, end_idx = self._calendar.slice_locs(start_date, end_date)
         if start_idx < extra_rows:
             raise NoFurtherDataError(
@@ -215,11 +526,42 @@ class SimplePipelineEngine(object):
             )
 
         # Build lifetimes matrix reaching back to `extra_rows` days before
-        # `start_date.`
-        lifetimes = finder.lifetimes(
-            calendar[start_idx - extra_rows:end_idx],
-            include_start_date=False
-        )
+        # `start_date.`  The matrix is kept so that chunks within its dates,
+        # such as reruns over the same dates, reuse it, and that the next
+        # chunk, which usually overlaps it in its lookback rows, only computes
+        # the dates it doesn't cover.
+        first_idx = start_idx - extra_rows
+        cached = self._root_mask_cache
+        if (cached is not None and
+                cached[0] < end_idx and first_idx < cached[1]):
+            cached_first_idx, cached_end_idx, cached_lifetimes = cached
+            parts = [
+                cached_lifetimes.iloc[
+                    max(first_idx, cached_first_idx) - cached_first_idx:
+                    min(end_idx, cached_end_idx) - cached_first_idx
+                ],
+            ]
+            if first_idx < cached_first_idx:
+                parts.insert(
+                    0, self._lifetimes(first_idx, cached_first_idx),
+                )
+            if cached_end_idx < end_idx:
+                parts.append(self._lifetimes(cached_end_idx, end_idx))
+            if len(parts) == 1:
+                lifetimes = parts[0]
+            else:
+                # Each part only has the assets alive during its dates.
+                columns = parts[0].columns
+                for part in parts[1:]:
+                    columns = columns.union(part.columns)
+                lifetimes = concat([
+                    part.reindex(columns=columns, fill_value=False)
+                    for part in parts
+                ])
+                self._root_mask_cache = (first_idx, end_idx, lifetimes)
+        else:
+            lifetimes = self._lifetimes(first_idx, end_idx)
+            self._root_mask_cache = (first_idx, end_idx, lifetimes)
 
         assert lifetimes.index[extra_rows] == start_date
         assert lifetimes.index[-1] == end_date
@@ -230,47 +572,69 @@ class SimplePipelineEngine(object):
 
         # Filter out columns that didn't exist between the requested start and
         # end dates.
-        existed = lifetimes.iloc[extra_rows:].any()
+        existed = lifetimes.values[extra_rows:].any(axis=0)
         ret = lifetimes.loc[:, existed]
         shape = ret.shape
         assert shape[0] * shape[1] != 0, 'root mask cannot be empty'
         return ret
 
+    def _lifetimes(self, first_idx, end_idx):
+        """
+        Compute the lifetimes matrix of the calendar dates from `first_idx` up
+        to `end_idx`.
+
+        Only the assets which existed around these dates are included, rather
+        than every asset in the finder.
+        """
+        return self._finder.lifetimes(
+            self._calendar[first_idx:end_idx],
+            include_start_date=False,
+            only_alive=True,
+        )
+
     def _mask_and_dates_for_term(self, term, workspace, graph, dates):
         """
         Load mask and mask row labels for term.
         """
-        mask = term.mask
-        offset = graph.extra_rows[mask] - graph.extra_rows[term]
-        return workspace[mask][offset:], dates[offset:]
+        mask = graph.computed_term(term).mask
+        extra_rows = graph.extra_rows
+        mask_offset = extra_rows[mask] - extra_rows[term]
+        # `dates` are the labels of the rows of the root mask, which may be
+        # more than the rows of `mask`.
+        dates_offset = extra_rows[self._root_mask_term] - extra_rows[term]
+        return workspace[mask][mask_offset:], dates[dates_offset:]
 
     @staticmethod
-    def _inputs_for_term(term, workspace, graph):
+    def _inputs_for_term(term, workspace, graph, skip_rows=0):
         """
         Compute inputs for the given term.
 
         This is mostly complicated by the fact that for each input we store as
         many rows as will be necessary to serve **any** computation requiring
         that input.
+
+        If `skip_rows` is given, the inputs are for computing all but the
+        first `skip_rows` rows of `term`.
         """
         offsets = graph.offset
+        inputs = graph.computed_term(term).inputs
         if term.windowed:
             # If term is windowed, then all input data should be instances of
             # AdjustedArray.
             return [
                 workspace[input_].traverse(
                     window_length=term.window_length,
-                    offset=offsets[term, input_]
+                    offset=offsets[term, input_] + skip_rows,
                 )
-                for input_ in term.inputs
+                for input_ in inputs
             ]
 
         # If term is not windowed, input_data may be an AdjustedArray or
         # np.ndarray.  Coerce the former to the latter.
         out = []
-        for input_ in term.inputs:
+        for input_ in inputs:
             input_data = ensure_ndarray(workspace[input_])
-            offset = offsets[term, input_]
+            offset = offsets[term, input_] + skip_rows
             # OPTIMIZATION: Don't make a copy by doing input_data[0:] if
             # offset is zero.
             if offset:
@@ -321,38 +685,136 @@ class SimplePipelineEngine(object):
         atomic_group_key = juxt(get_loader, getitem(graph.extra_rows))
         atomic_groups = groupby(atomic_group_key, graph.atomic_terms)
 
-        for term in graph.ordered():
-            # `term` may have been supplied in `initial_workspace`, and in the
-            # future we may pre-compute atomic terms coming from the same
-            # dataset.  In either case, we will already have an entry for this
-            # term, which we shouldn't re-compute.
-            if term in workspace:
-                continue
-
-            # Asset labels are always the same, but date labels vary by how
-            # many extra rows are needed.
-            mask, mask_dates = self._mask_and_dates_for_term(
-                term, workspace, graph, dates
-            )
+        # Release each term once every term that depends on it is computed,
+        # so that the workspace only holds the terms still needed.
+        root_mask_term = self._root_mask_term
+        outputs = set(itervalues(graph.outputs))
+        consumers = {term: graph.out_degree(term) for term in graph}
+        carried = {}
+        carry = {root_mask_term: True}
 
-            if term.atomic:
-                to_load = sorted(
-                    atomic_groups[atomic_group_key(term)],
-                    key=lambda t: t.dataset
-                )
-                loader = get_loader(term)
-                loaded = loader.load_adjusted_array(
-                    to_load, mask_dates, assets, mask,
-                )
-                workspace.update(loaded)
-            else:
-                workspace[term] = term._compute(
-                    self._inputs_for_term(term, workspace, graph),
-                    mask_dates,
-                    assets,
-                    mask,
+        workspace_bytes = sum(map(_nbytes, itervalues(workspace)))
+        peak_bytes = workspace_bytes
+
+        # Terms are started in the order given by `graph.ordered()` once all
+        # of their dependencies are in the workspace.  Without a pool, each
+        # term is finished before the next one is started.
+        position = {term: i for i, term in enumerate(graph.ordered())}
+        waiting = {term: set(graph.predecessors(term)) for term in position}
+        ready = [(i, term) for term, i in iteritems(position)
+                 if not waiting[term]]
+        heapify(ready)
+        results = Queue()
+        running = 0
+
+        pool = ThreadPool(self._workers) if self._workers > 1 else None
+        try:
+            while ready or running:
+                try:
+                    # Store finished terms before starting new ones.
+                    finished = results.get(block=not ready)
+                except Empty:
+                    finished = None
+
+                if finished is not None:
+                    term, value, error = finished
+                    running -= 1
+                    if error is not None:
+                        reraise(*error)
+                    mask, _ = self._mask_and_dates_for_term(
+                        term, workspace, graph, dates
+                    )
+                    assert value.shape == mask.shape
+                    workspace[term] = value
+                    workspace_bytes += _nbytes(value)
+                else:
+                    _, term = heappop(ready)
+                    # `term` may have been supplied in `initial_workspace`,
+                    # or loaded together with another atomic term.  In either
+                    # case, we will already have an entry for this term, which
+                    # we shouldn't re-compute.
+                    if term not in workspace:
+                        # Asset labels are always the same, but date labels
+                        # vary by how many extra rows are needed.
+                        mask, mask_dates = self._mask_and_dates_for_term(
+                            term, workspace, graph, dates
+                        )
+
+                        if not term.atomic:
+                            # Inputs are read from the workspace here, so the
+                            # computation doesn't see later changes to it.
+                            args = (term, self._term_computation(
+                                term, workspace, graph, mask_dates, assets,
+                                mask,
+                            ))
+                            if pool is None or _needs_scheduling_thread(term):
+                                results.put(_run_computation(*args))
+                            else:
+                                pool.apply_async(
+                                    _run_computation,
+                                    args,
+                                    callback=results.put,
+                                )
+                            running += 1
+                            continue
+
+                        # Loaders aren't required to be thread-safe, so data
+                        # is always loaded from this thread.
+                        to_load = sorted(
+                            atomic_groups[atomic_group_key(term)],
+                            key=lambda t: t.dataset
+                        )
+                        loader = get_loader(term)
+                        loaded = self._load_atomic_terms(
+                            loader, to_load, mask_dates, assets, mask,
+                        )
+                        workspace.update(loaded)
+                        workspace_bytes += sum(
+                            map(_nbytes, itervalues(loaded))
+                        )
+                peak_bytes = max(peak_bytes, workspace_bytes)
+
+                if term not in carry:
+                    carry[term] = self._carries_rows(
+                        term, carry, graph, initial_workspace,
+                    )
+
+                for dep in graph.predecessors(term):
+                    consumers[dep] -= 1
+                    if (consumers[dep] or
+                            dep in outputs or
+                            dep is root_mask_term):
+                        continue
+                    value = workspace.pop(dep)
+                    workspace_bytes -= _nbytes(value)
+                    if carry[dep]:
+                        self._keep_trailing_rows(
+                            carried, graph, dep, value, dates, assets,
+                        )
+
+                for consumer in graph.successors(term):
+                    waiting[consumer].discard(term)
+                    if not waiting[consumer]:
+                        heappush(ready, (position[consumer], consumer))
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+        for term in outputs:
+            if carry[term]:
+                self._keep_trailing_rows(
+                    carried, graph, term, workspace[term], dates, assets,
                 )
-                assert(workspace[term].shape == mask.shape)
+        self._carried = carried
+        self._peak_workspace_bytes = peak_bytes
+        log.debug(
+            "Computed pipeline chunk of {ndates} dates and {nassets} assets "
+            "with a peak workspace of {nbytes} bytes.",
+            ndates=len(dates),
+            nassets=len(assets),
+            nbytes=peak_bytes,
+        )
 
         out = {}
         graph_extra_rows = graph.extra_rows
@@ -361,6 +823,165 @@ class SimplePipelineEngine(object):
             out[name] = workspace[term][graph_extra_rows[term]:]
         return out
 
+    def _carried_rows(self, term, dates):
+        """
+        Look up the rows of `term` kept from the previous chunk which are the
+        first rows of `term` for `dates`.
+
+        Returns
+        -------
+        carried : (int, pd.Int64Index, AdjustedArray or np.ndarray) or None
+            The number of rows kept for `dates`, the assets of the kept rows,
+            and the kept rows, or None if the previous chunk didn't end within
+            `dates`.
+        """
+        try:
+            carried_dates, carried_assets, value = self._carried[term]
+        except KeyError:
+            return None
+
+        start = carried_dates.searchsorted(dates[0])
+        nrows = len(carried_dates) - start
+        if not 0 < nrows < len(dates):
+            return None
+        if not carried_dates[start:].equals(dates[:nrows]):
+            return None
+        return nrows, carried_assets, value
+
+    def _load_atomic_terms(self, loader, columns, dates, assets, mask):
+        """
+        Load `columns` for `dates`, reusing the rows kept from the previous
+        chunk if they cover the first of `dates`.
+        """
+        if getattr(loader, 'carry_rows', False):
+            heads = {}
+            nrows = None
+            for column in columns:
+                carried = self._carried_rows(column, dates)
+                if carried is None or nrows not in (None, carried[0]):
+                    heads = None
+                    break
+                nrows, carried_assets, value = carried
+                if value.data.shape[0] > nrows:
+                    value = trailing_rows(value, nrows)
+                if not carried_assets.equals(assets):
+                    indexer = carried_assets.get_indexer(assets)
+                    # Assets that weren't in the previous chunk can only be
+                    # filled in if they didn't exist on the carried dates.
+                    if mask[:nrows, indexer == -1].any():
+                        heads = None
+                        break
+                    value = take_columns(value, indexer)
+                # The adjustments taking effect after the last carried row
+                # are loaded again below.
+                heads[column] = AdjustedArray(
+                    value.data,
+                    NOMASK,
+                    {
+                        row: row_adjustments
+                        for row, row_adjustments in iteritems(
+                            value.adjustments,
+                        )
+                        if row < nrows
+                    },
+                )
+
+            if heads:
+                # Loaders drop the adjustments taking effect before the first
+                # date they load, but those taking effect after the last
+                # carried date, e.g. on the weekend before the first new date,
+                # apply to the carried rows.  Load from the last carried date
+                # to get them, then drop its row.
+                loaded = loader.load_adjusted_array(
+                    columns, dates[nrows - 1:], assets, mask[nrows - 1:],
+                )
+                return {
+                    column: prepend_rows(
+                        heads[column],
+                        trailing_rows(loaded[column], len(dates) - nrows),
+                    )
+                    for column in columns
+                }
+
+        return loader.load_adjusted_array(columns, dates, assets, mask)
+
+    def _term_computation(self, term, workspace, graph, dates, assets, mask):
+        """
+        Prepare the computation of `term` for `dates`, reusing the rows kept
+        from the previous chunk if they cover the first of `dates`.
+
+        Returns
+        -------
+        computation : callable
+            Function of no arguments returning the value of `term`.  The
+            inputs of `term` are read from `workspace` before returning, so
+            the computation can run on another thread.
+        """
+        computed_term = graph.computed_term(term)
+        carried = self._carried_rows(term, dates)
+        if carried is not None:
+            nrows, carried_assets, value = carried
+            # Cross-sectional terms depend on the full set of assets, so rows
+            # are only reused for the same assets.
+            if carried_assets.equals(assets):
+                return partial(
+                    _compute_after_rows,
+                    value[-nrows:],
+                    computed_term,
+                    self._inputs_for_term(term, workspace, graph, nrows),
+                    dates[nrows:],
+                    assets,
+                    mask[nrows:],
+                )
+
+        return partial(
+            computed_term._compute,
+            self._inputs_for_term(term, workspace, graph),
+            dates,
+            assets,
+            mask,
+        )
+
+    def _carries_rows(self, term, carry, graph, initial_workspace):
+        """
+        Whether the rows of `term` can be kept for the next chunk.
+
+        Loaded data is kept if its loader sets `carry_rows`, and computed
+        data is kept if all the data it depends on is.  Data supplied in
+        `initial_workspace` isn't kept.
+        """
+        if term in initial_workspace:
+            return False
+        if term.atomic:
+            return getattr(self.get_loader(term), 'carry_rows', False)
+        return all(carry[dep] for dep in graph.predecessors(term))
+
+    @staticmethod
+    def _keep_trailing_rows(carried, graph, term, value, dates, assets):
+        """
+        Store in `carried` the rows of `term` that the next chunk needs as
+        lookback if it starts right after `dates`.
+        """
+        nrows = graph.extra_rows[term]
+        if not nrows:
+            return
+        if isinstance(value, AdjustedArray):
+            try:
+                value = trailing_rows(value, nrows)
+            except TypeError:
+                return
+        else:
+            value = value[-nrows:].copy()
+        carried[term] = (dates[-nrows:], assets, value)
+
+    @property
+    def peak_workspace_bytes(self):
+        """
+        The largest number of bytes held by the outputs of terms while
+        computing the last chunk.
+        """
+        return self._peak_workspace_bytes
+
     def _to_narrow(self, data, mask, dates, assets):
         """
         Convert raw computed pipeline results into a DataFrame for public APIs.
@@ -390,13 +1011,80 @@ class SimplePipelineEngine(object):
         If mask[date, asset] is True, then result.loc[(date, asset), colname]
         will contain the value of data[colname][date, asset].
         """
-        resolved_assets = array(self._finder.retrieve_all(assets))
-        dates_kept = repeat_last_axis(dates.values, len(assets))[mask]
-        assets_kept = repeat_first_axis(resolved_assets, len(dates))[mask]
+        # Build the index from the positions of the kept values rather than
+        # from arrays of their labels, which would have to be factorized.
+        rows, cols = mask.nonzero()
+        date_used = mask.any(axis=1)
+        asset_used = mask.any(axis=0)
+        index = MultiIndex(
+            levels=[
+                dates[date_used],
+                self._resolve_assets(assets[asset_used]),
+            ],
+            labels=[
+                (date_used.cumsum() - 1)[rows],
+                (asset_used.cumsum() - 1)[cols],
+            ],
+            verify_integrity=False,
+        )
         return DataFrame(
             data={name: arr[mask] for name, arr in iteritems(data)},
-            index=MultiIndex.from_arrays([dates_kept, assets_kept]),
-        ).tz_localize('UTC', level=0)
+            index=index,
+        )
+
+    def _to_wide(self, data, mask, dates, assets):
+        """
+        Convert raw computed pipeline results into a DataFrame with a column
+        per (name, sid) pair.
+
+        Only the assets for which `mask` is True on some date have columns,
+        and values for which `mask` is False are missing.
+        """
+        asset_used = mask.any(axis=0)
+        sids = assets[asset_used]
+        mask = mask[:, asset_used]
+        names = sorted(data)
+        return concat(
+            [
+                DataFrame(data[name][:, asset_used], index=dates, columns=sids)
+                .where(mask)
+                for name in names
+            ],
+            axis=1,
+            keys=names,
+        )
+
+    def _resolve_assets(self, sids):
+        """
+        Look up the Assets of `sids`, reusing the Assets looked up for
+        previous chunks.
+
+        Parameters
+        ----------
+        sids : pd.Int64Index
+            Sorted sids.
+
+        Returns
+        -------
+        assets : np.ndarray[object]
+        """
+        sids = sids.values
+        known_sids, known_assets = self._resolved_assets
+        locs = known_sids.searchsorted(sids)
+        found = locs < len(known_sids)
+        found[found] = known_sids[locs[found]] == sids[found]
+        if not found.all():
+            new_sids = sids[~found]
+            new_assets = empty(len(new_sids), dtype=object)
+            new_assets[:] = self._finder.retrieve_all(new_sids)
+
+            known_sids = concatenate([known_sids, new_sids])
+            order = known_sids.argsort(kind='mergesort')
+            known_sids = known_sids[order]
+            known_assets = concatenate([known_assets, new_assets])[order]
+            self._resolved_assets = known_sids, known_assets
+            locs = known_sids.searchsorted(sids)
+        return known_assets[locs]
 
     def _validate_compute_chunk_params(self, dates, assets, initial_workspace):
         """
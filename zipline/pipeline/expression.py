@@ -180,6 +180,9 @@ class NumericalExpression(CompositeTerm):
         The dtype for the expression.
     """
     window_length = 0
+    # numexpr keeps the state of an evaluation in globals and releases the
+    # GIL while evaluating, so concurrent evaluations can corrupt each other.
+    thread_safe = False
 
     def __new__(cls, expr, binds, dtype):
         return super(NumericalExpression, cls).__new__(
@@ -32,6 +32,7 @@ from zipline.pipeline.expression import (
 from zipline.pipeline.filters import (
     NumExprFilter,
     PercentileFilter,
+    RankFilter,
 )
 from zipline.utils.control_flow import nullctx
 from zipline.utils.numpy_utils import (
@@ -414,9 +415,9 @@ class Factor(CompositeTerm):
 
         Returns
         -------
-        filter : zipline.pipeline.filters.Filter
+        filter : zipline.pipeline.filters.RankFilter
         """
-        return self.rank(ascending=False, mask=mask) <= N
+        return RankFilter(self, N=N, ascending=False, mask=mask)
 
     def bottom(self, N, mask=NotSpecified):
         """
@@ -433,9 +434,9 @@ class Factor(CompositeTerm):
 
         Returns
         -------
-        filter : zipline.pipeline.Filter
+        filter : zipline.pipeline.filters.RankFilter
         """
-        return self.rank(ascending=True, mask=mask) <= N
+        return RankFilter(self, N=N, ascending=True, mask=mask)
 
     def percentile_between(self,
                            min_percentile,
@@ -620,6 +621,10 @@ class CustomFactor(PositiveWindowLengthMixin, CustomTermMixin, Factor):
         Number of rows to pass for each input.  If this argument is not passed
         to the CustomFactor constructor, we look for a class-level attribute
         named `window_length`.
+    mask : zipline.pipeline.Filter, optional
+        A Filter describing the assets to compute on each day.  Only the
+        columns of these assets are passed to `compute`, and the values of
+        the other assets are missing.  See the Notes below.
 
     Notes
     -----
@@ -656,6 +661,17 @@ class CustomFactor(PositiveWindowLengthMixin, CustomTermMixin, Factor):
     3rd, 2014, the column of input data for asset A will have 9 leading NaNs
     for the preceding days on which data was not yet available.
 
+    Without a `mask`, ``compute`` is passed a column for every asset known to
+    the pipeline on each day, in the same order every day, and the values it
+    writes for assets which don't exist on that day are replaced with NaN.
+
+    When a `mask` is passed, ``assets``, ``out`` and each of ``inputs`` only
+    have the columns of the assets in the mask on that day, so their width
+    and the position of each asset can change from one day to the next.
+    ``compute`` isn't called on days on which no asset is in the mask.
+    Factors which keep per-column state or precompute values by column
+    position should look up columns through ``assets``.
+
     Examples
     --------
 
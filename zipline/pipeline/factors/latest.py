@@ -10,6 +10,7 @@ class Latest(SingleInputMixin, CustomFactor):
     Factor producing the most recently-known value of `inputs[0]` on each day.
     """
     window_length = 1
+    columnwise = True
 
     def compute(self, today, assets, out, data):
         out[:] = data[-1]
@@ -3,8 +3,9 @@ Technical Analysis Factors
 --------------------------
 """
 from bottleneck import (
+    move_mean,
+    move_sum,
     nanargmax,
-    nanmax,
     nanmean,
     nansum,
 )
@@ -14,16 +15,22 @@ from numpy import (
     arange,
     average,
     clip,
+    copyto,
     diff,
+    empty_like,
     exp,
     fmax,
     full,
     inf,
     isnan,
     log,
+    nan,
     NINF,
     sqrt,
+    subtract,
     sum as np_sum,
+    where,
+    zeros,
 )
 from numexpr import evaluate
 
@@ -34,6 +41,18 @@ from zipline.utils.input_validation import expect_types
 from .factor import CustomFactor
 
 
+def _rolling_weighted_sum(data, weights):
+    """
+    Compute the sums of the rows of each window of ``len(weights)`` rows of
+    `data`, weighted by `weights`.
+    """
+    nwindows = len(data) - len(weights) + 1
+    out = zeros((nwindows,) + data.shape[1:])
+    for i, weight in enumerate(weights):
+        out += weight * data[i:i + nwindows]
+    return out
+
+
 class Returns(CustomFactor):
     """
     Calculates the percent change in close price over the given window_length.
@@ -41,10 +60,15 @@ class Returns(CustomFactor):
     **Default Inputs**: [USEquityPricing.close]
     """
     inputs = [USEquityPricing.close]
+    columnwise = True
 
     def compute(self, today, assets, out, close):
         out[:] = (close[-1] - close[0]) / close[0]
 
+    def _compute_rolling(self, out, close):
+        first = close[:len(out)]
+        out[:] = (close[self.window_length - 1:] - first) / first
+
 
 class RSI(CustomFactor, SingleInputMixin):
     """
@@ -56,6 +80,9 @@ class RSI(CustomFactor, SingleInputMixin):
     """
     window_length = 15
     inputs = (USEquityPricing.close,)
+    columnwise = True
+    # We evaluate with numexpr, which isn't thread-safe.
+    thread_safe = False
 
     def compute(self, today, assets, out, closes):
         diffs = diff(closes, axis=0)
@@ -68,6 +95,23 @@ class RSI(CustomFactor, SingleInputMixin):
             out=out,
         )
 
+    def _compute_rolling(self, out, closes):
+        ndiffs = self.window_length - 1
+        if not ndiffs:
+            out[:] = nan
+            return
+        diffs = diff(closes, axis=0)
+        ups = move_mean(clip(diffs, 0, inf), ndiffs, min_count=1, axis=0)
+        downs = abs(
+            move_mean(clip(diffs, -inf, 0), ndiffs, min_count=1, axis=0)
+        )
+        evaluate(
+            "100 - (100 / (1 + (ups / downs)))",
+            local_dict={'ups': ups[ndiffs - 1:], 'downs': downs[ndiffs - 1:]},
+            global_dict={},
+            out=out,
+        )
+
 
 class SimpleMovingAverage(CustomFactor, SingleInputMixin):
     """
@@ -81,10 +125,17 @@ class SimpleMovingAverage(CustomFactor, SingleInputMixin):
     # nans, but they still returns the desired value (nan), so we ignore the
     # warning.
     ctx = ignore_nanwarnings()
+    columnwise = True
 
     def compute(self, today, assets, out, data):
         out[:] = nanmean(data, axis=0)
 
+    def _compute_rolling(self, out, data):
+        window_length = self.window_length
+        out[:] = move_mean(
+            data, window_length, min_count=1, axis=0,
+        )[window_length - 1:]
+
 
 class WeightedAverageValue(CustomFactor):
     """
@@ -94,9 +145,21 @@ class WeightedAverageValue(CustomFactor):
 
     **Default Window Length:** None
     """
+    columnwise = True
+
     def compute(self, today, assets, out, base, weight):
         out[:] = nansum(base * weight, axis=0) / nansum(weight, axis=0)
 
+    def _compute_rolling(self, out, base, weight):
+        window_length = self.window_length
+        products = base * weight
+        products[isnan(products)] = 0
+        weight = where(isnan(weight), 0, weight)
+        out[:] = (
+            move_sum(products, window_length, axis=0)[window_length - 1:] /
+            move_sum(weight, window_length, axis=0)[window_length - 1:]
+        )
+
 
 class VWAP(WeightedAverageValue):
     """
@@ -118,16 +181,38 @@ class MaxDrawdown(CustomFactor, SingleInputMixin):
     **Default Window Length:** None
     """
     ctx = ignore_nanwarnings()
+    columnwise = True
 
     def compute(self, today, assets, out, data):
-        drawdowns = fmax.accumulate(data, axis=0) - data
+        peaks = fmax.accumulate(data, axis=0)
+        drawdowns = peaks - data
         drawdowns[isnan(drawdowns)] = NINF
         drawdown_ends = nanargmax(drawdowns, axis=0)
 
-        # TODO: Accelerate this loop in Cython or Numba.
-        for i, end in enumerate(drawdown_ends):
-            peak = nanmax(data[:end + 1, i])
-            out[i] = (peak - data[end, i]) / data[end, i]
+        columns = arange(data.shape[1])
+        peak = peaks[drawdown_ends, columns]
+        trough = data[drawdown_ends, columns]
+        out[:] = (peak - trough) / trough
+
+    def _compute_rolling(self, out, data):
+        # Walk the windows forward together, extending the running peak of
+        # each window by one row at a time.
+        nwindows = len(out)
+        running_peak = data[:nwindows].copy()
+        peak = running_peak.copy()
+        trough = running_peak.copy()
+        largest = zeros(peak.shape)
+        largest[isnan(trough)] = NINF
+        drawdown = empty_like(largest)
+        for i in range(1, self.window_length):
+            row = data[i:i + nwindows]
+            fmax(running_peak, row, out=running_peak)
+            subtract(running_peak, row, out=drawdown)
+            larger = drawdown > largest
+            copyto(largest, drawdown, where=larger)
+            copyto(peak, running_peak, where=larger)
+            copyto(trough, row, where=larger)
+        out[:] = (peak - trough) / trough
 
 
 def DollarVolume():
@@ -168,6 +253,7 @@ class _ExponentialWeightedFactor(SingleInputMixin, CustomFactor):
     from_center_of_mass
     """
     params = ('decay_rate',)
+    columnwise = True
 
     @staticmethod
     def weights(length, decay_rate):
@@ -342,6 +428,10 @@ class ExponentialWeightedMovingAverage(_ExponentialWeightedFactor):
             weights=self.weights(len(data), decay_rate),
         )
 
+    def _compute_rolling(self, out, data, decay_rate):
+        weights = self.weights(self.window_length, decay_rate)
+        out[:] = _rolling_weighted_sum(data, weights) / np_sum(weights)
+
 
 class ExponentialWeightedMovingStdDev(_ExponentialWeightedFactor):
     """
@@ -386,6 +476,22 @@ class ExponentialWeightedMovingStdDev(_ExponentialWeightedFactor):
         )
         out[:] = sqrt(variance * bias_correction)
 
+    def _compute_rolling(self, out, data, decay_rate):
+        weights = self.weights(self.window_length, decay_rate)
+        weight_sum = np_sum(weights)
+
+        mean = _rolling_weighted_sum(data, weights) / weight_sum
+        variance = zeros(mean.shape)
+        for i, weight in enumerate(weights):
+            variance += weight * (data[i:i + len(mean)] - mean) ** 2
+        variance /= weight_sum
+
+        squared_weight_sum = weight_sum ** 2
+        bias_correction = (
+            squared_weight_sum / (squared_weight_sum - np_sum(weights ** 2))
+        )
+        out[:] = sqrt(variance * bias_correction)
+
 
 # Convenience aliases.
 EWMA = ExponentialWeightedMovingAverage
@@ -1,7 +1,8 @@
-from .filter import Filter, NumExprFilter, PercentileFilter
+from .filter import Filter, NumExprFilter, PercentileFilter, RankFilter
 
 __all__ = [
     'Filter',
     'NumExprFilter',
     'PercentileFilter',
+    'RankFilter',
 ]
@@ -2,9 +2,16 @@
 filter.py
 """
 from numpy import (
+    arange,
+    cumsum,
     float64,
+    floor,
+    intp,
+    isnan,
     nan,
-    nanpercentile,
+    partition,
+    where,
+    zeros_like,
 )
 from itertools import chain
 from operator import attrgetter
@@ -26,7 +33,7 @@ from zipline.pipeline.expression import (
     NumericalExpression,
 )
 from zipline.utils.control_flow import nullctx
-from zipline.utils.numpy_utils import bool_dtype
+from zipline.utils.numpy_utils import bool_dtype, float64_dtype
 
 
 def concat_tuples(*tuples):
@@ -158,15 +165,70 @@ class NumExprFilter(NumericalExpression, Filter):
         """
         Compute our result with numexpr, then re-apply `mask`.
         """
-        return super(NumExprFilter, self)._compute(
+        out = super(NumExprFilter, self)._compute(
             arrays,
             dates,
             assets,
             mask,
-        ) & mask
+        )
+        out &= mask
+        return out
+
+
+def _sorted_percentile(sorted_rows, counts, percentile):
+    """
+    Compute a percentile of each row of `sorted_rows`, whose row i starts
+    with `counts[i]` sorted values followed by NaNs.
+
+    Values are interpolated linearly between the two nearest ranks, as with
+    numpy.nanpercentile.
+    """
+    position = (percentile / 100.0) * (counts - 1)
+    below = floor(position)
+    weight = position - below
+    above = where(weight > 0, below + 1, below)
+
+    # Rows without values have a negative position.
+    below = below.clip(0).astype(intp)
+    above = above.clip(0).astype(intp)
+
+    rows = arange(len(sorted_rows))
+    low = sorted_rows[rows, below]
+    high = sorted_rows[rows, above]
+    # Weighting each bound separately keeps infinite bounds from giving NaN.
+    out = where(low == high, low, low * (1 - weight) + high * weight)
+    out[counts == 0] = nan
+    return out[:, None]
+
+
+class SortedRows(SingleInputMixin, CompositeTerm):
+    """
+    The values of a Factor sorted along each row, with masked and NaN values
+    moved to the end.
+
+    Used by PercentileFilter, so that every percentile filter of the same
+    Factor and mask shares a single sort of each row.
+    """
+    window_length = 0
+    dtype = float64_dtype
+
+    def __new__(cls, factor, mask):
+        return super(SortedRows, cls).__new__(
+            cls,
+            inputs=(factor,),
+            mask=mask,
+        )
+
+    def _compute(self, arrays, dates, assets, mask):
+        data = arrays[0]
+        if data.dtype != float64:
+            data = data.astype(float64)
+        out = where(mask, data, nan)
+        out.sort(axis=1)
+        return out
 
 
-class PercentileFilter(SingleInputMixin, Filter):
+class PercentileFilter(Filter):
     """
     A Filter representing assets falling between percentile bounds of a Factor.
 
@@ -184,7 +246,7 @@ class PercentileFilter(SingleInputMixin, Filter):
     def __new__(cls, factor, min_percentile, max_percentile, mask):
         return super(PercentileFilter, cls).__new__(
             cls,
-            inputs=(factor,),
+            inputs=(factor, SortedRows(factor, mask=mask)),
             mask=mask,
             min_percentile=min_percentile,
             max_percentile=max_percentile,
@@ -219,28 +281,104 @@ class PercentileFilter(SingleInputMixin, Filter):
         For each row in the input, compute a mask of all values falling between
         the given percentiles.
         """
-        # TODO: Review whether there's a better way of handling small numbers
-        # of columns.
-        data = arrays[0].copy().astype(float64)
-        data[~mask] = nan
-
-        # FIXME: np.nanpercentile **should** support computing multiple bounds
-        # at once, but there's a bug in the logic for multiple bounds in numpy
-        # 1.9.2.  It will be fixed in 1.10.
-        # c.f. https://github.com/numpy/numpy/pull/5981
-        lower_bounds = nanpercentile(
-            data,
+        data, sorted_rows = arrays
+        if not data.shape[1]:
+            return zeros_like(mask)
+        if data.dtype != float64:
+            data = data.astype(float64)
+
+        counts = sorted_rows.shape[1] - isnan(sorted_rows).sum(axis=1)
+        lower_bounds = _sorted_percentile(
+            sorted_rows,
+            counts,
             self._min_percentile,
-            axis=1,
-            keepdims=True,
         )
-        upper_bounds = nanpercentile(
-            data,
+        upper_bounds = _sorted_percentile(
+            sorted_rows,
+            counts,
             self._max_percentile,
-            axis=1,
-            keepdims=True,
         )
-        return (lower_bounds <= data) & (data <= upper_bounds)
+        return (lower_bounds <= data) & (data <= upper_bounds) & mask
+
+
+class RankFilter(SingleInputMixin, Filter):
+    """
+    A Filter matching the N assets with the largest or smallest values of a
+    Factor each day.
+
+    Equivalent to ``factor.rank(ascending=ascending, mask=mask) <= N``, but
+    the N values are selected with a partial sort of each row rather than a
+    full one.  Ties are broken in favor of the asset in the earlier column,
+    as with ordinal ranks.
+
+    Parameters
+    ----------
+    factor : zipline.pipeline.factor.Factor
+        The factor whose values select the assets.
+    N : int
+        The number of assets passing the filter each day.
+    ascending : bool
+        Whether to match the smallest values rather than the largest.
+    """
+    window_length = 0
+
+    def __new__(cls, factor, N, ascending, mask):
+        return super(RankFilter, cls).__new__(
+            cls,
+            inputs=(factor,),
+            mask=mask,
+            N=N,
+            ascending=ascending,
+        )
+
+    def _init(self, N, ascending, *args, **kwargs):
+        self._N = N
+        self._ascending = ascending
+        return super(RankFilter, self)._init(*args, **kwargs)
+
+    @classmethod
+    def static_identity(cls, N, ascending, *args, **kwargs):
+        return (
+            super(RankFilter, cls).static_identity(*args, **kwargs),
+            N,
+            ascending,
+        )
+
+    def _compute(self, arrays, dates, assets, mask):
+        """
+        For each row in the input, select the first N values in rank order.
+        """
+        data = arrays[0]
+        missing_value = self.inputs[0].missing_value
+        if data.dtype == float64 and isnan(missing_value):
+            present = mask & ~isnan(data)
+        else:
+            present = mask & (data != missing_value)
+
+        N = self._N
+        if N < 1 or not data.shape[1]:
+            return zeros_like(present)
+
+        # Order the bytes of integral data as floats, like Rank does.  Missing
+        # values become NaNs, which are partitioned after every other value.
+        data = data.view(float64)
+        values = where(present, data if self._ascending else -data, nan)
+        kth = min(N, data.shape[1]) - 1
+        threshold = partition(values, kth, axis=1)[:, kth:kth + 1]
+
+        # Take everything before the Nth value, and then as many of the
+        # values tied with it as fit, leftmost first.
+        below = values < threshold
+        tied = values == threshold
+        room = N - below.sum(axis=1, keepdims=True)
+        selected = below | (tied & (cumsum(tied, axis=1) <= room))
+
+        # Rows with no more than N present values have a NaN threshold.
+        return where(
+            present.sum(axis=1, keepdims=True) <= N,
+            present,
+            selected,
+        )
 
 
 class CustomFilter(PositiveWindowLengthMixin, CustomTermMixin, Filter):
@@ -1,19 +1,119 @@
 """
 Dependency-Graph representation of Pipeline API terms.
 """
+import ast
+import re
+
 from networkx import (
     DiGraph,
     topological_sort,
 )
 from six import itervalues, iteritems
 from zipline.utils.memoize import lazyval
+from zipline.pipeline.expression import NumericalExpression
+from zipline.pipeline.filters import NumExprFilter
+from zipline.pipeline.term import AssetExists, Term
 from zipline.pipeline.visualize import display_graph
 
+_VARIABLE_RE = re.compile(r"\bx_([0-9]+)\b")
+
+# numexpr can't evaluate expressions of more than 32 arrays, one of which is
+# the output.
+_MAX_EXPRESSION_INPUTS = 31
+
+
+# Operators whose operands can be swapped.
+_COMMUTATIVE_OPS = frozenset(['Add', 'Mult', 'BitAnd', 'BitOr', 'Eq', 'NotEq'])
+# Comparisons equivalent to another comparison with its operands swapped.
+_SWAPPED_COMPARISONS = {'Gt': 'Lt', 'GtE': 'LtE'}
+
 
 class CyclicDependency(Exception):
     pass
 
 
+def _canonical_expression(node, names):
+    """
+    Format the parsed numexpr expression `node`, whose variable x_i is named
+    `names[i]`, so that expressions differing only in the order of the
+    operands of commutative operators are formatted the same way.
+    """
+    if isinstance(node, ast.Name):
+        match = _VARIABLE_RE.match(node.id)
+        return names[int(match.group(1))] if match else node.id
+    if isinstance(node, ast.BinOp):
+        op = type(node.op).__name__
+        operands = [
+            _canonical_expression(node.left, names),
+            _canonical_expression(node.right, names),
+        ]
+    elif isinstance(node, ast.Compare) and len(node.ops) == 1:
+        op = type(node.ops[0]).__name__
+        operands = [
+            _canonical_expression(node.left, names),
+            _canonical_expression(node.comparators[0], names),
+        ]
+        if op in _SWAPPED_COMPARISONS:
+            op = _SWAPPED_COMPARISONS[op]
+            operands.reverse()
+    elif isinstance(node, ast.UnaryOp):
+        op = type(node.op).__name__
+        operands = [_canonical_expression(node.operand, names)]
+    elif isinstance(node, ast.Call):
+        op = node.func.id
+        operands = [_canonical_expression(arg, names) for arg in node.args]
+    else:
+        return ast.dump(node)
+
+    if op in _COMMUTATIVE_OPS:
+        operands.sort()
+    return '%s(%s)' % (op, ', '.join(operands))
+
+
+def _canonical_identity(identity, representatives):
+    """
+    Replace the terms in the static identity of a term by their
+    representatives.
+    """
+    if isinstance(identity, Term):
+        return representatives.get(identity, identity)
+    if isinstance(identity, tuple):
+        return tuple(
+            _canonical_identity(part, representatives) for part in identity
+        )
+    return identity
+
+
+def _expand_expression(term, inlined, expanded):
+    """
+    Substitute the expanded expressions of the inputs of `term` in `inlined`
+    into the expression of `term`.
+
+    Returns
+    -------
+    expr, binds : (str, tuple)
+        The expression string and the terms bound to its variables.
+    """
+    binds = []
+
+    def bind(input_):
+        if input_ not in binds:
+            binds.append(input_)
+        return 'x_%d' % binds.index(input_)
+
+    def replace(match):
+        input_ = term.inputs[int(match.group(1))]
+        if input_ not in inlined:
+            return bind(input_)
+        expr, expr_binds = expanded[input_]
+        return '(%s)' % _VARIABLE_RE.sub(
+            lambda match: bind(expr_binds[int(match.group(1))]),
+            expr,
+        )
+
+    return _VARIABLE_RE.sub(replace, term._expr), tuple(binds)
+
+
 class TermGraph(DiGraph):
     """
     Graph represention of Pipeline Term dependencies.
@@ -24,23 +124,36 @@ class TermGraph(DiGraph):
     example, if we compute a 30 day moving average of price from day X to day
     Y, we need to load price data for the range from day (X - 29) to day Y.
 
+    Terms are memoized on their identity, so each term appears in the graph
+    once.  When the graph is built, terms are also merged with the terms they
+    are equivalent to, and the screen named by `screen_name` is used as the
+    mask of the outputs which can be computed over fewer assets.  The terms
+    that are computed in place of the terms in the graph are given by
+    `computed_term`, and the rewritten graph can be displayed with the tools
+    in `zipline.pipeline.visualize`.
+
     Parameters
     ----------
     terms : dict
         A dict mapping names to final output terms.
+    screen_name : str, optional
+        The name of the output filtering the rows of the other outputs.
 
     Attributes
     ----------
     outputs
     offset
     extra_rows
+    fused
 
     Methods
     -------
     ordered()
         Return a topologically-sorted iterator over the terms in self.
+    computed_term(term)
+        Return the term whose computation produces the value of `term`.
     """
-    def __init__(self, terms):
+    def __init__(self, terms, screen_name=None):
         super(TermGraph, self).__init__(self)
 
         self._frozen = False
@@ -51,6 +164,12 @@ class TermGraph(DiGraph):
             assert not parents
 
         self._outputs = terms
+        self._computed = {}
+        self._eliminate_common_subexpressions()
+        self._propagate_screen(screen_name)
+        self._fused = self._fuse_expressions()
+        self._remove_dead_terms()
+        self._update_extra_rows()
         self._ordered = topological_sort(self)
 
         # Mark that no more terms should be added to the graph.
@@ -104,7 +223,7 @@ class TermGraph(DiGraph):
         """
         return {(term, dep): self.extra_rows[dep] - term.extra_input_rows
                 for term in self
-                for dep in term.dependencies}
+                for dep in self.computed_term(term).dependencies}
 
     @lazyval
     def extra_rows(self):
@@ -166,6 +285,244 @@ class TermGraph(DiGraph):
     def atomic_terms(self):
         return tuple(term for term in self if term.atomic)
 
+    @property
+    def fused(self):
+        """
+        Dict mapping each NumericalExpression computed together with the
+        expressions it consumes to the fused expression computing it.
+        """
+        return self._fused
+
+    def computed_term(self, term):
+        """
+        Return the term whose computation produces the value of `term`.
+
+        This is `term` itself unless `term` was rewritten when the graph was
+        built, in which case the dependencies of the returned term are the
+        dependencies of `term` in the graph.
+        """
+        return self._computed.get(term, term)
+
+    def _canonical_key(self, term, representatives, names):
+        """
+        Compute a key which is the same for terms computing the same values.
+        """
+        if isinstance(term, NumericalExpression):
+            tree = ast.parse(term._expr.strip(), mode='eval').body
+            return (
+                type(term),
+                term.dtype,
+                representatives[term.mask],
+                _canonical_expression(
+                    tree,
+                    [names[representatives[input_]]
+                     for input_ in term.inputs],
+                ),
+            )
+        return _canonical_identity(
+            getattr(term, '_static_identity', term),
+            representatives,
+        )
+
+    @staticmethod
+    def _rebound(term, representatives):
+        """
+        Return a term computing `term` from the representatives of its
+        dependencies.
+        """
+        if all(representatives[dep] is dep for dep in term.dependencies):
+            return term
+        inputs = tuple(representatives[input_] for input_ in term.inputs)
+        if isinstance(term, NumericalExpression):
+            return type(term)(expr=term._expr, binds=inputs, dtype=term.dtype)
+        return term._with_dependencies(inputs, representatives[term.mask])
+
+    def _eliminate_common_subexpressions(self):
+        """
+        Merge terms computing the same values.
+
+        Terms built from the same arguments are already the same object.
+        Terms differing only in the order of the operands of commutative
+        operators, or in inputs or masks which are themselves equivalent,
+        are merged here, keeping the first one in topological order.
+        """
+        representatives = {}
+        names = {}
+        seen = {}
+        for term in list(topological_sort(self)):
+            key = self._canonical_key(term, representatives, names)
+            representative = representatives[term] = seen.setdefault(
+                key, term,
+            )
+            if representative is not term:
+                continue
+            names[term] = 't%d' % len(names)
+            computed = self._rebound(term, representatives)
+            if computed is not term:
+                self._computed[term] = computed
+                for dependency in computed.dependencies:
+                    self.add_edge(dependency, term)
+
+        duplicates = [
+            term for term, representative in iteritems(representatives)
+            if term is not representative
+        ]
+        if duplicates:
+            self.remove_nodes_from(duplicates)
+            self._outputs = {
+                name: representatives[term]
+                for name, term in iteritems(self._outputs)
+            }
+
+    def _propagate_screen(self, screen_name):
+        """
+        Mask the columnwise outputs that no other term depends on with the
+        screen, since only their values on the rows passing the screen are
+        returned.
+        """
+        if screen_name is None:
+            return
+        screen = self._outputs[screen_name]
+        if screen is AssetExists():
+            return
+
+        for term in set(itervalues(self._outputs)):
+            if term is screen or self.out_degree(term):
+                continue
+            computed = self.computed_term(term)
+            if not getattr(computed, 'columnwise', False):
+                continue
+            mask = computed.mask
+            if mask is AssetExists():
+                screened_mask = screen
+            else:
+                screened_mask = NumExprFilter.create('x_0 & x_1',
+                                                     (mask, screen))
+                self._add_to_graph(screened_mask, set(), extra_rows=0)
+
+            self._computed[term] = computed._with_dependencies(
+                computed.inputs, screened_mask,
+            )
+            self.add_edge(screened_mask, term)
+            if mask not in computed.inputs:
+                self.remove_edge(mask, term)
+
+    def _inlined_expression(self, term, outputs):
+        """
+        Whether `term` can be computed as part of the expression of its
+        consumer rather than on its own.
+
+        This is true for NumericalExpressions other than our outputs whose
+        only consumer is another NumericalExpression using them as an input.
+        """
+        if not isinstance(term, NumericalExpression) or term in outputs:
+            return False
+        if self.out_degree(term) != 1:
+            return False
+        consumer, = self.successors(term)
+        consumer = self.computed_term(consumer)
+        return (
+            isinstance(consumer, NumericalExpression) and
+            term in consumer.inputs and
+            term is not consumer.mask and
+            self.computed_term(term).mask is consumer.mask and
+            # Filters mask their outputs, so only fuse them into filters.
+            (isinstance(consumer, NumExprFilter) or
+             not isinstance(term, NumExprFilter))
+        )
+
+    def _fuse_expressions(self):
+        """
+        Replace chains of NumericalExpressions by a single expression
+        evaluating the whole chain, so that the intermediate results are
+        never stored.
+
+        Expressions built from operators on Factors and Filters are already
+        merged as they are built, but not when an expression is passed as an
+        input to another one.
+
+        Returns
+        -------
+        fused : dict
+            A map from the last expression of each chain to the expression
+            computing the chain.
+        """
+        outputs = set(itervalues(self._outputs))
+        inlined = {
+            term for term in self if self._inlined_expression(term, outputs)
+        }
+        if not inlined:
+            return {}
+
+        # Map from each expression to its expression string and inputs once
+        # the expressions it consumes are substituted into it.
+        expanded = {}
+        for term in topological_sort(self):
+            computed = self.computed_term(term)
+            if not isinstance(computed, NumericalExpression):
+                continue
+            expr, binds = _expand_expression(computed, inlined, expanded)
+            if len(binds) > _MAX_EXPRESSION_INPUTS:
+                # Too many inputs for numexpr, so compute the inputs of
+                # `term` on their own.
+                inlined.difference_update(computed.inputs)
+                expr, binds = computed._expr, computed.inputs
+            expanded[term] = expr, binds
+
+        fused = {
+            term: type(term)(expr=expr, binds=binds, dtype=term.dtype)
+            for term, (expr, binds) in iteritems(expanded)
+            if term not in inlined and
+            binds != self.computed_term(term).inputs
+        }
+        self.remove_nodes_from(inlined)
+        for term, fused_term in iteritems(fused):
+            for dependency in fused_term.dependencies:
+                self.add_edge(dependency, term)
+        self._computed.update(fused)
+        return fused
+
+    def _remove_dead_terms(self):
+        """
+        Remove the terms which no output depends on any more.
+        """
+        outputs = set(itervalues(self._outputs))
+        outputs.add(AssetExists())
+        dead = [
+            term for term in self
+            if not self.out_degree(term) and term not in outputs
+        ]
+        while dead:
+            dependencies = set()
+            for term in dead:
+                dependencies.update(self.predecessors(term))
+            self.remove_nodes_from(dead)
+            dead = [
+                term for term in dependencies
+                if term in self and
+                not self.out_degree(term) and
+                term not in outputs
+            ]
+
+    def _update_extra_rows(self):
+        """
+        Recompute the extra rows of each term from the terms that depend on
+        it once the graph is rewritten.
+
+        A mask is only read for the rows of the term it masks, while inputs
+        are also read for the extra rows of the windows of that term.
+        """
+        node = self.node
+        for term in reversed(list(topological_sort(self))):
+            extra_rows = 0
+            for consumer in self.successors(term):
+                computed = self.computed_term(consumer)
+                needed = node[consumer]['extra_rows']
+                if term in computed.inputs:
+                    needed += computed.extra_input_rows
+                extra_rows = max(extra_rows, needed)
+            node[term]['extra_rows'] = extra_rows
+
     def _add_to_graph(self, term, parents, extra_rows):
         """
         Add `term` and all its inputs to the graph.
@@ -15,7 +15,23 @@ class PipelineLoader(with_metaclass(ABCMeta)):
     ABC for classes that can load data for use with zipline.pipeline APIs.
 
     TODO: DOCUMENT THIS MORE!
+
+    Attributes
+    ----------
+    cache_identity : hashable or None
+        A value identifying the data served by the loader across processes,
+        such as the paths of its files.  Pipeline results are only cached
+        when all of their loaders provide one.  Default is None.
+    carry_rows : bool
+        Whether the engine may keep the rows loaded for the end of one chunk
+        and load only the new dates of the next chunk.  Loaders may only set
+        this if the data for a date doesn't depend on the dates requested
+        with it, and if every adjustment starting at the first row applies to
+        all data before the row at which it takes effect.  Default is False.
     """
+    cache_identity = None
+    carry_rows = False
+
     @abstractmethod
     def load_adjusted_array(self, columns, dates, assets, mask):
         pass
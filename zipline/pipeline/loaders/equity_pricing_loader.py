@@ -11,6 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+
 from numpy import (
     iinfo,
     uint32,
@@ -34,6 +36,9 @@ class USEquityPricingLoader(PipelineLoader):
 
     Delegates loading of baselines and adjustments.
     """
+    # Adjustments from corporate actions apply to all prices before the
+    # action, so rows loaded for a previous chunk can be extended.
+    carry_rows = True
 
     def __init__(self, raw_price_loader, adjustments_loader):
         self.raw_price_loader = raw_price_loader
@@ -54,11 +59,23 @@ class USEquityPricingLoader(PipelineLoader):
             Path to a bcolz directory written by a BcolzDailyBarWriter.
         adjusments_path : str
             Path to an adjusments db written by a SQLiteAdjustmentWriter.
+
+        Notes
+        -----
+        The `cache_identity` of the loader includes the sizes and
+        modification times of the files, so that pipeline results cached
+        from them aren't reused once the files are rewritten.
         """
-        return cls(
+        loader = cls(
             BcolzDailyBarReader(pricing_path),
             SQLiteAdjustmentReader(adjustments_path)
         )
+        loader.cache_identity = (
+            cls.__name__,
+            _files_stamp(pricing_path),
+            _files_stamp(adjustments_path),
+        )
+        return loader
 
     def load_adjusted_array(self, columns, dates, assets, mask):
         # load_adjusted_array is called with dates on which the user's algo
@@ -89,6 +106,36 @@ class USEquityPricingLoader(PipelineLoader):
         return dict(zip(columns, adjusted_arrays))
 
 
+def _files_stamp(path):
+    """
+    Identify the state of the data stored at `path`, so that rewriting it in
+    place changes the cache identity of the loaders reading it.
+
+    For a file, such as a SQLite db, this is its size and modification time.
+    For a directory, such as a bcolz ctable, these are gathered from the
+    metadata files at its root and in its `meta` directories, which bcolz
+    rewrites along with the data.
+    """
+    path = os.path.abspath(path)
+    if not os.path.isdir(path):
+        stat = os.stat(path)
+        return path, stat.st_size, stat.st_mtime
+
+    stamps = []
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames.sort()
+        if dirpath != path and os.path.basename(dirpath) != 'meta':
+            continue
+        for name in sorted(filenames):
+            stat = os.stat(os.path.join(dirpath, name))
+            stamps.append((
+                os.path.relpath(os.path.join(dirpath, name), path),
+                stat.st_size,
+                stat.st_mtime,
+            ))
+    return path, tuple(stamps)
+
+
 def _shift_dates(dates, start_date, end_date, shift):
     try:
         start = dates.get_loc(start_date)
@@ -50,6 +50,8 @@ class ConstantLoader(PipelineLoader):
     -----
     Adjustments are unsupported with ConstantLoader.
     """
+    carry_rows = True
+
     def __init__(self, constants, dates, assets):
         loaders = {}
         for column, const in iteritems(constants):
@@ -3,8 +3,9 @@ Mixins classes for use with Filters and Factors.
 """
 from numpy import full_like
 from zipline.errors import WindowLengthNotPositive
+from zipline.utils.memoize import lazyval
 
-from .term import NotSpecified
+from .term import AssetExists, NotSpecified
 
 
 class PositiveWindowLengthMixin(object):
@@ -34,6 +35,37 @@ class SingleInputMixin(object):
         return super(SingleInputMixin, self)._validate()
 
 
+def _aligned_blocks(windows, ndates):
+    """
+    Advance `windows` over `ndates` dates by blocks of dates whose windows
+    are all views of the same rows.
+
+    Yields
+    ------
+    (start, stop, blocks) : (int, int, list[np.ndarray])
+        The window of the i-th input for date ``start + j`` is
+        ``blocks[i][j:j + window_length]``.
+    """
+    window_length = windows[0].window_length
+    pending = [(None, 0)] * len(windows)
+    start = 0
+    while start < ndates:
+        pending = [
+            window.next_block() if not nwindows else (rows, nwindows)
+            for window, (rows, nwindows) in zip(windows, pending)
+        ]
+        count = min(nwindows for _, nwindows in pending)
+        yield (
+            start,
+            start + count,
+            [rows[:count + window_length - 1] for rows, _ in pending],
+        )
+        pending = [
+            (rows[count:], nwindows - count) for rows, nwindows in pending
+        ]
+        start += count
+
+
 class CustomTermMixin(object):
     """
     Mixin for user-defined rolling-window Terms.
@@ -42,10 +74,25 @@ class CustomTermMixin(object):
     is mapped over the input windows.
 
     Used by CustomFactor, CustomFilter, CustomClassifier, etc.
+
+    Built-in terms may also define `_compute_rolling`, a function of
+    ``(out, *arrays, **params)`` which writes into each row of `out` the
+    value of `compute` for the windows of that row, where the windows for
+    row i are ``array[i:i + window_length]``.  It is used in place of the
+    class' own `compute`, so that the windows between adjustments are
+    computed together.
+
+    Terms given an explicit mask only compute the assets in it.  `compute`
+    is passed the columns of the windows of the assets in the mask on each
+    date, and the kernel is passed the columns of the assets in the mask on
+    any date of a block.  With the default mask of AssetExists, every column
+    is computed, and the values of the assets which don't exist are
+    overwritten with missing values afterwards.
     """
     def __new__(cls,
                 inputs=NotSpecified,
                 window_length=NotSpecified,
+                mask=NotSpecified,
                 dtype=NotSpecified,
                 **kwargs):
 
@@ -63,6 +110,7 @@ class CustomTermMixin(object):
             cls,
             inputs=inputs,
             window_length=window_length,
+            mask=mask,
             dtype=dtype,
             **kwargs
         )
@@ -73,27 +121,68 @@ class CustomTermMixin(object):
         """
         raise NotImplementedError()
 
+    @lazyval
+    def _rolling_kernel(self):
+        """
+        The `_compute_rolling` defined alongside our `compute`, or None.
+
+        Subclasses overriding `compute` don't inherit the kernel.
+        """
+        for cls in type(self).__mro__:
+            if 'compute' in vars(cls):
+                return vars(cls).get('_compute_rolling')
+        return None
+
     def _compute(self, windows, dates, assets, mask):
         """
         Call the user's `compute` function on each window with a pre-built
         output array.
+
+        If we have an explicit mask, the windows are compacted to the
+        columns of the assets in `mask`, and the results are scattered back
+        into the full output array.
         """
-        # TODO: Make mask available to user's `compute`.
         compute = self.compute
         missing_value = self.missing_value
         params = self.params
         out = full_like(mask, missing_value, dtype=self.dtype)
+        kernel = self._rolling_kernel
+        # Compacting copies every window, which is only worth it when the
+        # mask was chosen to skip assets.  It would also change the width of
+        # the arrays given to `compute` from day to day.
+        compact = self.mask is not AssetExists()
         with self.ctx:
-            # TODO: Consider pre-filtering columns that are all-nan at each
-            # time-step?
-            for idx, date in enumerate(dates):
-                compute(
-                    date,
-                    assets,
-                    out[idx],
-                    *(next(w) for w in windows),
-                    **params
-                )
+            if kernel is not None and windows:
+                for start, stop, blocks in _aligned_blocks(windows,
+                                                           len(dates)):
+                    block_mask = mask[start:stop].any(axis=0)
+                    if not compact or block_mask.all():
+                        kernel(self, out[start:stop], *blocks, **params)
+                    elif block_mask.any():
+                        block_out = out[start:stop, block_mask]
+                        kernel(
+                            self,
+                            block_out,
+                            *(block[:, block_mask] for block in blocks),
+                            **params
+                        )
+                        out[start:stop, block_mask] = block_out
+            else:
+                for idx, date in enumerate(dates):
+                    arrays = [next(w) for w in windows]
+                    row_mask = mask[idx]
+                    if not compact or row_mask.all():
+                        compute(date, assets, out[idx], *arrays, **params)
+                    elif row_mask.any():
+                        row_out = out[idx, row_mask]
+                        compute(
+                            date,
+                            assets[row_mask],
+                            row_out,
+                            *(array[:, row_mask] for array in arrays),
+                            **params
+                        )
+                        out[idx, row_mask] = row_out
         out[~mask] = missing_value
         return out
 
@@ -144,7 +144,7 @@ class Pipeline(object):
             screen = default_screen
         columns[screen_name] = screen
 
-        return TermGraph(columns)
+        return TermGraph(columns, screen_name=screen_name)
 
     def show_graph(self, format='svg'):
         """
@@ -81,6 +81,9 @@ class Term(with_metaclass(ABCMeta, object)):
                     params=params,
                     *args, **kwargs
                 )
+            # Keep the identity around so that equivalent terms can be
+            # recognized across processes.  See zipline.pipeline.cache.
+            new_instance._static_identity = identity
             return new_instance
 
     @classmethod
@@ -303,6 +306,15 @@ class CompositeTerm(Term):
     window_length = NotSpecified
     mask = NotSpecified
 
+    # Whether each column of our output depends only on the same column of
+    # our inputs, in which case we can be computed over any subset of the
+    # assets in our mask.
+    columnwise = False
+
+    # Whether we can be computed on a worker thread while other terms are
+    # being computed.
+    thread_safe = True
+
     def __new__(cls,
                 inputs=inputs,
                 window_length=window_length,
@@ -366,6 +378,21 @@ class CompositeTerm(Term):
 
         return super(CompositeTerm, self)._validate()
 
+    def _with_dependencies(self, inputs, mask):
+        """
+        Return a copy of this term computed from `inputs` and `mask` instead
+        of our own.
+
+        The copy isn't memoized.  It's used by TermGraph to compute a term
+        from equivalent dependencies, or over a narrower mask.
+        """
+        # Bypass our memoized constructor.
+        new = object.__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new.inputs = inputs
+        new.mask = mask
+        return new
+
     def _compute(self, inputs, dates, assets, mask):
         """
         Subclasses should implement this to perform actual computation.
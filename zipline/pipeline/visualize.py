@@ -81,19 +81,24 @@ def filter_nodes(include_asset_exists, nodes):
     return filter(lambda n: n is not AssetExists(), nodes)
 
 
-def _render(g, out, format_, include_asset_exists=False):
+def dot_source(g, include_asset_exists=False):
     """
-    Draw `g` as a graph to `out`, in format `format`.
+    Write `g` in the graphviz dot language.
+
+    Terms which are computed by another term, such as the outputs masked by
+    the screen of a pipeline, are labelled with the term that computes them.
 
     Parameters
     ----------
     g : zipline.pipeline.graph.TermGraph
-        Graph to render.
-    out : file-like object
-    format_ : str {'png', 'svg'}
-        Output format.
+        Graph to write.
     include_asset_exists : bool
         Whether to filter out `AssetExists()` nodes.
+
+    Returns
+    -------
+    source : bytes
+        The dot source of the graph.
     """
     graph_attrs = {'rankdir': 'TB', 'splines': 'ortho'}
     cluster_attrs = {'style': 'filled', 'color': 'lightgoldenrod1'}
@@ -107,7 +112,7 @@ def _render(g, out, format_, include_asset_exists=False):
         # Write outputs cluster.
         with cluster(f, 'Output', labelloc='b', **cluster_attrs):
             for term in filter_nodes(include_asset_exists, out_nodes):
-                add_term_node(f, term)
+                add_term_node(f, term, g.computed_term(term))
 
         # Write inputs cluster.
         with cluster(f, 'Input', **cluster_attrs):
@@ -118,7 +123,7 @@ def _render(g, out, format_, include_asset_exists=False):
         for term in filter_nodes(include_asset_exists, topological_sort(g)):
             if term in in_nodes or term in out_nodes:
                 continue
-            add_term_node(f, term)
+            add_term_node(f, term, g.computed_term(term))
 
         # Write edges
         for source, dest in g.edges():
@@ -126,6 +131,25 @@ def _render(g, out, format_, include_asset_exists=False):
                 continue
             add_edge(f, id(source), id(dest))
 
+    return f.getvalue()
+
+
+def _render(g, out, format_, include_asset_exists=False):
+    """
+    Draw `g` as a graph to `out`, in format `format`.
+
+    Parameters
+    ----------
+    g : zipline.pipeline.graph.TermGraph
+        Graph to render.
+    out : file-like object
+    format_ : str {'png', 'svg'}
+        Output format.
+    include_asset_exists : bool
+        Whether to filter out `AssetExists()` nodes.
+    """
+    source = dot_source(g, include_asset_exists=include_asset_exists)
+
     cmd = ['dot', '-T', format_]
     try:
         proc = Popen(cmd, stdin=PIPE, stdout=PIPE, stderr=PIPE)
@@ -138,8 +162,7 @@ def _render(g, out, format_, include_asset_exists=False):
         else:
             raise
 
-    f.seek(0)
-    proc_stdout, proc_stderr = proc.communicate(f.read())
+    proc_stdout, proc_stderr = proc.communicate(source)
     if proc_stderr:
         raise RuntimeError(
             "Error(s) while rendering graph: %s" % proc_stderr.decode('utf-8')
@@ -182,8 +205,14 @@ def fmt(obj):
     return '"%s"' % r
 
 
-def add_term_node(f, term):
-    declare_node(f, id(term), attrs_for_node(term))
+def add_term_node(f, term, computed_term=None):
+    """
+    Declare a node for `term`, labelled with `computed_term` if `term` is
+    computed by another term.
+    """
+    if computed_term is None:
+        computed_term = term
+    declare_node(f, id(term), attrs_for_node(computed_term))
 
 
 def declare_node(f, name, attributes):
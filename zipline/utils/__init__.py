@@ -13,6 +13,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .cli import run_pipeline, parse_args, parse_cell_magic
+from .cli import run_pipeline, run_sweep, parse_args, parse_cell_magic
 
-__all__ = ['run_pipeline', 'parse_args', 'parse_cell_magic']
+__all__ = ['run_pipeline', 'run_sweep', 'parse_args', 'parse_cell_magic']
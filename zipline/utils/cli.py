@@ -16,9 +16,11 @@
 import sys
 import os
 import argparse
+import multiprocessing
 from copy import copy
+from itertools import product
 
-from six import print_
+from six import iteritems, print_
 from six.moves import configparser
 import pandas as pd
 
@@ -110,6 +112,11 @@ def parse_args(argv, ipython_mode=False):
                         action='store_true')
     parser.add_argument('--no-print-algo', '-q', dest='print_algo',
                         action='store_false')
+    parser.add_argument('--sweep',
+                        help='JSON file of parameter sets to run the '
+                             'algorithm with, see run_sweep')
+    parser.add_argument('--processes', type=int,
+                        help='Number of worker processes for --sweep')
 
     if ipython_mode:
         parser.add_argument('--local_namespace', action='store_true')
@@ -164,6 +171,27 @@ def run_pipeline(print_algo=True, **kwargs):
            Whether to print the algorithm to command line. Will use
            pygments syntax coloring if pygments is found.
 
+    """
+    inputs = load_pipeline_inputs(print_algo=print_algo, **kwargs)
+
+    perf = run_algorithm(inputs, namespace=kwargs.get('namespace', {}))
+
+    output_fname = kwargs.get('output', None)
+    if output_fname is not None:
+        perf.to_pickle(output_fname)
+
+    return perf
+
+
+def load_pipeline_inputs(print_algo=True, **kwargs):
+    """Load everything needed to run the algorithm described by the
+    configuration keyword arguments of run_pipeline.
+
+    :Returns:
+        inputs : dict
+           The data source, algorithm text and TradingAlgorithm arguments,
+           to be passed to run_algorithm.
+
     """
     start = kwargs['start']
     end = kwargs['end']
@@ -236,16 +264,150 @@ def run_pipeline(print_algo=True, **kwargs):
         else:
             print_(algo_text)
 
-    algo = zipline.TradingAlgorithm(script=algo_text,
-                                    namespace=kwargs.get('namespace', {}),
-                                    capital_base=float(kwargs['capital_base']),
-                                    algo_filename=kwargs.get('algofile'),
-                                    equities_metadata=asset_metadata,
-                                    identifiers=symbols,
-                                    start=start,
-                                    end=end)
+    return {
+        'source': source,
+        'algo_text': algo_text,
+        'algofile': kwargs.get('algofile'),
+        'capital_base': float(kwargs['capital_base']),
+        'asset_metadata': asset_metadata,
+        'symbols': symbols,
+        'start': start,
+        'end': end,
+        'overwrite_sim_params': overwrite_sim_params,
+    }
+
+
+def run_algorithm(inputs, namespace, env=None):
+    """Run the algorithm loaded by load_pipeline_inputs.
+
+    :Arguments:
+        * inputs : dict
+           The output of load_pipeline_inputs.
+        * namespace : dict
+           The namespace to execute the algorithm script in.
+        * env : TradingEnvironment <default=None>
+           The environment to run in. The asset metadata of the inputs is
+           only written when a new environment is created.
+
+    """
+    if env is None:
+        metadata = {
+            'equities_metadata': inputs['asset_metadata'],
+            'identifiers': inputs['symbols'],
+        }
+    else:
+        metadata = {'env': env}
+
+    algo = zipline.TradingAlgorithm(script=inputs['algo_text'],
+                                    namespace=namespace,
+                                    capital_base=inputs['capital_base'],
+                                    algo_filename=inputs['algofile'],
+                                    start=inputs['start'],
+                                    end=inputs['end'],
+                                    **metadata)
+
+    return algo.run(inputs['source'],
+                    overwrite_sim_params=inputs['overwrite_sim_params'])
 
-    perf = algo.run(source, overwrite_sim_params=overwrite_sim_params)
+
+def expand_param_grid(params):
+    """Expand a parameter sweep specification into a list of parameter
+    dicts.
+
+    :Arguments:
+        * params : dict or list of dicts
+           Either a mapping from parameter name to the list of values to
+           try, which is expanded to every combination of the values, or an
+           explicit list of parameter dicts.
+
+    """
+    if isinstance(params, dict):
+        names = sorted(params)
+        return [dict(zip(names, values))
+                for values in product(*(params[name] for name in names))]
+    return [dict(p) for p in params]
+
+
+# The inputs shared by the workers of a sweep, set before forking so that
+# they are inherited copy-on-write rather than pickled for every run.
+_sweep_inputs = None
+_sweep_env = None
+
+
+def _init_sweep_worker(inputs):
+    global _sweep_inputs, _sweep_env
+    _sweep_inputs = inputs
+    _sweep_env = None
+
+
+def _run_sweep_params(task):
+    global _sweep_env
+    run, params, fields = task
+
+    # Every run of a worker shares one TradingEnvironment.
+    if _sweep_env is None:
+        _sweep_env = zipline.finance.trading.TradingEnvironment()
+        _sweep_env.write_data(
+            equities_data=_sweep_inputs['asset_metadata'],
+            equities_identifiers=_sweep_inputs['symbols'],
+        )
+
+    perf = run_algorithm(_sweep_inputs, namespace=dict(params),
+                         env=_sweep_env)
+    if fields is not None:
+        perf = perf[list(fields)]
+    return run, perf
+
+
+def run_sweep(params, processes=None, fields=None, print_algo=False,
+              **kwargs):
+    """Run one algorithm with many parameter sets in a process pool.
+
+    The data source and algorithm are loaded once, as by run_pipeline, and
+    shared by the worker processes.  Each worker builds a single
+    TradingEnvironment for all of its runs.  The parameters of a run are
+    injected into the namespace of the algorithm script, so initialize can
+    use them to pick e.g. its slippage and commission models.
+
+    :Arguments:
+        * params : dict or list of dicts
+           The parameter sets, see expand_param_grid.
+        * processes : int <default=None>
+           The number of worker processes. Defaults to the number of CPUs.
+        * fields : list <default=None>
+           The performance fields to keep for each run. Defaults to all.
+        * print_algo : bool <default=False>
+           Whether to print the algorithm to command line.
+
+    Any other keyword arguments are the configuration of run_pipeline.
+
+    :Returns:
+        perf : pandas.DataFrame
+           The daily performance of every run, indexed by run number and
+           date, with a column for each parameter.
+
+    """
+    param_sets = expand_param_grid(params)
+    inputs = load_pipeline_inputs(print_algo=print_algo, **kwargs)
+
+    tasks = [(run, p, fields) for run, p in enumerate(param_sets)]
+    pool = multiprocessing.Pool(processes,
+                                initializer=_init_sweep_worker,
+                                initargs=(inputs,))
+    try:
+        results = dict(pool.imap_unordered(_run_sweep_params, tasks))
+    finally:
+        pool.close()
+        pool.join()
+
+    frames = []
+    for run, param_set in enumerate(param_sets):
+        frame = results[run]
+        for name, value in sorted(iteritems(param_set)):
+            frame[name] = value
+        frames.append(frame)
+
+    perf = pd.concat(frames, keys=range(len(frames)), names=['run', 'dt'])
 
     output_fname = kwargs.get('output', None)
     if output_fname is not None: